@@ -17,6 +17,14 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Índices de expressão: a reflexão perde o COLLATE e o autogenerate sempre
+# proporia recriá-los
+EXPRESSION_INDEXES = {"ix_products_name_id"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and name in EXPRESSION_INDEXES)
+
 
 def get_url():
     return settings.DATABASE_URL
@@ -54,6 +62,7 @@ def do_run_migrations(connection: Connection):
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,47 @@
+"""add active_product_count to categories
+
+Revision ID: 32ea87a61699
+Revises: 16fffdea9b9d
+Create Date: 2026-10-19 08:20:43.520883
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '32ea87a61699'
+down_revision: Union[str, Sequence[str], None] = '16fffdea9b9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'categories',
+        sa.Column(
+            'active_product_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    # Preenche com a contagem atual de produtos ativos
+    op.execute(
+        """
+        UPDATE categories AS c
+        SET active_product_count = counts.active
+        FROM (
+            SELECT category_id, count(*) AS active
+            FROM products
+            WHERE is_active
+            GROUP BY category_id
+        ) AS counts
+        WHERE c.id = counts.category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('categories', 'active_product_count')
@@ -0,0 +1,36 @@
+"""order product names in C collation
+
+Revision ID: eada8b514130
+Revises: 0bd798ba2164
+Create Date: 2026-10-19 09:04:14.708916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eada8b514130'
+down_revision: Union[str, Sequence[str], None] = '0bd798ba2164'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ordem por nome em code points, igual à do motor colunar
+    op.drop_index('ix_products_name_id', table_name='products')
+    op.create_index(
+        'ix_products_name_id',
+        'products',
+        [sa.text('name COLLATE "C"'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_name_id', table_name='products')
+    op.create_index('ix_products_name_id', 'products', ['name', 'id'], unique=False)
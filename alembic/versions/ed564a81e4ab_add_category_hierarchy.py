@@ -0,0 +1,59 @@
+"""add category hierarchy
+
+Revision ID: ed564a81e4ab
+Revises: 32ea87a61699
+Create Date: 2026-10-19 08:24:45.091088
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed564a81e4ab'
+down_revision: Union[str, Sequence[str], None] = '32ea87a61699'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('parent_id', sa.Integer(), nullable=True))
+    op.add_column(
+        'categories',
+        sa.Column('path', sa.String(length=255), server_default='/', nullable=False),
+    )
+    op.add_column(
+        'categories',
+        sa.Column(
+            'subtree_product_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.create_foreign_key(
+        op.f('categories_parent_id_fkey'), 'categories', 'categories', ['parent_id'], ['id']
+    )
+    op.create_index(op.f('ix_categories_parent_id'), 'categories', ['parent_id'], unique=False)
+    op.create_index(
+        'ix_categories_path',
+        'categories',
+        ['path'],
+        unique=False,
+        postgresql_ops={'path': 'varchar_pattern_ops'},
+    )
+    op.create_index(op.f('ix_products_category_id'), 'products', ['category_id'], unique=False)
+
+    # Categorias existentes viram raízes: a subárvore é a própria categoria
+    op.execute("UPDATE categories SET subtree_product_count = active_product_count")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_products_category_id'), table_name='products')
+    op.drop_index('ix_categories_path', table_name='categories')
+    op.drop_index(op.f('ix_categories_parent_id'), table_name='categories')
+    op.drop_constraint(op.f('categories_parent_id_fkey'), 'categories', type_='foreignkey')
+    op.drop_column('categories', 'subtree_product_count')
+    op.drop_column('categories', 'path')
+    op.drop_column('categories', 'parent_id')
@@ -0,0 +1,3 @@
+from app.admin.router import router
+
+__all__ = ["router"]
@@ -0,0 +1,142 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.schemas.monitoring import (
+    ConnectionHoldResponse,
+    PoolStatsResponse,
+    ProfileResponse,
+    ProfileSummaryResponse,
+    QueryStatsResponse,
+    ReplicaStatusResponse,
+)
+from app.schemas.responses import SuccessResponse
+from app.monitoring.pool import connection_holds, pool_monitor
+from app.monitoring.profiling import Profile, profile_store
+from app.monitoring.queries import query_log
+from app.database.session import replica_router
+from app.auth.dependencies import require_admin
+from app.models.user import User
+from app.monitoring.timing import TimedRoute
+
+router = APIRouter(prefix="/api/v1/admin", tags=["Admin"], route_class=TimedRoute)
+
+
+@router.get("/db/pool", response_model=SuccessResponse[list[PoolStatsResponse]])
+async def get_pool_stats(current_user: User = Depends(require_admin)):
+    """Estado do pool de conexões e espera no checkout (apenas admin)."""
+
+    return SuccessResponse(
+        data=pool_monitor.snapshot(), message="Pool statistics retrieved successfully"
+    )
+
+
+@router.get("/db/replicas", response_model=SuccessResponse[list[ReplicaStatusResponse]])
+async def get_replica_status(current_user: User = Depends(require_admin)):
+    """Saúde e lag das read replicas (apenas admin)."""
+
+    await replica_router.refresh()
+
+    return SuccessResponse(
+        data=replica_router.snapshot(), message="Replica status retrieved successfully"
+    )
+
+
+@router.get(
+    "/db/connections", response_model=SuccessResponse[list[ConnectionHoldResponse]]
+)
+async def get_connection_holds(current_user: User = Depends(require_admin)):
+    """Tempo de ocupação de conexões do pool por rota (apenas admin)."""
+
+    return SuccessResponse(
+        data=connection_holds.snapshot(),
+        message="Connection hold statistics retrieved successfully",
+    )
+
+
+@router.delete("/db/connections")
+async def reset_connection_holds(current_user: User = Depends(require_admin)):
+    """Zerar as estatísticas de ocupação de conexões (apenas admin)."""
+
+    connection_holds.reset()
+
+    return SuccessResponse(data=None, message="Connection hold statistics reset")
+
+
+@router.get("/db/queries", response_model=SuccessResponse[list[QueryStatsResponse]])
+async def get_query_stats(
+    limit: int = Query(20, ge=1, le=500, description="Number of fingerprints"),
+    order_by: Literal["total", "p95", "max", "count"] = Query(
+        "total", description="Sort key"
+    ),
+    current_user: User = Depends(require_admin),
+):
+    """Queries mais caras agrupadas por fingerprint (apenas admin)."""
+
+    return SuccessResponse(
+        data=query_log.top(limit, order_by),
+        message="Query statistics retrieved successfully",
+    )
+
+
+@router.delete("/db/queries")
+async def reset_query_stats(current_user: User = Depends(require_admin)):
+    """Zerar as estatísticas de queries (apenas admin)."""
+
+    query_log.reset()
+
+    return SuccessResponse(data=None, message="Query statistics reset")
+
+
+def _get_profile(profile_id: str) -> Profile:
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    return profile
+
+
+@router.get("/profiles", response_model=SuccessResponse[list[ProfileSummaryResponse]])
+async def list_profiles(current_user: User = Depends(require_admin)):
+    """Requisições perfiladas recentemente neste worker (apenas admin)."""
+
+    return SuccessResponse(
+        data=[profile.summary() for profile in profile_store.list()],
+        message="Profiles retrieved successfully",
+    )
+
+
+@router.get("/profiles/{profile_id}", response_model=SuccessResponse[ProfileResponse])
+async def get_profile(profile_id: str, current_user: User = Depends(require_admin)):
+    """Perfil completo com pstats, stacks e statements SQL (apenas admin)."""
+
+    return SuccessResponse(
+        data=_get_profile(profile_id).detail(),
+        message="Profile retrieved successfully",
+    )
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_collapsed(
+    profile_id: str, current_user: User = Depends(require_admin)
+):
+    """Stacks colapsadas para flamegraph.pl/speedscope, modo sample (apenas admin)."""
+
+    profile = _get_profile(profile_id)
+    if profile.collapsed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Collapsed stacks are only recorded in sample mode",
+        )
+    return PlainTextResponse(profile.collapsed)
+
+
+@router.delete("/profiles")
+async def clear_profiles(current_user: User = Depends(require_admin)):
+    """Descartar os perfis guardados (apenas admin)."""
+
+    profile_store.clear()
+
+    return SuccessResponse(data=None, message="Profiles cleared")
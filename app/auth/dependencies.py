@@ -4,11 +4,13 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from starlette.types import Scope
 
-from app.database.session import get_db
+from app.database.session import AsyncSessionLocal, get_db, release_connection
 from app.models.user import User
 from app.core.config import settings
 from app.auth.security import ALGORITHM
+from app.monitoring.timing import phase
 from app.enums.user_role import UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -25,17 +27,22 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
+    # Só a validação do JWT: o SELECT do usuário já conta na fase db
+    with phase("auth"):
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+            user_id: str | None = payload.get("sub")
+            if user_id is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
 
+    # Não segura a conexão do pool durante o restante da requisição
+    await release_connection(db)
+
     if not user:
         raise credentials_exception
 
@@ -74,3 +81,28 @@ def require_role(required_roles: list[UserRole]) -> Callable:
 # Atalhos úteis
 require_admin = require_role([UserRole.ADMIN])
 require_customer = require_role([UserRole.CUSTOMER, UserRole.ADMIN])
+
+
+async def is_admin_request(scope: Scope) -> bool:
+    """
+    A requisição traz um Bearer de admin ativo? Para middlewares, que rodam
+    fora do sistema de dependências (ex.: profiling sob demanda).
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            break
+    else:
+        return False
+    if scheme.lower() != "bearer":
+        return False
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        return False
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+    return user is not None and user.is_active and user.role == UserRole.ADMIN
@@ -3,14 +3,15 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.database.session import get_db
+from app.database.session import get_db, release_connection
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.schemas.responses import SuccessResponse
 from app.auth.security import get_password_hash, verify_password, create_access_token
 from app.auth.dependencies import get_current_active_user
+from app.monitoring.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/auth", tags=["Auth"])
+router = APIRouter(prefix="/api/v1/auth", tags=["Auth"], route_class=TimedRoute)
 
 
 @router.post("/register", response_model=SuccessResponse[UserResponse])
@@ -22,15 +23,20 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
+    # Argon2 é caro: devolve a conexão ao pool enquanto calcula o hash
+    await release_connection(db)
+    password_hash = get_password_hash(user_in.password)
+
     user = User(
         email=user_in.email,
         name=user_in.name,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash,
     )
 
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user), message="User created successfully"
@@ -46,6 +52,9 @@ async def login(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
 
+    # Argon2 é caro: devolve a conexão ao pool antes de verificar a senha
+    await release_connection(db)
+
     if not user or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,6 +82,9 @@ async def login_json(user_in: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == user_in.email))
     user = result.scalar_one_or_none()
 
+    # Argon2 é caro: devolve a conexão ao pool antes de verificar a senha
+    await release_connection(db)
+
     if not user or not verify_password(user_in.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
@@ -0,0 +1,34 @@
+"""
+Invalidação do cache de respostas entre workers.
+
+A escrita publica as tags afetadas com NOTIFY na própria transação (entregue
+só no commit) e invalida o cache do próprio worker logo depois do commit.
+Cada worker mantém uma conexão em LISTEN e avança as gerações das tags
+recebidas; o cache de produtos por id usa as mesmas gerações. Sem LISTEN
+(ou enquanto a conexão estiver fora), a defasagem entre workers volta a ser
+limitada pelo RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.responses import response_cache
+from app.database.notifications import listen
+
+CHANNEL = "response_cache_invalidation"
+TAGS = ("products", "categories")
+
+
+async def publish(db: AsyncSession, *tags: str) -> None:
+    """NOTIFY das tags na transação de `db` (os workers recebem no commit)."""
+    await db.execute(select(func.pg_notify(CHANNEL, ",".join(tags))))
+
+
+def apply(payload: str) -> None:
+    """Invalida as tags de uma notificação ("products,categories")."""
+    response_cache.invalidate(*(tag for tag in payload.split(",") if tag))
+
+
+async def listen_for_invalidations() -> None:
+    """Aplica as invalidações dos outros workers; ao (re)conectar, invalida tudo."""
+    await listen(CHANNEL, apply, lambda: response_cache.invalidate(*TAGS))
@@ -0,0 +1,310 @@
+"""
+Cache de respostas HTTP das leituras anônimas do catálogo.
+
+As rotas marcadas com `@cached(...)` têm o corpo da resposta guardado já
+serializado (e pré-comprimido em gzip), com chave no path + query string
+normalizada. Um acerto é servido pelo middleware sem passar pelo roteamento
+nem pelo banco. Os services invalidam as tags afetadas a cada escrita. Num
+miss, requisições idênticas concorrentes compartilham uma única execução.
+
+Cada tag tem um contador de geração: a entrada guarda as gerações de quando
+a requisição começou, então uma resposta calculada antes de uma escrita
+nunca é servida depois dela. O cache é por worker: os outros workers recebem
+as invalidações por NOTIFY (app/cache/invalidation.py); no CDN a defasagem
+máxima é o `max-age`.
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.singleflight import SingleFlight
+from app.core.config import settings
+from app.monitoring.caches import cache_stats
+from app.monitoring.context import has_debug_token
+
+GZIP_MIN_SIZE = 500  # Abaixo disso o gzip não compensa
+MAX_BODY_SIZE = 1024 * 1024  # Respostas maiores não são guardadas
+
+# Headers do app que acompanham o corpo guardado
+STORED_HEADERS = ("content-type",)
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """Configuração de cache de uma rota."""
+
+    tags: tuple[str, ...]
+    max_age: int | None = None  # None = RESPONSE_CACHE_TTL_SECONDS
+    # Espera máxima por uma requisição idêntica em andamento
+    flight_timeout: float | None = None  # None = SINGLE_FLIGHT_TIMEOUT_SECONDS
+
+    @property
+    def ttl(self) -> int:
+        if self.max_age is None:
+            return settings.RESPONSE_CACHE_TTL_SECONDS
+        return self.max_age
+
+    @property
+    def wait_timeout(self) -> float:
+        if self.flight_timeout is None:
+            return settings.SINGLE_FLIGHT_TIMEOUT_SECONDS
+        return self.flight_timeout
+
+
+def cached(
+    *tags: str, max_age: int | None = None, flight_timeout: float | None = None
+) -> Callable:
+    """Marca o endpoint como cacheável para requisições anônimas."""
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__response_cache__ = CachePolicy(
+            tags=tags, max_age=max_age, flight_timeout=flight_timeout
+        )
+        return endpoint
+
+    return decorator
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """Resposta guardada, pronta para ser reenviada."""
+
+    body: bytes
+    gzip_body: bytes | None
+    headers: list[tuple[bytes, bytes]]
+    etag: bytes
+    expires_at: float
+    generations: tuple[int, ...]
+    policy: CachePolicy
+    route: Any
+
+
+class ResponseCache:
+    """LRU de respostas com expiração por TTL e invalidação por tag."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.generations: dict[str, int] = {}
+        self.stats = cache_stats("http_responses")
+
+    def snapshot(self, tags: Iterable[str]) -> tuple[int, ...]:
+        """Gerações atuais das tags."""
+        return tuple(self.generations.get(tag, 0) for tag in tags)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if (
+            entry.expires_at <= monotonic()
+            or self.snapshot(entry.policy.tags) != entry.generations
+        ):
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        # Escrita durante a requisição: a resposta já nasceu defasada
+        if self.snapshot(entry.policy.tags) != entry.generations:
+            return
+
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Descarta (de forma preguiçosa) as respostas deste worker com alguma das
+        tags; os demais workers invalidam via `app.cache.invalidation.publish`.
+        """
+        for tag in tags:
+            self.generations[tag] = self.generations.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cache_key(scope: Scope) -> str:
+    """Path + query string com os parâmetros em ordem (?b=1&a=2 == ?a=2&b=1)."""
+    query = scope["query_string"].decode("latin-1")
+    if not query:
+        return scope["path"]
+
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    return f"{scope['path']}?{urlencode(params)}"
+
+
+def is_cacheable_request(scope: Scope) -> bool:
+    """GET anônimo, sem pedido de diagnóstico (que precisa do caminho real)."""
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return False
+
+    for name, _ in scope["headers"]:
+        if name == b"authorization":
+            return False
+    return not has_debug_token(scope)
+
+
+def match_route(scope: Scope) -> tuple[Any, CachePolicy | None]:
+    """Rota da requisição e sua política de cache, antes do roteamento."""
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route, getattr(route.endpoint, "__response_cache__", None)
+        if match is Match.PARTIAL:
+            break
+    return None, None
+
+
+def accepts_gzip(scope: Scope) -> bool:
+    accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+    return "gzip" in accept_encoding.lower()
+
+
+def cache_control(policy: CachePolicy) -> bytes:
+    return f"public, max-age={policy.ttl}".encode()
+
+
+class ResponseCacheMiddleware:
+    """
+    Serve do cache as rotas marcadas com `@cached` para requisições GET sem
+    Authorization e guarda as respostas 200 delas. Requisições concorrentes
+    com a mesma chave esperam a primeira (single-flight) em vez de repetir
+    as queries. Respostas cacheáveis levam `Cache-Control: public`, ETag,
+    `Vary: Accept-Encoding` e X-Cache (HIT, MISS ou COALESCED).
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache) -> None:
+        self.app = app
+        self.cache = cache
+        self.flight = SingleFlight("http_responses")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if settings.RESPONSE_CACHE_TTL_SECONDS <= 0 or not is_cacheable_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.stats.hit()
+            # Métricas e contexto por rota continuam enxergando a rota
+            scope["route"] = entry.route
+            await self.send_cached(scope, send, entry, b"HIT")
+            return
+
+        route, policy = match_route(scope)
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Gerações de antes do handler: escrita concorrente invalida o resultado
+        generations = self.cache.snapshot(policy.tags)
+
+        async def render() -> tuple[CachedResponse | None, list[Message]]:
+            messages: list[Message] = []
+
+            async def capture(message: Message) -> None:
+                messages.append(message)
+
+            self.cache.stats.miss()
+            await self.app(scope, receive, capture)
+            entry = self.build_entry(route, messages, policy, generations)
+            if entry is not None:
+                self.cache.put(key, entry)
+            return entry, messages
+
+        (entry, messages), shared = await self.flight.do(
+            key, render, timeout=policy.wait_timeout
+        )
+        if shared and entry is not None and entry.generations != generations:
+            # Escrita depois que a execução original começou: recalcula
+            (entry, messages), shared = await render(), False
+
+        scope["route"] = route
+        if entry is not None:
+            await self.send_cached(
+                scope, send, entry, b"COALESCED" if shared else b"MISS"
+            )
+            return
+
+        # Não cacheável (ex.: 404): a resposta original é repassada como veio
+        for message in messages:
+            await send(message)
+
+    def build_entry(
+        self,
+        route: Any,
+        messages: list[Message],
+        policy: CachePolicy,
+        generations: tuple[int, ...],
+    ) -> CachedResponse | None:
+        """Entrada para uma resposta 200 completa (None se não der para guardar)."""
+        start_message = messages[0] if messages else None
+        if start_message is None or start_message["status"] != 200:
+            return None
+
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        if len(body) > MAX_BODY_SIZE:
+            return None
+
+        headers = [
+            (name, value)
+            for name, value in start_message.get("headers", [])
+            if name.decode("latin-1").lower() in STORED_HEADERS
+        ]
+        return CachedResponse(
+            body=body,
+            gzip_body=gzip.compress(body, 6) if len(body) >= GZIP_MIN_SIZE else None,
+            headers=headers,
+            etag=f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'.encode(),
+            expires_at=monotonic() + policy.ttl,
+            generations=generations,
+            policy=policy,
+            route=route,
+        )
+
+    async def send_cached(
+        self, scope: Scope, send: Send, entry: CachedResponse, status: bytes
+    ) -> None:
+        request_headers = Headers(scope=scope)
+        headers = [
+            *entry.headers,
+            (b"cache-control", cache_control(entry.policy)),
+            (b"etag", entry.etag),
+            (b"vary", b"Accept-Encoding"),
+            (b"x-cache", status),
+        ]
+
+        if request_headers.get("if-none-match") == entry.etag.decode():
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = entry.body
+        if entry.gzip_body is not None and accepts_gzip(scope):
+            body = entry.gzip_body
+            headers.append((b"content-encoding", b"gzip"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,58 @@
+"""
+Coalescência de chamadas concorrentes idênticas (single-flight).
+
+Enquanto a chamada de uma chave está em andamento, as demais chamadas com a
+mesma chave esperam o resultado dela em vez de repetir o trabalho. A espera
+tem timeout por chamada: quem esgota o prazo (ou vê a chamada original
+falhar) executa a função por conta própria. Vale dentro de um worker.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.monitoring.caches import flight_stats
+
+_FAILED = object()  # Resultado publicado quando a chamada original falha
+
+
+class SingleFlight:
+    """Grupo de chamadas coalescidas por chave."""
+
+    def __init__(self, name: str) -> None:
+        self.calls: dict[Hashable, asyncio.Future] = {}
+        self.stats = flight_stats(name)
+
+    async def do(
+        self,
+        key: Hashable,
+        function: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> tuple[Any, bool]:
+        """
+        Executa `function` ou espera a chamada em andamento de `key`.
+        Retorna (resultado, compartilhado), em que compartilhado indica que o
+        resultado veio de outra chamada.
+        """
+        future = self.calls.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except TimeoutError:
+                self.stats.timeouts += 1
+            else:
+                if result is not _FAILED:
+                    self.stats.collapsed += 1
+                    return result, True
+            return await function(), False
+
+        future = self.calls[key] = asyncio.get_running_loop().create_future()
+        self.stats.leaders += 1
+        self.stats.in_flight += 1
+        result = _FAILED
+        try:
+            result = await function()
+            return result, False
+        finally:
+            self.stats.in_flight -= 1
+            del self.calls[key]
+            future.set_result(result)
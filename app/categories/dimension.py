@@ -0,0 +1,157 @@
+"""
+Dimensão de categorias em memória (uma cópia da tabela por worker).
+
+A tabela é pequena e quase não muda: os produtos recebem a categoria daqui
+em vez de um segundo SELECT, e a validação de `category_id` não vai ao banco.
+O CategoryService publica um NOTIFY na mesma transação de cada escrita; cada
+worker mantém uma conexão em LISTEN e marca a cópia como desatualizada, que
+é recarregada no próximo acesso. DIMENSION_MAX_AGE limita a defasagem caso
+uma notificação se perca (ex.: conexão de LISTEN caída).
+
+As recargas leem sempre do primário (uma réplica atrasada traria dados de
+antes do NOTIFY e a cópia ficaria marcada como atual).
+
+A cópia também guarda a árvore: para cada categoria, os ids da subárvore
+(ela e todas as descendentes), usados no filtro de produtos por categoria.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+from typing import Iterable
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.database.notifications import listen
+from app.database.session import AsyncSessionLocal
+from app.models.categories import Category
+from app.monitoring.caches import cache_stats
+
+CHANNEL = "category_changes"
+# Idade mínima da cópia para um id desconhecido forçar recarga: ids
+# inexistentes (ex.: ?category_id= anônimo) não recarregam a cada requisição
+FORCED_RELOAD_SECONDS = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryRow:
+    """Categoria como exposta em CategoryInProduct/CategoryResponse."""
+
+    id: int
+    name: str
+    slug: str
+    parent_id: int | None
+    path: str  # Ancestrais, da raiz ao pai ("/" para raízes)
+
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(part) for part in self.path.strip("/").split("/") if part]
+
+
+class CategoryDimension:
+    """Mapas id -> categoria e slug -> categoria, recarregados por geração."""
+
+    def __init__(self) -> None:
+        self.by_id: dict[int, CategoryRow] = {}
+        self.by_slug: dict[str, CategoryRow] = {}
+        self.subtrees: dict[int, tuple[int, ...]] = {}
+        # Cada invalidação avança a geração; a cópia vale para a que foi lida
+        self.generation = 0
+        self.loaded_generation = -1
+        self.loaded_at = 0.0
+        self.stats = cache_stats("category_dimension")
+        self._lock = asyncio.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self.loaded_generation != self.generation
+            or monotonic() - self.loaded_at > settings.CATEGORY_DIMENSION_MAX_AGE_SECONDS
+        )
+
+    def invalidate(self) -> None:
+        self.generation += 1
+
+    async def load(self) -> None:
+        """Relê a tabela inteira (do primário)."""
+        generation = self.generation
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    Category.id,
+                    Category.name,
+                    Category.slug,
+                    Category.parent_id,
+                    Category.path,
+                )
+            )
+            rows = [CategoryRow(*row) for row in result.tuples()]
+
+        # Cada categoria entra na subárvore de si mesma e de cada ancestral
+        subtrees: dict[int, list[int]] = {row.id: [] for row in rows}
+        for row in rows:
+            for ancestor_id in (*row.ancestor_ids, row.id):
+                subtrees.setdefault(ancestor_id, []).append(row.id)
+
+        self.by_id = {row.id: row for row in rows}
+        self.by_slug = {row.slug: row for row in rows}
+        self.subtrees = {id_: tuple(ids) for id_, ids in subtrees.items()}
+        self.loaded_generation = generation
+        self.loaded_at = monotonic()
+
+    async def ensure_fresh(self) -> None:
+        if not self.stale:
+            self.stats.hit()
+            return
+
+        self.stats.miss()
+        async with self._lock:
+            if self.stale:
+                await self.load()
+
+    def _missing(self, category_ids: Iterable[int]) -> bool:
+        return any(category_id not in self.by_id for category_id in category_ids)
+
+    async def resolve(self, category_ids: Iterable[int]) -> dict[int, CategoryRow]:
+        """
+        Mapa id -> categoria cobrindo `category_ids`. Um id desconhecido
+        (categoria criada em outro worker antes do NOTIFY chegar) força uma
+        releitura, no máximo uma a cada FORCED_RELOAD_SECONDS; se continuar
+        faltando, fica de fora do mapa.
+        """
+        category_ids = tuple(category_ids)
+        await self.ensure_fresh()
+        if (
+            self._missing(category_ids)
+            and monotonic() - self.loaded_at > FORCED_RELOAD_SECONDS
+        ):
+            async with self._lock:
+                # Outra requisição pode ter recarregado enquanto esperávamos
+                if (
+                    self._missing(category_ids)
+                    and monotonic() - self.loaded_at > FORCED_RELOAD_SECONDS
+                ):
+                    await self.load()
+        return self.by_id
+
+    async def get(self, category_id: int) -> CategoryRow | None:
+        return (await self.resolve((category_id,))).get(category_id)
+
+    async def subtree_ids(self, category_id: int) -> tuple[int, ...]:
+        """Ids da categoria e de todas as descendentes (vazio se não existir)."""
+        await self.resolve((category_id,))
+        return self.subtrees.get(category_id, ())
+
+
+category_dimension = CategoryDimension()
+
+
+def notify_statement():
+    """SELECT pg_notify(...) para executar na transação da escrita."""
+    return select(func.pg_notify(CHANNEL, ""))
+
+
+async def listen_for_changes(dimension: CategoryDimension = category_dimension) -> None:
+    """Invalida a dimensão a cada notificação (e a cada reconexão)."""
+    await listen(CHANNEL, lambda _: dimension.invalidate(), dimension.invalidate)
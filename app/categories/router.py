@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db, release_connection
 from app.schemas.categories import (
     CategoryCreate,
     CategoryUpdate,
@@ -10,28 +10,39 @@ from app.schemas.categories import (
 )
 from app.schemas.responses import SuccessResponse
 from app.categories.service import CategoryService
+from app.cache.responses import cached
 from app.auth.dependencies import require_admin
 from app.models.user import User
+from app.monitoring.timing import TimedRoute
+from app.schemas.serialization import list_response
 
-router = APIRouter(prefix="/api/v1/categories", tags=["Categories"])
+router = APIRouter(
+    prefix="/api/v1/categories", tags=["Categories"], route_class=TimedRoute
+)
 
 
 @router.get("", response_model=SuccessResponse[list[CategoryWithProductCount]])
+@cached("categories", "products")
 async def list_categories(
     include_count: bool = True,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Listar todas as categorias."""
 
     if include_count:
         categories = await CategoryService.get_categories_with_count(db)
-        return SuccessResponse(
-            data=categories, message="Categories retrieved successfully"
+        await release_connection(db)
+        return list_response(
+            CategoryWithProductCount,
+            categories,
+            message="Categories retrieved successfully",
         )
     else:
         categories = await CategoryService.get_categories(db)
-        return SuccessResponse(
-            data=[CategoryResponse.model_validate(c) for c in categories],
+        await release_connection(db)
+        return list_response(
+            CategoryWithProductCount,
+            categories,
             message="Categories retrieved successfully",
         )
 
@@ -39,11 +50,12 @@ async def list_categories(
 @router.get("/{category_id}", response_model=SuccessResponse[CategoryResponse])
 async def get_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Buscar categoria por ID."""
 
     category = await CategoryService.get_category_by_id(db, category_id)
+    await release_connection(db)
 
     return SuccessResponse(
         data=CategoryResponse.model_validate(category),
@@ -52,13 +64,11 @@ async def get_category(
 
 
 @router.get("/slug/{slug}", response_model=SuccessResponse[CategoryResponse])
-async def get_category_by_slug(
-    slug: str,
-    db: AsyncSession = Depends(get_db),
-):
-    """Buscar categoria por slug."""
+@cached("categories")
+async def get_category_by_slug(slug: str):
+    """Buscar categoria por slug (na dimensão em memória)."""
 
-    category = await CategoryService.get_category_by_slug(db, slug)
+    category = await CategoryService.get_category_by_slug(slug)
 
     return SuccessResponse(
         data=CategoryResponse.model_validate(category),
@@ -75,6 +85,7 @@ async def create_category(
     """Criar categoria (apenas admin)."""
 
     category = await CategoryService.create_category(db, category_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=CategoryResponse.model_validate(category),
@@ -92,6 +103,7 @@ async def update_category(
     """Atualizar categoria (apenas admin)."""
 
     category = await CategoryService.update_category(db, category_id, category_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=CategoryResponse.model_validate(category),
@@ -108,5 +120,6 @@ async def delete_category(
     """Deletar categoria (apenas admin)."""
 
     await CategoryService.delete_category(db, category_id)
+    await release_connection(db)
 
     return SuccessResponse(data=None, message="Category deleted successfully")
@@ -1,12 +1,76 @@
-from sqlalchemy import select, func
+from sqlalchemy import func, literal, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+import logging
 import re
 
 from app.models.categories import Category
 from app.models.products import Product
+from app.cache.invalidation import publish
+from app.cache.responses import response_cache
+from app.categories.dimension import CategoryRow, category_dimension, notify_statement
 from app.schemas.categories import CategoryCreate, CategoryUpdate
 
+logger = logging.getLogger(__name__)
+
+# Letras acentuadas -> sem acento (uma passada em vez de um re.sub por vogal)
+ACCENTS = str.maketrans("àáâãäåèéêëìíîïòóôõöùúûüç", "aaaaaaeeeeiiiiooooouuuuc")
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Hierarquia: `path` guarda os ancestrais ("/1/5/" = filha de 5, neta de 1), e
+# a subárvore de X é X e as categorias com path LIKE X.path || X.id || '/%'.
+
+# Corrige os contadores (próprio e da subárvore) onde divergiram da contagem
+# real; devolve os ids
+RECONCILE_PRODUCT_COUNTS = text(
+    """
+    WITH direct AS (
+        SELECT
+            categories.id,
+            categories.path,
+            count(products.id) FILTER (WHERE products.is_active) AS active
+        FROM categories
+        LEFT JOIN products ON products.category_id = categories.id
+        GROUP BY categories.id
+    ),
+    counts AS (
+        SELECT c.id, c.active, sum(d.active) AS subtree
+        FROM direct AS c
+        JOIN direct AS d
+            ON d.id = c.id OR d.path LIKE c.path || c.id || '/%'
+        GROUP BY c.id, c.active
+    )
+    UPDATE categories AS c
+    SET active_product_count = counts.active,
+        subtree_product_count = counts.subtree
+    FROM counts
+    WHERE c.id = counts.id
+        AND (
+            c.active_product_count <> counts.active
+            OR c.subtree_product_count <> counts.subtree
+        )
+    RETURNING c.id
+    """
+)
+
+# Soma :delta à categoria (contador próprio e da subárvore) e à subárvore de
+# cada ancestral, num único UPDATE
+ADJUST_PRODUCT_COUNT = text(
+    """
+    UPDATE categories
+    SET active_product_count = active_product_count
+            + CASE WHEN id = :category_id THEN :delta ELSE 0 END,
+        subtree_product_count = subtree_product_count + :delta
+    WHERE id = :category_id
+        OR id = ANY(
+            string_to_array(
+                trim(both '/' from (SELECT path FROM categories WHERE id = :category_id)),
+                '/'
+            )::int[]
+        )
+    """
+)
+
 
 class CategoryService:
     """Service para lógica de negócio de categorias."""
@@ -15,17 +79,17 @@ class CategoryService:
     def generate_slug(name: str) -> str:
         """Gera slug a partir do nome."""
         # Remove acentos e caracteres especiais
-        slug = name.lower()
-        slug = re.sub(r"[àáâãäå]", "a", slug)
-        slug = re.sub(r"[èéêë]", "e", slug)
-        slug = re.sub(r"[ìíîï]", "i", slug)
-        slug = re.sub(r"[òóôõö]", "o", slug)
-        slug = re.sub(r"[ùúûü]", "u", slug)
-        slug = re.sub(r"[ç]", "c", slug)
-        slug = re.sub(r"[^a-z0-9]+", "-", slug)
+        slug = name.lower().translate(ACCENTS)
+        slug = NON_ALPHANUMERIC.sub("-", slug)
         slug = slug.strip("-")
         return slug
 
+    @staticmethod
+    def _changed() -> None:
+        """Descarta as cópias locais após uma escrita (os outros workers via NOTIFY)."""
+        category_dimension.invalidate()
+        response_cache.invalidate("categories")
+
     @staticmethod
     async def get_categories(db: AsyncSession) -> list[Category]:
         """Listar todas as categorias."""
@@ -35,27 +99,62 @@ class CategoryService:
 
     @staticmethod
     async def get_categories_with_count(db: AsyncSession) -> list[dict]:
-        """Listar categorias com contagem de produtos."""
-        query = (
-            select(Category, func.count(Product.id).label("product_count"))
-            .outerjoin(Product, Category.id == Product.category_id)
-            .group_by(Category.id)
-            .order_by(Category.name)
-        )
+        """Listar categorias com contagem de produtos ativos (própria e da subárvore)."""
+        query = select(
+            Category.id,
+            Category.name,
+            Category.slug,
+            Category.parent_id,
+            Category.active_product_count.label("product_count"),
+            Category.subtree_product_count,
+        ).order_by(Category.name)
 
         result = await db.execute(query)
-        categories_with_count = []
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def adjust_active_product_count(
+        db: AsyncSession, category_id: int, delta: int
+    ) -> None:
+        """
+        Soma `delta` ao contador da categoria e ao da subárvore dela e dos
+        ancestrais (na transação da escrita do produto).
+        """
+        await db.execute(
+            ADJUST_PRODUCT_COUNT, {"category_id": category_id, "delta": delta}
+        )
+
+    @staticmethod
+    async def _shift_subtree_count(db: AsyncSession, path: str, delta: int) -> None:
+        """Soma `delta` à contagem da subárvore dos ancestrais em `path`."""
+        ancestor_ids = [int(part) for part in path.strip("/").split("/") if part]
+        if not ancestor_ids or not delta:
+            return
+
+        await db.execute(
+            update(Category)
+            .where(Category.id.in_(ancestor_ids))
+            .values(
+                subtree_product_count=Category.subtree_product_count + delta,
+                # Contador não é mudança da categoria (fica fora do feed)
+                updated_at=Category.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        for category, count in result.all():
-            category_dict = {
-                "id": category.id,
-                "name": category.name,
-                "slug": category.slug,
-                "product_count": count,
-            }
-            categories_with_count.append(category_dict)
+    @staticmethod
+    async def reconcile_product_counts(db: AsyncSession) -> int:
+        """Recalcula os contadores divergentes; retorna quantas categorias mudaram."""
+        result = await db.execute(RECONCILE_PRODUCT_COUNTS)
+        fixed = len(result.all())
+        if fixed:
+            await publish(db, "categories")
+        await db.commit()
 
-        return categories_with_count
+        if fixed:
+            response_cache.invalidate("categories")
+            logger.warning("Reconciled product counts of %d categories", fixed)
+        return fixed
 
     @staticmethod
     async def get_category_by_id(db: AsyncSession, category_id: int) -> Category:
@@ -72,11 +171,27 @@ class CategoryService:
         return category
 
     @staticmethod
-    async def get_category_by_slug(db: AsyncSession, slug: str) -> Category:
-        """Buscar categoria por slug."""
-        query = select(Category).where(Category.slug == slug)
-        result = await db.execute(query)
-        category = result.scalar_one_or_none()
+    async def _get_parent(db: AsyncSession, parent_id: int) -> Category:
+        parent = await db.get(Category, parent_id)
+        if not parent:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Parent category not found",
+            )
+        return parent
+
+    @staticmethod
+    def _child_path(parent: Category | None) -> str:
+        """Path de uma filha de `parent` (None = raiz)."""
+        if parent is None:
+            return "/"
+        return f"{parent.path}{parent.id}/"
+
+    @staticmethod
+    async def get_category_by_slug(slug: str) -> CategoryRow:
+        """Buscar categoria por slug (na dimensão em memória)."""
+        await category_dimension.ensure_fresh()
+        category = category_dimension.by_slug.get(slug)
 
         if not category:
             raise HTTPException(
@@ -103,10 +218,22 @@ class CategoryService:
                 detail=f"Category with similar name already exists",
             )
 
+        parent = None
+        if category_in.parent_id is not None:
+            parent = await CategoryService._get_parent(db, category_in.parent_id)
+
         # Criar categoria
-        category = Category(name=category_in.name, slug=slug)
+        category = Category(
+            name=category_in.name,
+            slug=slug,
+            parent_id=category_in.parent_id,
+            path=CategoryService._child_path(parent),
+        )
         db.add(category)
+        await db.execute(notify_statement())
+        await publish(db, "categories")
         await db.commit()
+        CategoryService._changed()
         await db.refresh(category)
 
         return category
@@ -137,11 +264,70 @@ class CategoryService:
             category.name = category_in.name
             category.slug = new_slug
 
+        # parent_id enviado explicitamente (null = mover para a raiz)
+        if (
+            "parent_id" in category_in.model_fields_set
+            and category_in.parent_id != category.parent_id
+        ):
+            await CategoryService._move_category(db, category, category_in.parent_id)
+
+        await db.execute(notify_statement())
+        await publish(db, "categories")
         await db.commit()
+        CategoryService._changed()
         await db.refresh(category)
 
         return category
 
+    @staticmethod
+    async def _move_category(
+        db: AsyncSession, category: Category, parent_id: int | None
+    ) -> None:
+        """
+        Pendura a categoria (com a subárvore) em `parent_id`: reescreve o
+        prefixo do path das descendentes e transfere a contagem da subárvore
+        dos ancestrais antigos para os novos.
+        """
+        # Bloqueia a linha: escritas de produtos na subárvore esperam a mudança
+        await db.refresh(
+            category, ["path", "subtree_product_count"], with_for_update=True
+        )
+        old_path = category.path
+        subtree_prefix = f"{old_path}{category.id}/"
+
+        parent = None
+        if parent_id is not None:
+            parent = await CategoryService._get_parent(db, parent_id)
+            if parent.id == category.id or parent.path.startswith(subtree_prefix):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Category cannot be moved into its own subtree",
+                )
+        new_path = CategoryService._child_path(parent)
+
+        moved = category.subtree_product_count
+        await CategoryService._shift_subtree_count(db, old_path, -moved)
+        await CategoryService._shift_subtree_count(db, new_path, moved)
+
+        await db.execute(
+            update(Category)
+            .where(
+                or_(
+                    Category.id == category.id,
+                    Category.path.startswith(subtree_prefix, autoescape=True),
+                )
+            )
+            .values(
+                path=literal(new_path)
+                + func.substr(Category.path, len(old_path) + 1),
+                # O path não sai no CategoryResponse: só a categoria movida
+                # (parent_id, no flush) entra no feed de mudanças
+                updated_at=Category.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        category.parent_id = parent_id
+
     @staticmethod
     async def delete_category(db: AsyncSession, category_id: int) -> None:
         """Deletar categoria."""
@@ -157,5 +343,15 @@ class CategoryService:
                 detail="Cannot delete category with associated products",
             )
 
+        children_query = select(Category.id).where(Category.parent_id == category_id)
+        if (await db.execute(children_query.limit(1))).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete category with subcategories",
+            )
+
         await db.delete(category)
+        await db.execute(notify_statement())
+        await publish(db, "categories")
         await db.commit()
+        CategoryService._changed()
@@ -0,0 +1,25 @@
+"""Tarefas de manutenção das categorias (lifespan e CLI)."""
+
+import asyncio
+import logging
+
+from app.categories.service import CategoryService
+from app.database.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_product_counts() -> int:
+    """Reconcilia active_product_count de todas as categorias uma vez."""
+    async with AsyncSessionLocal() as db:
+        return await CategoryService.reconcile_product_counts(db)
+
+
+async def reconcile_product_counts_periodically(interval: float) -> None:
+    """Reconcilia a cada `interval` segundos (corrige escritas fora dos services)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_product_counts()
+        except Exception:
+            logger.exception("Category product count reconciliation failed")
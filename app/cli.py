@@ -4,11 +4,17 @@ Uso: python -m app.cli [command]
 """
 
 import asyncio
+from datetime import datetime, timezone
+
+import httpx
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from app.categories.tasks import reconcile_product_counts
 from app.database.seed import seed_database, seed_only_admin
+from app.database.session import engine
+from app.products.tasks import reconcile_units_sold
 
 app = typer.Typer(help="FastAPI E-commerce API Management CLI")
 console = Console()
@@ -18,14 +24,127 @@ console = Console()
 def seed(
     admin_only: bool = typer.Option(
         False, "--admin-only", help="Create only admin user"
-    )
+    ),
+    scale: float | None = typer.Option(
+        None,
+        "--scale",
+        help="Also generate synthetic data (1 = 10k users/products, 50k orders)",
+    ),
+    random_seed: int = typer.Option(42, "--seed", help="Random seed for --scale"),
+    batch_size: int = typer.Option(100_000, help="Rows per COPY batch for --scale"),
+    epoch: datetime | None = typer.Option(
+        None,
+        "--epoch",
+        formats=["%Y-%m-%d"],
+        help="End of the generated history for --scale (UTC, default 2026-01-01)",
+    ),
 ):
     """Populate database with initial data."""
 
-    if admin_only:
-        asyncio.run(seed_only_admin())
+    async def run_seed() -> None:
+        # Um único event loop: o pool do engine é compartilhado pelas etapas
+        if admin_only:
+            await seed_only_admin()
+        else:
+            await seed_database()
+
+        if scale:
+            from app.database.seed_scale import DEFAULT_EPOCH, seed_scale
+
+            history_end = epoch.replace(tzinfo=timezone.utc) if epoch else DEFAULT_EPOCH
+            await seed_scale(scale, random_seed, batch_size, history_end)
+
+    asyncio.run(run_seed())
+
+
+def _admin_token(url: str, email: str, password: str | None) -> str:
+    """Faz login na API e retorna o access token."""
+
+    if password is None:
+        password = typer.prompt("Admin password", hide_input=True)
+
+    response = httpx.post(
+        f"{url}/api/v1/auth/login/json", json={"email": email, "password": password}
+    )
+    if response.status_code != 200:
+        console.print(f"[bold red]Login failed:[/bold red] {response.text}")
+        raise typer.Exit(1)
+
+    return response.json()["data"]["access_token"]
+
+
+@app.command("slow-queries")
+def slow_queries(
+    url: str = typer.Option("http://localhost:8000", help="API base URL"),
+    email: str = typer.Option("admin@example.com", help="Admin email"),
+    password: str | None = typer.Option(None, help="Admin password (prompted)"),
+    token: str | None = typer.Option(None, help="Admin access token"),
+    limit: int = typer.Option(20, help="Number of fingerprints"),
+    order_by: str = typer.Option("total", help="total, p95, max or count"),
+):
+    """Show the most expensive SQL fingerprints of a running API worker."""
+
+    token = token or _admin_token(url, email, password)
+    response = httpx.get(
+        f"{url}/api/v1/admin/db/queries",
+        params={"limit": limit, "order_by": order_by},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    if response.status_code != 200:
+        console.print(f"[bold red]Request failed:[/bold red] {response.text}")
+        raise typer.Exit(1)
+
+    table = Table(title="🐢 Slow queries", show_header=True, header_style="bold cyan")
+    table.add_column("Fingerprint", style="white", overflow="fold")
+    table.add_column("Count", justify="right")
+    table.add_column("Total ms", justify="right", style="green")
+    table.add_column("Avg ms", justify="right")
+    table.add_column("p95 ms", justify="right", style="yellow")
+    table.add_column("Max ms", justify="right", style="red")
+    table.add_column("Top route", style="cyan")
+
+    for row in response.json()["data"]:
+        top_route = next(iter(row["routes"]), "-")
+        table.add_row(
+            row["fingerprint"][:200],
+            str(row["count"]),
+            f"{row['total_ms']:.1f}",
+            f"{row['avg_ms']:.2f}",
+            f"{row['p95_ms']:.2f}",
+            f"{row['max_ms']:.2f}",
+            top_route,
+        )
+
+    console.print(table)
+    console.print("\nℹ️  Statistics are per worker process.")
+    console.print(
+        "ℹ️  Times are wall clock from cursor execute to result, including "
+        "event-loop stalls (CPU work of concurrent requests on the same "
+        "worker).\n"
+    )
+
+
+@app.command("reconcile-counts")
+def reconcile_counts():
+    """Recompute category product counts and product units sold."""
+
+    async def run_reconcile() -> tuple[int, int]:
+        # Um único event loop: as conexões do pool ficam presas ao loop que as abriu
+        try:
+            return await reconcile_product_counts(), await reconcile_units_sold()
+        finally:
+            await engine.dispose()
+
+    categories_fixed, products_fixed = asyncio.run(run_reconcile())
+    if categories_fixed:
+        console.print(f"[yellow]Fixed {categories_fixed} category counts[/yellow]")
+    else:
+        console.print("[green]All category counts are up to date[/green]")
+
+    if products_fixed:
+        console.print(f"[yellow]Fixed units sold of {products_fixed} products[/yellow]")
     else:
-        asyncio.run(seed_database())
+        console.print("[green]All units sold are up to date[/green]")
 
 
 @app.command()
@@ -0,0 +1,239 @@
+"""
+Controle de admissão: limites de concorrência por classe de rota.
+
+Cada requisição pertence a uma classe (catalog, checkout, admin, auth) com
+limite próprio de execuções simultâneas e fila de espera limitada. Há ainda
+um limite global; quando uma vaga abre, a fila de maior prioridade é
+atendida primeiro (checkout antes de navegação). Fila cheia ou espera acima
+de ADMISSION_QUEUE_TIMEOUT_SECONDS resultam em 503 imediato com Retry-After,
+em vez de a requisição esperar indefinidamente por uma conexão no `get_db`.
+"""
+
+import asyncio
+import json
+from collections import deque
+from contextlib import suppress
+from time import perf_counter
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.monitoring.histogram import Histogram
+
+# Classe -> prioridade (menor = atendida primeiro)
+PRIORITIES = {"checkout": 0, "auth": 1, "admin": 2, "catalog": 3}
+
+# Rotas que nunca são limitadas (health check e observabilidade)
+EXEMPT_PATHS = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+CATALOG_PREFIXES = ("/api/v1/products", "/api/v1/categories")
+
+# POSTs que só leem o catálogo (o corpo carrega a consulta)
+CATALOG_READS = ("/api/v1/products/batch", "/api/v1/orders/quote")
+
+
+def classify(scope: Scope) -> str | None:
+    """Classe de admissão da requisição (None = sem limite)."""
+    path = scope["path"]
+    if path in CATALOG_READS:
+        return "catalog"
+    if path.startswith("/api/v1/orders"):
+        return "checkout"
+    if path.startswith("/api/v1/auth"):
+        return "auth"
+    if path.startswith(CATALOG_PREFIXES):
+        # Escritas no catálogo são operações de admin
+        return "catalog" if scope["method"] == "GET" else "admin"
+    if path.startswith(("/api/v1/admin", "/api/v1/users")):
+        return "admin"
+    return None
+
+
+class RouteClass:
+    """Limite, fila e contadores de uma classe de rota."""
+
+    def __init__(self, name: str, limit: int, queue_size: int) -> None:
+        self.name = name
+        self.priority = PRIORITIES[name]
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.queue_wait = Histogram()
+
+    @property
+    def queued(self) -> int:
+        return len(self.waiters)
+
+
+class Overloaded(Exception):
+    """A requisição não foi admitida (fila cheia ou espera esgotada)."""
+
+
+class AdmissionController:
+    """Vagas por classe + vagas globais, distribuídas por prioridade."""
+
+    def __init__(
+        self, limits: dict[str, tuple[int, int]], max_concurrency: int
+    ) -> None:
+        self.classes = {
+            name: RouteClass(name, limit, queue_size)
+            for name, (limit, queue_size) in limits.items()
+        }
+        self.by_priority = sorted(self.classes.values(), key=lambda c: c.priority)
+        self.max_concurrency = max_concurrency
+        self.active = 0
+
+    def _has_room(self, route_class: RouteClass) -> bool:
+        return route_class.active < route_class.limit and (
+            self.max_concurrency <= 0 or self.active < self.max_concurrency
+        )
+
+    def _waiting_ahead(self, route_class: RouteClass) -> bool:
+        """
+        Há fila na própria classe ou numa classe mais prioritária que só
+        espera por vaga global (e por isso ficaria com esta)?
+        """
+        for other in self.by_priority:
+            if other.priority > route_class.priority:
+                return False
+            if other.queued and (other is route_class or other.active < other.limit):
+                return True
+        return False
+
+    def _admit(self, route_class: RouteClass) -> None:
+        route_class.active += 1
+        route_class.admitted += 1
+        self.active += 1
+
+    async def acquire(self, route_class: RouteClass, timeout: float) -> None:
+        """Ocupa uma vaga ou levanta Overloaded."""
+        if self._has_room(route_class) and not self._waiting_ahead(route_class):
+            self._admit(route_class)
+            route_class.queue_wait.observe(0.0)
+            return
+
+        if route_class.queued >= route_class.queue_size:
+            route_class.shed_queue_full += 1
+            raise Overloaded("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(waiter)
+        started_at = perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            self._leave_queue(route_class, waiter)
+            route_class.shed_timeout += 1
+            raise Overloaded("queue timeout") from None
+        except asyncio.CancelledError:
+            # Vaga concedida no mesmo instante do cancelamento: devolve
+            if waiter.done() and not waiter.cancelled():
+                self.release(route_class)
+            else:
+                self._leave_queue(route_class, waiter)
+            raise
+        finally:
+            route_class.queue_wait.observe(perf_counter() - started_at)
+
+    def _leave_queue(self, route_class: RouteClass, waiter: asyncio.Future) -> None:
+        with suppress(ValueError):
+            route_class.waiters.remove(waiter)
+
+    def release(self, route_class: RouteClass) -> None:
+        route_class.active -= 1
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Passa as vagas livres às filas, da classe mais prioritária à menos."""
+        for route_class in self.by_priority:
+            waiters = route_class.waiters
+            while waiters and self._has_room(route_class):
+                self._admit(route_class)
+                waiters.popleft().set_result(None)
+            if self.max_concurrency > 0 and self.active >= self.max_concurrency:
+                return
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {
+                "class": route_class.name,
+                "priority": route_class.priority,
+                "limit": route_class.limit,
+                "queue_size": route_class.queue_size,
+                "active": route_class.active,
+                "queued": route_class.queued,
+                "admitted": route_class.admitted,
+                "shed_queue_full": route_class.shed_queue_full,
+                "shed_timeout": route_class.shed_timeout,
+                "queue_wait": route_class.queue_wait,
+            }
+            for route_class in self.by_priority
+        ]
+
+
+admission = AdmissionController(
+    settings.ADMISSION_CLASS_LIMITS, settings.ADMISSION_MAX_CONCURRENCY
+)
+
+
+class AdmissionControlMiddleware:
+    """
+    Aplica o AdmissionController às requisições HTTP classificadas por
+    `classify`; as não admitidas recebem 503 com Retry-After.
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController = admission
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.body = json.dumps({"detail": "Service overloaded, retry later"}).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.ADMISSION_CONTROL_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.controller.classes.get(classify(scope))
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(
+                route_class, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+            )
+        except Overloaded:
+            await self.send_overloaded(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+    async def send_overloaded(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(self.body)).encode()),
+                    (
+                        b"retry-after",
+                        str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode(),
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": self.body})
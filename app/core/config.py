@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -14,9 +16,76 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
 
+    # Database pool
+    DB_ECHO: bool = False  # Loga todo SQL (apenas para desenvolvimento)
+    DB_POOL_SIZE: int = 10  # 0 = sem pool na aplicação (NullPool)
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Segundos esperando uma conexão livre
+    DB_POOL_RECYCLE: int = 1800  # Segundos; -1 desativa
+    # always = ping em todo checkout, idle = só conexões ociosas, never = nunca
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Prepared statements por conexão (asyncpg)
+    DB_PGBOUNCER_MODE: bool = False  # PgBouncer em transaction pooling
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # Queries acima disso são logadas
+
+    # Read replicas (mesmo banco/credenciais do primário)
+    POSTGRES_REPLICA_HOSTS: str = ""  # Ex.: "replica1:5432,replica2:5432"
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Acima disso a réplica sai de rotação
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Leituras vão ao primário após escrita
+
     # JWT
     SECRET_KEY: str
 
+    # Observabilidade
+    METRICS_TOKEN: str = ""  # Se definido, /metrics exige "Authorization: Bearer <token>"
+    DEBUG_TOKEN: str = ""  # Libera Server-Timing por requisição via header X-Debug-Token
+    SERVER_TIMING_ENABLED: bool = False  # Server-Timing em todas as respostas
+    PROFILE_HISTORY_SIZE: int = 20  # Perfis mantidos em memória por worker
+    PROFILE_SAMPLE_INTERVAL_MS: float = 1.0  # Intervalo do modo "sample"
+    # Detector de N+1: "log" em desenvolvimento, "raise" na suíte de testes
+    N_PLUS_ONE_MODE: Literal["off", "log", "raise"] = "off"
+    N_PLUS_ONE_THRESHOLD: int = 5  # Repetições do mesmo formato de query
+
+    # Cache de respostas (leituras anônimas do catálogo)
+    RESPONSE_CACHE_TTL_SECONDS: int = 30  # max-age das respostas; 0 desativa
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024  # Respostas guardadas por worker
+    # Espera máxima por uma leitura idêntica em andamento antes de executar a própria
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 5.0
+    # Invalidação entre workers via LISTEN/NOTIFY (desative atrás de PgBouncer em
+    # transaction pooling; a defasagem entre workers volta a ser o TTL)
+    RESPONSE_CACHE_LISTEN: bool = True
+
+    # Reconciliação de categories.active_product_count (segundos; 0 desativa)
+    CATEGORY_COUNT_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    # Reconciliação de products.units_sold ("mais vendidos"; segundos; 0 desativa)
+    PRODUCT_UNITS_SOLD_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+
+    # Dimensão de categorias em memória (invalidada via LISTEN/NOTIFY)
+    CATEGORY_DIMENSION_LISTEN: bool = True  # Desative atrás de PgBouncer em transaction pooling
+    CATEGORY_DIMENSION_MAX_AGE_SECONDS: float = 300.0  # Releitura mesmo sem notificação
+
+    # Motor colunar do catálogo em memória
+    PRODUCT_COLUMN_STORE_ENABLED: bool = False
+    PRODUCT_COLUMN_STORE_REFRESH_SECONDS: float = 1.0  # Aplica mudanças de outros workers
+
+    # Autocomplete de nomes de produto (índice de prefixos em memória)
+    PRODUCT_SUGGEST_ENABLED: bool = True
+    PRODUCT_SUGGEST_REFRESH_SECONDS: float = 5.0  # Aplica escritas de outros workers
+    PRODUCT_SUGGEST_REBUILD_SECONDS: float = 3600.0  # Reconstrução (popularidade); 0 desativa
+
+    # Feed de mudanças: atraso que cobre transações que commitam tarde
+    CHANGE_FEED_SAFETY_SECONDS: float = 5.0
+
+    # Controle de admissão (limites de concorrência por classe de rota)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    # classe=execuções simultâneas/tamanho da fila
+    ADMISSION_LIMITS: str = "catalog=24/200,checkout=16/100,auth=8/50,admin=4/20"
+    ADMISSION_MAX_CONCURRENCY: int = 32  # Limite global entre as classes; 0 = sem limite
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # Espera na fila antes do 503
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1  # Valor do header Retry-After no 503
+
     model_config = SettingsConfigDict(
         env_file=".env", case_sensitive=True, extra="ignore"  # Ignora variáveis extras
     )
@@ -30,5 +99,27 @@ class Settings(BaseSettings):
             f"/{self.POSTGRES_DB}"
         )
 
+    @property
+    def REPLICA_DATABASE_URLS(self) -> list[str]:
+        urls = []
+        for host in filter(None, map(str.strip, self.POSTGRES_REPLICA_HOSTS.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.POSTGRES_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://"
+                f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{host}/{self.POSTGRES_DB}"
+            )
+        return urls
+
+    @property
+    def ADMISSION_CLASS_LIMITS(self) -> dict[str, tuple[int, int]]:
+        limits = {}
+        for item in filter(None, map(str.strip, self.ADMISSION_LIMITS.split(","))):
+            name, _, values = item.partition("=")
+            limit, _, queue_size = values.partition("/")
+            limits[name.strip()] = (int(limit), int(queue_size or 0))
+        return limits
+
 
 settings = Settings()
@@ -0,0 +1,55 @@
+"""
+Conexões dedicadas em LISTEN (avisos entre workers via NOTIFY).
+
+Cada assinante mantém a própria conexão, fora do pool: o pool pode estar
+atrás de um PgBouncer em transaction pooling, onde LISTEN não funciona.
+"""
+
+import asyncio
+import logging
+from typing import Callable
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LISTEN_KEEPALIVE_SECONDS = 30.0
+LISTEN_RETRY_SECONDS = 5.0
+
+
+async def listen(
+    channel: str, on_notify: Callable[[str], None], on_connect: Callable[[], None]
+) -> None:
+    """
+    Chama `on_notify(payload)` a cada notificação de `channel`, reconectando
+    quando a conexão cai. `on_connect` roda a cada (re)conexão, pois
+    notificações podem ter sido perdidas enquanto a conexão estava fora.
+    """
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(
+                host=settings.POSTGRES_HOST,
+                port=settings.POSTGRES_PORT,
+                user=settings.POSTGRES_USER,
+                password=settings.POSTGRES_PASSWORD,
+                database=settings.POSTGRES_DB,
+            )
+            await connection.add_listener(
+                channel, lambda _connection, _pid, _channel, payload: on_notify(payload)
+            )
+            on_connect()
+
+            # O keepalive detecta conexões mortas sem depender de TCP keepalive
+            while True:
+                await asyncio.sleep(LISTEN_KEEPALIVE_SECONDS)
+                await connection.execute("SELECT 1")
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as error:
+            logger.warning("LISTEN %s connection lost: %r", channel, error)
+        finally:
+            if connection is not None:
+                await connection.close(timeout=1)
+
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
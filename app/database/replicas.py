@@ -0,0 +1,246 @@
+"""
+Roteamento de leituras para réplicas, com read-your-writes e fallback para o primário.
+
+Read-your-writes viaja com o cliente: a resposta de uma requisição que
+escreveu no primário leva um token assinado com o SECRET_KEY (cookie
+`primary_until` e header `X-Primary-Until`) com o instante até o qual as
+leituras desse cliente vão ao primário. Qualquer worker valida o token sem
+estado compartilhado; clientes sem cookie reenviam o header recebido.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import logging
+from dataclasses import dataclass
+from time import monotonic, time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.monitoring.context import current_request
+
+logger = logging.getLogger(__name__)
+
+# Réplica em dia (tudo que recebeu já foi aplicado) tem lag 0 mesmo se o
+# primário estiver ocioso; fora de recovery (aponta para um primário) também.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+HEALTH_CHECK_TIMEOUT = 2.0
+
+PRIMARY_UNTIL_COOKIE = "primary_until"
+PRIMARY_UNTIL_HEADER = "x-primary-until"
+
+
+@dataclass(slots=True)
+class Replica:
+    """Estado conhecido de uma réplica."""
+
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False  # Só entra em rotação após o primeiro health check
+    lag_seconds: float | None = None
+    error: str | None = None
+
+    def mark_down(self, reason: str) -> None:
+        if self.healthy:
+            logger.warning("Replica %s removed from rotation: %s", self.name, reason)
+        self.healthy = False
+        self.error = reason
+
+
+class ReplicaRouter:
+    """
+    Escolhe o engine para leituras.
+
+    - Round-robin entre réplicas saudáveis com lag <= `max_lag_seconds`.
+    - Health check em background a cada `check_interval` segundos; erros de
+      conexão tiram a réplica de rotação na hora.
+    - Read-your-writes: a requisição que escreveu e as que trazem um token
+      `primary_until` válido (ver ReadYourWritesMiddleware) leem do primário.
+    - Sem réplica saudável, retorna None (o chamador usa o primário).
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag_seconds: float,
+        check_interval: float,
+        read_your_writes_seconds: float,
+    ) -> None:
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._cycle = itertools.count()
+        self._checked_at = float("-inf")
+        self._refresh_task: asyncio.Task | None = None
+
+        for replica in replicas:
+            self._watch_errors(replica)
+        if replicas:
+            event.listen(Session, "after_flush", self._on_flush)
+            event.listen(Session, "do_orm_execute", self._on_orm_execute)
+
+    def engine_for_read(self) -> AsyncEngine | None:
+        """Engine de réplica para esta leitura, ou None para usar o primário."""
+        if not self.replicas or self._wrote_recently():
+            return None
+
+        self._schedule_refresh()
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._cycle) % len(healthy)].engine
+
+    async def refresh(self) -> None:
+        """Atualiza saúde e lag de todas as réplicas."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        ]
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(HEALTH_CHECK_TIMEOUT):
+                async with replica.engine.connect() as conn:
+                    lag = float(await conn.scalar(LAG_QUERY))
+        except Exception as error:
+            replica.mark_down(f"health check failed: {error!r}")
+            return
+
+        replica.lag_seconds = lag
+        if lag > self.max_lag_seconds:
+            replica.mark_down(f"replication lag {lag:.1f}s")
+            return
+
+        if not replica.healthy:
+            logger.info("Replica %s back in rotation (lag %.1fs)", replica.name, lag)
+        replica.healthy = True
+        replica.error = None
+
+    def _schedule_refresh(self) -> None:
+        now = monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._checked_at = now
+        self._refresh_task = asyncio.create_task(self.refresh())
+
+    def _watch_errors(self, replica: Replica) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def on_error(context):
+            if context.is_disconnect or isinstance(context.original_exception, OSError):
+                replica.mark_down(f"connection error: {context.original_exception!r}")
+
+    # Read-your-writes -------------------------------------------------------
+
+    def _on_flush(self, session, flush_context) -> None:
+        self._mark_write()
+
+    def _on_orm_execute(self, orm_execute_state) -> None:
+        if not orm_execute_state.is_select:
+            self._mark_write()
+
+    def _mark_write(self) -> None:
+        stats = current_request.get()
+        if stats is not None:
+            stats.primary_until = time() + self.read_your_writes_seconds
+
+    def _wrote_recently(self) -> bool:
+        stats = current_request.get()
+        if stats is None:
+            return False
+        if stats.primary_until:
+            return True
+
+        value = _primary_until_token(stats.scope)
+        return value is not None and primary_until(value) > time()
+
+
+class ReadYourWritesMiddleware:
+    """Devolve o token `primary_until` nas respostas de requisições que escreveram."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = current_request.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_token(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats.primary_until:
+                token = sign_primary_until(stats.primary_until)
+                max_age = max(1, round(stats.primary_until - time()))
+                headers = MutableHeaders(scope=message)
+                headers.append(PRIMARY_UNTIL_HEADER, token)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_UNTIL_COOKIE}={token}; Max-Age={max_age}; Path=/; "
+                    "HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
+
+
+def sign_primary_until(until: float) -> str:
+    """Token "<epoch em ms>.<HMAC>" para o instante `until`."""
+    value = str(int(until * 1000))
+    return f"{value}.{_signature(value)}"
+
+
+def primary_until(token: str) -> float:
+    """Instante (epoch) do token, ou 0 se malformado ou com assinatura inválida."""
+    value, _, signature = token.partition(".")
+    if not value.isdigit() or not hmac.compare_digest(signature, _signature(value)):
+        return 0.0
+    return int(value) / 1000
+
+
+def _signature(value: str) -> str:
+    digest = hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256)
+    return digest.hexdigest()[:32]
+
+
+def _primary_until_token(scope: Scope) -> str | None:
+    """Token da requisição: header X-Primary-Until ou cookie primary_until."""
+    cookie_header = None
+    for name, value in scope["headers"]:
+        if name == PRIMARY_UNTIL_HEADER.encode():
+            return value.decode("latin-1")
+        if name == b"cookie":
+            cookie_header = value.decode("latin-1")
+
+    if cookie_header is None:
+        return None
+    for cookie in cookie_header.split(";"):
+        name, _, value = cookie.strip().partition("=")
+        if name == PRIMARY_UNTIL_COOKIE:
+            return value
+    return None
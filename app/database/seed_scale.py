@@ -0,0 +1,367 @@
+"""
+Gerador de dados em escala para testes de carga.
+
+Gera usuários, categorias, produtos, pedidos e itens com distribuições
+realistas (popularidade Zipf dos produtos, tamanho de pedido com cauda
+longa), em lotes vetorizados com numpy, e carrega tudo via COPY.
+O resultado é determinístico para o mesmo `seed` e `epoch` (e banco de
+partida): os timestamps são sorteados no histórico que termina em `epoch`,
+não no relógio.
+
+Execute: python -m app.cli seed --scale 10
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import numpy as np
+from sqlalchemy import text
+
+from app.auth.security import get_password_hash
+from app.categories.service import RECONCILE_PRODUCT_COUNTS
+from app.products.service import RECONCILE_UNITS_SOLD
+from app.database.session import engine
+from app.enums.order_status import OrderStatus
+from app.enums.user_role import UserRole
+
+# Volume por unidade de escala (scale=100 -> 1M usuários, 1M produtos, 5M pedidos)
+USERS_PER_SCALE = 10_000
+PRODUCTS_PER_SCALE = 10_000
+ORDERS_PER_SCALE = 50_000
+
+SEED_PASSWORD = "password123"
+HISTORY_DAYS = 730
+DEFAULT_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)  # Fim do histórico
+MAX_ORDER_ITEMS = 50
+
+PRODUCT_POPULARITY_EXPONENT = 1.1  # Zipf: poucos produtos concentram as vendas
+USER_ACTIVITY_EXPONENT = 0.8  # Alguns clientes compram muito mais que outros
+ORDER_SIZE_EXPONENT = 2.2  # Itens por pedido: maioria 1-2, cauda até 50
+CATEGORY_BRANCHING = 3  # Subcategorias por categoria (árvores de 3-4 níveis)
+
+SEEDED_TABLES = ("users", "categories", "products", "orders", "order_items")
+
+ORDER_STATUSES = [
+    OrderStatus.DELIVERED,
+    OrderStatus.SHIPPED,
+    OrderStatus.PAID,
+    OrderStatus.PENDING,
+    OrderStatus.CANCELED,
+]
+ORDER_STATUS_WEIGHTS = [0.6, 0.1, 0.1, 0.1, 0.1]
+
+FIRST_NAMES = np.array(
+    ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Hugo",
+     "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula",
+     "Rafael", "Sofia", "Thiago", "Vitória", "William"]
+)  # fmt: skip
+LAST_NAMES = np.array(
+    ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Ferreira",
+     "Costa", "Rodrigues", "Almeida", "Nascimento", "Carvalho", "Gomes",
+     "Martins", "Araújo", "Ribeiro"]
+)  # fmt: skip
+PRODUCT_NOUNS = np.array(
+    ["Camisa", "Tênis", "Notebook", "Livro", "Mesa", "Cadeira", "Fone",
+     "Mochila", "Relógio", "Luminária", "Bola", "Garrafa", "Jaqueta",
+     "Smartphone", "Panela", "Tapete"]
+)  # fmt: skip
+PRODUCT_ADJECTIVES = np.array(
+    ["Pro", "Smart", "Kit", "Premium", "Básico", "Compacto", "Clássico",
+     "Ultra", "Eco", "Max"]
+)  # fmt: skip
+
+
+@dataclass
+class ScaleCounts:
+    """Quantidade de linhas geradas para cada tabela."""
+
+    users: int
+    categories: int
+    products: int
+    orders: int
+
+    @classmethod
+    def for_scale(cls, scale: float) -> "ScaleCounts":
+        return cls(
+            users=max(1, int(USERS_PER_SCALE * scale)),
+            categories=max(5, int(20 * scale**0.5)),
+            products=max(1, int(PRODUCTS_PER_SCALE * scale)),
+            orders=max(1, int(ORDERS_PER_SCALE * scale)),
+        )
+
+
+def zipf_weights(size: int, exponent: float, rng: np.random.Generator) -> np.ndarray:
+    """Probabilidades Zipf (1/rank^s) distribuídas em ordem aleatória."""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def random_timestamps(
+    rng: np.random.Generator, size: int, start: datetime, end: datetime
+) -> np.ndarray:
+    """Timestamps uniformes entre start e end (datetime64[us], UTC)."""
+    start_us = int(start.timestamp() * 1_000_000)
+    end_us = int(end.timestamp() * 1_000_000)
+    return rng.integers(start_us, end_us, size).astype("datetime64[us]")
+
+
+def to_datetimes(values: np.ndarray) -> list[datetime]:
+    """datetime64[us] -> datetimes com timezone (esperado pelo asyncpg)."""
+    return [value.replace(tzinfo=timezone.utc) for value in values.tolist()]
+
+
+class ScaleSeeder:
+    """Gera e carrega os dados em lotes numa única transação."""
+
+    def __init__(
+        self, scale: float, seed: int, batch_size: int, epoch: datetime = DEFAULT_EPOCH
+    ) -> None:
+        self.counts = ScaleCounts.for_scale(scale)
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.now = epoch.replace(microsecond=0)
+        self.history_start = self.now - timedelta(days=HISTORY_DAYS)
+
+    async def run(self) -> None:
+        async with engine.begin() as conn:
+            raw = await conn.get_raw_connection()
+            self.copy = raw.driver_connection.copy_records_to_table
+            await conn.execute(text("SET LOCAL synchronous_commit TO off"))
+
+            # Continua a partir dos IDs existentes (o seed pode rodar mais de uma vez)
+            self.first_ids = {}
+            for table in SEEDED_TABLES:
+                query = text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")
+                self.first_ids[table] = (await conn.execute(query)).scalar_one()
+
+            await self._timed("users", self.seed_users())
+            await self._timed("categories", self.seed_categories())
+            await self._timed("products", self.seed_products())
+            await self._timed("orders + items", self.seed_orders())
+
+            # O COPY não passa pelos services: recalcula os contadores das
+            # categorias e as vendas dos produtos
+            await conn.execute(RECONCILE_PRODUCT_COUNTS)
+            await conn.execute(RECONCILE_UNITS_SOLD)
+
+            # IDs foram gerados aqui: ajustar as sequences para os próximos INSERTs
+            for table in SEEDED_TABLES:
+                await conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT max(id) FROM {table}))"
+                    )
+                )
+
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("ANALYZE"))
+
+    async def _timed(self, label: str, coroutine) -> None:
+        started_at = perf_counter()
+        rows = await coroutine
+        print(f"   {label}: {rows:,} rows in {perf_counter() - started_at:.1f}s")
+
+    async def seed_users(self) -> int:
+        rng, count = self.rng, self.counts.users
+        # Um único hash Argon2 para todos: hashear milhões de senhas levaria horas
+        password_hash = get_password_hash(SEED_PASSWORD)
+        self.user_created_at = random_timestamps(
+            rng, count, self.history_start, self.now
+        )
+
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            ids = np.arange(start, stop) + self.first_ids["users"]
+            names = np.char.add(
+                np.char.add(rng.choice(FIRST_NAMES, stop - start), " "),
+                rng.choice(LAST_NAMES, stop - start),
+            )
+            is_active = rng.random(stop - start) < 0.98
+            created_at = to_datetimes(self.user_created_at[start:stop])
+            await self.copy(
+                "users",
+                records=zip(
+                    ids.tolist(),
+                    names.tolist(),
+                    [f"user{user_id}@example.com" for user_id in ids.tolist()],
+                    [password_hash] * (stop - start),
+                    [UserRole.CUSTOMER.name] * (stop - start),
+                    is_active.tolist(),
+                    created_at,
+                    created_at,
+                ),
+                columns=[
+                    "id", "name", "email", "password_hash", "role",
+                    "is_active", "created_at", "updated_at",
+                ],  # fmt: skip
+            )
+        return count
+
+    async def seed_categories(self) -> int:
+        ids = np.arange(self.counts.categories) + self.first_ids["categories"]
+        self.category_ids = ids
+
+        # As primeiras ~10% são raízes; as demais penduram-se nas anteriores
+        roots = max(3, len(ids) // 10)
+        parents: list[int | None] = []
+        paths: list[str] = []
+        for index in range(len(ids)):
+            if index < roots:
+                parents.append(None)
+                paths.append("/")
+                continue
+            parent = (index - roots) // CATEGORY_BRANCHING
+            parents.append(int(ids[parent]))
+            paths.append(f"{paths[parent]}{ids[parent]}/")
+
+        await self.copy(
+            "categories",
+            records=[
+                (
+                    category_id,
+                    f"Categoria {category_id}",
+                    f"categoria-{category_id}",
+                    parent_id,
+                    path,
+                )
+                for category_id, parent_id, path in zip(ids.tolist(), parents, paths)
+            ],
+            columns=["id", "name", "slug", "parent_id", "path"],
+        )
+        return len(ids)
+
+    async def seed_products(self) -> int:
+        rng, count = self.rng, self.counts.products
+        # Preço com distribuição log-normal (mediana ~R$ 60)
+        self.prices = np.round(rng.lognormal(mean=4.1, sigma=1.0, size=count), 2)
+        self.popularity = zipf_weights(count, PRODUCT_POPULARITY_EXPONENT, rng)
+        # Categorias também têm tamanhos desiguais
+        category_weights = zipf_weights(len(self.category_ids), 0.7, rng)
+
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            size = stop - start
+            ids = np.arange(start, stop) + self.first_ids["products"]
+            names = np.char.add(
+                np.char.add(rng.choice(PRODUCT_NOUNS, size), " "),
+                np.char.add(
+                    np.char.add(rng.choice(PRODUCT_ADJECTIVES, size), " "),
+                    ids.astype(str),
+                ),
+            )
+            created_at = to_datetimes(
+                random_timestamps(rng, size, self.history_start, self.now)
+            )
+            await self.copy(
+                "products",
+                records=zip(
+                    ids.tolist(),
+                    names.tolist(),
+                    self.prices[start:stop].tolist(),
+                    rng.integers(0, 500, size).tolist(),
+                    rng.choice(self.category_ids, size, p=category_weights).tolist(),
+                    (rng.random(size) < 0.95).tolist(),
+                    created_at,
+                    created_at,
+                ),
+                columns=[
+                    "id", "name", "price", "stock", "category_id",
+                    "is_active", "created_at", "updated_at",
+                ],  # fmt: skip
+            )
+        return count
+
+    async def seed_orders(self) -> int:
+        rng, count = self.rng, self.counts.orders
+        user_weights = zipf_weights(self.counts.users, USER_ACTIVITY_EXPONENT, rng)
+        now_us = np.datetime64(self.now.replace(tzinfo=None), "us")
+        rows = 0
+        next_item_id = self.first_ids["order_items"]
+
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            size = stop - start
+            order_ids = np.arange(start, stop) + self.first_ids["orders"]
+
+            # Pedido acontece depois do cadastro do cliente
+            user_index = rng.choice(self.counts.users, size, p=user_weights)
+            user_created = self.user_created_at[user_index]
+            created_at = user_created + (
+                (now_us - user_created) * rng.random(size)
+            ).astype("timedelta64[us]")
+
+            # Itens: cauda longa no tamanho, produtos pela popularidade Zipf
+            sizes = np.minimum(rng.zipf(ORDER_SIZE_EXPONENT, size), MAX_ORDER_ITEMS)
+            item_count = int(sizes.sum())
+            item_order = np.repeat(np.arange(size), sizes)
+            item_product = rng.choice(
+                self.counts.products, item_count, p=self.popularity
+            )
+            quantities = rng.geometric(0.6, item_count)
+            unit_prices = self.prices[item_product]
+            totals = np.round(
+                np.bincount(
+                    item_order, weights=quantities * unit_prices, minlength=size
+                ),
+                2,
+            )
+            statuses = rng.choice(
+                [status.name for status in ORDER_STATUSES], size, p=ORDER_STATUS_WEIGHTS
+            )
+
+            await self.copy(
+                "orders",
+                records=zip(
+                    order_ids.tolist(),
+                    (user_index + self.first_ids["users"]).tolist(),
+                    totals.tolist(),
+                    statuses.tolist(),
+                    to_datetimes(created_at),
+                ),
+                columns=["id", "user_id", "total_price", "status", "created_at"],
+            )
+            await self.copy(
+                "order_items",
+                records=zip(
+                    range(next_item_id, next_item_id + item_count),
+                    order_ids[item_order].tolist(),
+                    (item_product + self.first_ids["products"]).tolist(),
+                    quantities.tolist(),
+                    unit_prices.tolist(),
+                ),
+                columns=["id", "order_id", "product_id", "quantity", "unit_price"],
+            )
+            next_item_id += item_count
+            rows += size + item_count
+        return rows
+
+
+async def seed_scale(
+    scale: float,
+    seed: int = 42,
+    batch_size: int = 100_000,
+    epoch: datetime = DEFAULT_EPOCH,
+) -> None:
+    """Popula o banco com dados sintéticos em escala (histórico até `epoch`)."""
+
+    counts = ScaleCounts.for_scale(scale)
+    print(
+        f"\n🌱 Seeding scale={scale:g} (seed={seed}, epoch={epoch:%Y-%m-%d}): "
+        f"{counts.users:,} users, "
+        f"{counts.categories:,} categories, {counts.products:,} products, "
+        f"{counts.orders:,} orders\n"
+    )
+
+    started_at = perf_counter()
+    await ScaleSeeder(scale, seed, batch_size, epoch).run()
+
+    print(f"\n✅ Done in {perf_counter() - started_at:.1f}s")
+    print(f"   Customers: user<id>@example.com / {SEED_PASSWORD}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(seed_scale(1))
@@ -1,13 +1,74 @@
 from typing import Any, AsyncGenerator
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import (create_async_engine, async_sessionmaker, AsyncSession)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine)
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.database.replicas import Replica, ReplicaRouter
+from app.monitoring.pool import (
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    install_idle_pre_ping,
+    pool_monitor,
+)
+from app.monitoring.queries import query_log
+
+
+def build_engine(url: str, name: str) -> AsyncEngine:
+    """Cria um AsyncEngine com o pool configurado em Settings e instrumentado."""
+
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER_MODE:
+        # Em transaction pooling o PgBouncer troca a conexão do servidor entre
+        # transações: prepared statements não podem ser cacheados nem reusar nomes
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+    if settings.DB_POOL_SIZE > 0:
+        pool_args: dict[str, Any] = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+    else:
+        pool_args = {"poolclass": InstrumentedNullPool}
+
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "always",
+        connect_args=connect_args,
+        **pool_args,
+    )
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
+    if settings.DB_POOL_PRE_PING == "idle":
+        install_idle_pre_ping(new_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    pool_monitor.register(name, new_engine)
+    query_log.install(new_engine)
+
+    return new_engine
+
+
+engine = build_engine(settings.DATABASE_URL, "primary")
+
+replica_router = ReplicaRouter(
+    [
+        Replica(f"replica-{index}", build_engine(url, f"replica-{index}"))
+        for index, url in enumerate(settings.REPLICA_DATABASE_URLS, start=1)
+    ],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL,
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -18,4 +79,44 @@ AsyncSessionLocal = async_sessionmaker(
 
 async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession | Any, Any]:
+    """Sessão para rotas somente-leitura: réplica saudável ou, na falta, o primário."""
+    bind = replica_router.engine_for_read() or engine
+    async with AsyncSessionLocal(bind=bind) as session:
+        yield session
+
+
+# Sessões com escritas já enviadas (flush) e ainda sem commit
+FLUSHED = "flushed"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context: Any) -> None:
+    session.info[FLUSHED] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_flushed(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop(FLUSHED, None)
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    Devolve a conexão ao pool assim que o último acesso ao banco terminou.
+
+    A sessão só obtém conexão na primeira consulta, mas a mantém até o fim da
+    requisição. Chamar esta função antes de trabalho pesado de CPU (Argon2,
+    serialização de páginas grandes) encerra a transação de leitura com um
+    commit: os objetos carregados continuam na sessão e sem expirar
+    (expire_on_commit=False), e uma consulta posterior obtém nova conexão.
+    Com escritas pendentes ou já enviadas (flush) a transação fica como está.
+    """
+    if not db.in_transaction() or db.new or db.dirty or db.deleted:
+        return
+    if db.sync_session.info.get(FLUSHED):
+        return
+    await db.commit()
@@ -0,0 +1,8 @@
+from enum import Enum
+
+class ProductSort(str, Enum):
+    NAME = "name"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    NEWEST = "newest"
+    BEST_SELLING = "best_selling"
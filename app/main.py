@@ -1,4 +1,9 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import secrets
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Depends, Request, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,12 +13,80 @@ from app.products.router import router as products_router
 from app.categories.router import router as categories_router
 from app.orders.router import router as orders_router
 from app.users.router import router as users_router
+from app.admin.router import router as admin_router
+from app.cache.responses import ResponseCacheMiddleware
+from app.cache.invalidation import listen_for_invalidations
+from app.categories.dimension import listen_for_changes
+from app.categories.tasks import reconcile_product_counts_periodically
+from app.core.admission import AdmissionControlMiddleware
 from app.core.config import settings
 from app.database.session import get_db
+from app.database.replicas import ReadYourWritesMiddleware
+from app.monitoring.context import RequestContextMiddleware
+from app.monitoring.metrics import MetricsMiddleware, metrics, monitor_loop_lag
+from app.monitoring.nplusone import NPlusOneMiddleware
+from app.monitoring.profiling import ProfilingMiddleware
+from app.monitoring.timing import ServerTimingMiddleware
+from app.products.tasks import (
+    reconcile_units_sold_periodically,
+    refresh_product_columns,
+    refresh_suggest_index,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Séries por rota pré-registradas: o middleware só faz um lookup por requisição
+    metrics.register_routes(app.routes)
+    tasks = [asyncio.create_task(monitor_loop_lag())]
+    if settings.CATEGORY_DIMENSION_LISTEN:
+        tasks.append(asyncio.create_task(listen_for_changes()))
+    if settings.RESPONSE_CACHE_LISTEN:
+        tasks.append(asyncio.create_task(listen_for_invalidations()))
+    if settings.CATEGORY_COUNT_RECONCILE_INTERVAL_SECONDS > 0:
+        tasks.append(
+            asyncio.create_task(
+                reconcile_product_counts_periodically(
+                    settings.CATEGORY_COUNT_RECONCILE_INTERVAL_SECONDS
+                )
+            )
+        )
+    if settings.PRODUCT_UNITS_SOLD_RECONCILE_INTERVAL_SECONDS > 0:
+        tasks.append(
+            asyncio.create_task(
+                reconcile_units_sold_periodically(
+                    settings.PRODUCT_UNITS_SOLD_RECONCILE_INTERVAL_SECONDS
+                )
+            )
+        )
+    if settings.PRODUCT_COLUMN_STORE_ENABLED:
+        tasks.append(
+            asyncio.create_task(
+                refresh_product_columns(settings.PRODUCT_COLUMN_STORE_REFRESH_SECONDS)
+            )
+        )
+    if settings.PRODUCT_SUGGEST_ENABLED:
+        tasks.append(
+            asyncio.create_task(
+                refresh_suggest_index(
+                    settings.PRODUCT_SUGGEST_REFRESH_SECONDS,
+                    settings.PRODUCT_SUGGEST_REBUILD_SECONDS,
+                )
+            )
+        )
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)
@@ -21,6 +94,13 @@ app.include_router(products_router)
 app.include_router(categories_router)
 app.include_router(orders_router)
 app.include_router(users_router)
+app.include_router(admin_router)
+
+# Limites de concorrência por classe de rota (503 + Retry-After quando saturado)
+app.add_middleware(AdmissionControlMiddleware)
+
+# Cache de respostas do catálogo (dentro do CORS, cujos headers variam por Origin)
+app.add_middleware(ResponseCacheMiddleware)
 
 # Configuração CORS
 app.add_middleware(
@@ -33,8 +113,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Permite GET, POST, PUT, DELETE, etc
     allow_headers=["*"],  # Permite todos os headers incluindo Authorization
+    # Headers de diagnóstico legíveis pelo DevTools/JS do front
+    expose_headers=[
+        "Server-Timing",
+        "X-Profile-Id",
+        "X-Profile-Status",
+        "X-Cache",
+        "X-Primary-Until",
+    ],
 )
 
+# Métricas por rota (precisa rodar dentro do contexto da requisição)
+app.add_middleware(MetricsMiddleware)
+
+# Server-Timing por fase (auth, deps, handler, serialize, db, total)
+app.add_middleware(ServerTimingMiddleware)
+
+# Profiling sob demanda (X-Profile em requisições de admin)
+app.add_middleware(ProfilingMiddleware)
+
+# Detector de N+1 (N_PLUS_ONE_MODE)
+app.add_middleware(NPlusOneMiddleware)
+
+# Token de read-your-writes para as réplicas (lê o contexto da requisição)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Contexto por requisição (rota atual) para métricas de banco
+app.add_middleware(RequestContextMiddleware)
+
 
 @app.get("/health")
 async def health(db: AsyncSession = Depends(get_db)):
@@ -43,3 +149,15 @@ async def health(db: AsyncSession = Depends(get_db)):
         return {"status": "ok", "database": "connected"}
     except Exception as e:
         return {"status": "error", "database": "disconnected", "message": str(e)}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -17,6 +17,41 @@ class Category(Base):
         String(100), unique=True, nullable=False, index=True
     )
 
+    # Hierarquia: `path` lista os ancestrais ("/" na raiz, "/1/5/" para um
+    # neto de 1 via 5); a subárvore de X tem path começando com X.path + "X/"
+    parent_id: Mapped[int | None] = mapped_column(
+        ForeignKey("categories.id"), nullable=True, index=True
+    )
+    path: Mapped[str] = mapped_column(
+        String(255), default="/", server_default="/", nullable=False
+    )
+
+    # Produtos ativos da categoria, mantido pelas escritas de produtos
+    active_product_count: Mapped[int] = mapped_column(
+        Integer(), default=0, server_default="0", nullable=False
+    )
+    # Produtos ativos na categoria e em todas as descendentes
+    subtree_product_count: Mapped[int] = mapped_column(
+        Integer(), default=0, server_default="0", nullable=False
+    )
+
+    # Só mudanças dos campos do CategoryResponse (nome, slug, parent_id): os
+    # UPDATEs de contadores e de path mantêm o valor explicitamente
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # Prefixo do path (LIKE 'x%') usa o índice mesmo com collation não-C
+        Index(
+            "ix_categories_path",
+            "path",
+            postgresql_ops={"path": "varchar_pattern_ops"},
+        ),
+        # Feed de mudanças: keyset (updated_at, id)
+        Index("ix_categories_updated_at_id", "updated_at", "id"),
+    )
+
     # Relacionamento para facilitar a busca de produtos por categoria
     products: Mapped[list["Product"]] = relationship(
         "Product", back_populates="category", cascade="all, delete-orphan"
@@ -1,4 +1,14 @@
-from sqlalchemy import String, Boolean, DateTime, func, Float, Integer, ForeignKey
+from sqlalchemy import (
+    String,
+    Boolean,
+    DateTime,
+    func,
+    text,
+    Float,
+    Integer,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -13,16 +23,21 @@ class Product(Base):
     __tablename__ = "products"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(String(500), nullable=True)
     price: Mapped[float] = mapped_column(Float(), nullable=False)
     stock: Mapped[int] = mapped_column(Integer(), default=0, nullable=False)
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("categories.id"), nullable=False
+        ForeignKey("categories.id"), nullable=False, index=True
     )
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Unidades em pedidos não cancelados (mantido pelo OrderService)
+    units_sold: Mapped[int] = mapped_column(
+        Integer(), default=0, server_default="0", nullable=False
+    )
+
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -31,6 +46,17 @@ class Product(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Feed de mudanças e atualizações incrementais: keyset (updated_at, id)
+        Index("ix_products_updated_at_id", "updated_at", "id"),
+        # Ordenações da listagem (com o id de desempate do cursor)
+        # Nome em collation "C": a mesma ordem do motor colunar (code points)
+        Index("ix_products_name_id", text('name COLLATE "C"'), "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_units_sold_id", "units_sold", "id"),
+    )
+
     category: Mapped["Category"] = relationship("Category", back_populates="products")
     order_items: Mapped[list["OrderItem"]] = relationship(
         "OrderItem", back_populates="product"
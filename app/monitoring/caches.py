@@ -0,0 +1,58 @@
+"""Contadores dos caches e do single-flight da aplicação (exportados em /metrics)."""
+
+
+class CacheStats:
+    """Hits e misses de um cache."""
+
+    __slots__ = ("name", "hits", "misses")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        self.hits += 1
+
+    def miss(self) -> None:
+        self.misses += 1
+
+    @property
+    def ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+caches: dict[str, CacheStats] = {}
+
+
+def cache_stats(name: str) -> CacheStats:
+    """Contadores do cache `name` (criados no primeiro uso)."""
+    stats = caches.get(name)
+    if stats is None:
+        stats = caches[name] = CacheStats(name)
+    return stats
+
+
+class FlightStats:
+    """Chamadas de um SingleFlight: executadas, coalescidas e que esgotaram o timeout."""
+
+    __slots__ = ("name", "leaders", "collapsed", "timeouts", "in_flight")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.leaders = 0  # Chamadas que executaram a função
+        self.collapsed = 0  # Chamadas atendidas pelo resultado de outra
+        self.timeouts = 0  # Esperas que desistiram e executaram por conta própria
+        self.in_flight = 0  # Chaves em execução agora
+
+
+flights: dict[str, FlightStats] = {}
+
+
+def flight_stats(name: str) -> FlightStats:
+    """Contadores do single-flight `name` (criados no primeiro uso)."""
+    stats = flights.get(name)
+    if stats is None:
+        stats = flights[name] = FlightStats(name)
+    return stats
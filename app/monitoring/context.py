@@ -0,0 +1,84 @@
+"""Contexto por requisição compartilhado pelos hooks de observabilidade."""
+
+import secrets
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+MAX_RECORDED_STATEMENTS = 1000
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Dados coletados ao longo de uma requisição HTTP."""
+
+    scope: Scope
+    started_at: float = field(default_factory=perf_counter)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    # Fases cronometradas (auth, deps, handler, serialize...) em segundos
+    phases: dict[str, float] = field(default_factory=dict)
+    route_started_at: float = 0.0
+    endpoint_finished_at: float = 0.0
+    # Statements executados (só preenchido em requisições perfiladas)
+    statements: list[tuple[float, float, str]] | None = None
+    # Epoch até o qual as leituras do cliente vão ao primário (0 = não escreveu)
+    primary_until: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """Método + template da rota (ex.: GET /api/v1/products/{product_id})."""
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or "<unmatched>"
+        return f"{self.scope['method']} {path}"
+
+    def record_statement(self, statement: str, elapsed: float) -> None:
+        """Guarda (início em s desde a requisição, duração em s, SQL)."""
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            started_at = perf_counter() - elapsed - self.started_at
+            self.statements.append((started_at, elapsed, statement))
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+def current_route() -> str | None:
+    """Rota da requisição em andamento (None fora de uma requisição)."""
+    stats = current_request.get()
+    return stats.route if stats else None
+
+
+def has_debug_token(scope: Scope) -> bool:
+    """A requisição traz o header X-Debug-Token com o DEBUG_TOKEN configurado?"""
+    if not settings.DEBUG_TOKEN:
+        return False
+
+    for name, value in scope["headers"]:
+        if name == b"x-debug-token":
+            return secrets.compare_digest(value, settings.DEBUG_TOKEN.encode())
+    return False
+
+
+class RequestContextMiddleware:
+    """Middleware ASGI que publica o RequestStats da requisição em um ContextVar."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request.set(RequestStats(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
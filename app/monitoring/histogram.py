@@ -0,0 +1,56 @@
+"""Histograma de buckets fixos, barato o bastante para o caminho da requisição."""
+
+from bisect import bisect_left
+from typing import Sequence
+
+# Buckets em segundos (mesma escala padrão do Prometheus, com resolução sub-ms)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Contagens por bucket (limite superior inclusivo) + soma e total."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Pares (limite, contagem acumulada), terminando em +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimativa do quantil por interpolação linear dentro do bucket."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        # Caiu no bucket +Inf: o maior limite finito é a melhor estimativa
+        return self.bounds[-1] if self.bounds else 0.0
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
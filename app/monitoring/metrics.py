@@ -0,0 +1,255 @@
+"""Métricas no formato texto do Prometheus, coletadas por um middleware ASGI leve."""
+
+import asyncio
+from time import perf_counter
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import admission
+from app.monitoring.caches import caches, flights
+from app.monitoring.context import current_request
+from app.monitoring.histogram import LATENCY_BUCKETS, Histogram
+from app.monitoring.pool import pool_monitor
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+class RouteMetrics:
+    """Séries de uma combinação (método, rota), com os labels já renderizados."""
+
+    __slots__ = ("labels", "latency", "response_size", "db_queries", "db_time", "responses")
+
+    def __init__(self, method: str, route: str) -> None:
+        self.labels = f'method="{method}",route="{_escape(route)}"'
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.responses = [0] * len(STATUS_CLASSES)
+
+
+class MetricsRegistry:
+    """Todas as séries da aplicação; o render é feito só no scrape."""
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.unmatched: dict[str, RouteMetrics] = {}
+        self.in_flight = 0
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.loop_lag_last = 0.0
+
+    def register_routes(self, routes: list) -> None:
+        """Pré-registra as séries de cada rota para o middleware só fazer um lookup."""
+        for route in routes:
+            if isinstance(route, APIRoute):
+                for method in route.methods:
+                    self.routes[(method, route.path)] = RouteMetrics(method, route.path)
+
+    def route_metrics(self, scope: Scope) -> RouteMetrics:
+        method = scope["method"]
+        route = scope.get("route")
+        if route is not None:
+            metrics = self.routes.get((method, route.path))
+            if metrics is not None:
+                return metrics
+
+        metrics = self.unmatched.get(method)
+        if metrics is None:
+            metrics = self.unmatched[method] = RouteMetrics(method, "<unmatched>")
+        return metrics
+
+    def observe(self, scope: Scope, status: int, size: int, elapsed: float) -> None:
+        metrics = self.route_metrics(scope)
+        metrics.latency.observe(elapsed)
+        metrics.response_size.observe(size)
+        metrics.responses[min(max(status // 100, 1), 5) - 1] += 1
+
+        request = current_request.get()
+        if request is not None:
+            metrics.db_queries.observe(request.db_queries)
+            metrics.db_time.observe(request.db_seconds)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        series = [*self.routes.values(), *self.unmatched.values()]
+
+        _header(lines, "http_requests_total", "counter", "HTTP responses by status class")
+        for metrics in series:
+            for status_class, count in zip(STATUS_CLASSES, metrics.responses):
+                if count:
+                    lines.append(
+                        f'http_requests_total{{{metrics.labels},status="{status_class}"}} {count}'
+                    )
+
+        for name, attr, help_text in (
+            ("http_request_duration_seconds", "latency", "Request latency"),
+            ("http_response_size_bytes", "response_size", "Response body size"),
+            ("http_request_db_queries", "db_queries", "SQL statements per request"),
+            ("http_request_db_seconds", "db_time", "Time spent in SQL per request"),
+        ):
+            _header(lines, name, "histogram", help_text)
+            for metrics in series:
+                histogram = getattr(metrics, attr)
+                if histogram.count:
+                    _histogram(lines, name, metrics.labels, histogram)
+
+        _header(lines, "http_requests_in_flight", "gauge", "Requests being processed")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        _header(lines, "event_loop_lag_seconds", "histogram", "Event loop scheduling delay")
+        _histogram(lines, "event_loop_lag_seconds", "", self.loop_lag)
+        _header(lines, "event_loop_lag_last_seconds", "gauge", "Last measured loop delay")
+        lines.append(f"event_loop_lag_last_seconds {self.loop_lag_last}")
+
+        self._render_pools(lines)
+        self._render_caches(lines)
+        self._render_flights(lines)
+        self._render_admission(lines)
+
+        return "\n".join(lines) + "\n"
+
+    def _render_pools(self, lines: list[str]) -> None:
+        pools = pool_monitor.snapshot()
+        for name, key, kind, help_text in (
+            ("db_pool_size", "size", "gauge", "Configured pool size"),
+            ("db_pool_checked_out", "checked_out", "gauge", "Connections in use"),
+            ("db_pool_checked_in", "checked_in", "gauge", "Idle connections in the pool"),
+            ("db_pool_overflow", "overflow", "gauge", "Overflow connections in use"),
+            ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out"),
+        ):
+            _header(lines, name, kind, help_text)
+            for pool in pools:
+                lines.append(f'{name}{{pool="{pool["name"]}"}} {pool[key]}')
+
+        _header(lines, "db_pool_checkout_wait_seconds", "histogram", "Wait for a connection")
+        for pool in pools:
+            wait = pool["checkout_wait"]
+            labels = f'pool="{pool["name"]}"'
+            for bucket in wait["buckets"]:
+                le = "+Inf" if bucket["le_ms"] is None else repr(bucket["le_ms"] / 1000)
+                lines.append(
+                    f'db_pool_checkout_wait_seconds_bucket{{{labels},le="{le}"}} {bucket["count"]}'
+                )
+            lines.append(f"db_pool_checkout_wait_seconds_sum{{{labels}}} {wait['total_ms'] / 1000}")
+            lines.append(f"db_pool_checkout_wait_seconds_count{{{labels}}} {wait['count']}")
+
+    def _render_caches(self, lines: list[str]) -> None:
+        _header(lines, "cache_hits_total", "counter", "Cache hits")
+        for stats in caches.values():
+            lines.append(f'cache_hits_total{{cache="{stats.name}"}} {stats.hits}')
+        _header(lines, "cache_misses_total", "counter", "Cache misses")
+        for stats in caches.values():
+            lines.append(f'cache_misses_total{{cache="{stats.name}"}} {stats.misses}')
+        _header(lines, "cache_hit_ratio", "gauge", "Hits / (hits + misses)")
+        for stats in caches.values():
+            lines.append(f'cache_hit_ratio{{cache="{stats.name}"}} {stats.ratio}')
+
+    def _render_admission(self, lines: list[str]) -> None:
+        classes = admission.snapshot()
+        for name, key, kind, help_text in (
+            ("admission_limit", "limit", "gauge", "Concurrent requests allowed"),
+            ("admission_active", "active", "gauge", "Requests being processed"),
+            ("admission_queued", "queued", "gauge", "Requests waiting for a slot"),
+            ("admission_admitted_total", "admitted", "counter", "Requests admitted"),
+        ):
+            _header(lines, name, kind, help_text)
+            for route_class in classes:
+                lines.append(f'{name}{{class="{route_class["class"]}"}} {route_class[key]}')
+
+        _header(lines, "admission_shed_total", "counter", "Requests rejected with 503")
+        for route_class in classes:
+            for reason in ("queue_full", "timeout"):
+                lines.append(
+                    f'admission_shed_total{{class="{route_class["class"]}",reason="{reason}"}} '
+                    f'{route_class["shed_" + reason]}'
+                )
+
+        _header(lines, "admission_queue_wait_seconds", "histogram", "Wait for a slot")
+        for route_class in classes:
+            _histogram(
+                lines,
+                "admission_queue_wait_seconds",
+                f'class="{route_class["class"]}"',
+                route_class["queue_wait"],
+            )
+
+    def _render_flights(self, lines: list[str]) -> None:
+        for name, attr, kind, help_text in (
+            ("singleflight_leaders_total", "leaders", "counter", "Calls that ran the work"),
+            ("singleflight_collapsed_total", "collapsed", "counter", "Calls served by another"),
+            ("singleflight_timeouts_total", "timeouts", "counter", "Waits that timed out"),
+            ("singleflight_in_flight", "in_flight", "gauge", "Keys being computed"),
+        ):
+            _header(lines, name, kind, help_text)
+            for stats in flights.values():
+                lines.append(f'{name}{{flight="{stats.name}"}} {getattr(stats, attr)}')
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _header(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines: list[str], name: str, labels: str, histogram: Histogram) -> None:
+    prefix = f"{labels}," if labels else ""
+    for bound, count in histogram.cumulative():
+        le = "+Inf" if bound == float("inf") else repr(float(bound))
+        lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência, status, tamanho da resposta e uso de banco por rota."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        started_at = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            registry.in_flight -= 1
+            registry.observe(scope, status, size, perf_counter() - started_at)
+
+
+async def monitor_loop_lag(registry: MetricsRegistry = metrics, interval: float = 0.5) -> None:
+    """Mede o atraso do event loop: quanto um sleep de `interval` demorou além do pedido."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started_at = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(loop.time() - started_at - interval, 0.0)
+        registry.loop_lag.observe(lag)
+        registry.loop_lag_last = lag
@@ -0,0 +1,184 @@
+"""Detector de N+1: statements de mesmo formato repetidos dentro de uma requisição."""
+
+import logging
+import sys
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Iterator
+
+from greenlet import getcurrent
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.monitoring.context import current_route
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = Path(__file__).resolve().parents[1]
+# Frames destes pacotes não contam como "call site" (hooks e infraestrutura)
+IGNORED_PACKAGES = tuple(str(APP_ROOT / name) for name in ("monitoring", "database"))
+MAX_CALL_SITES = 5
+
+
+class NPlusOneError(AssertionError):
+    """Levantada no modo "raise" quando uma query se repete acima do limite."""
+
+
+@dataclass(slots=True)
+class RepeatedQuery:
+    """Fingerprint executado mais vezes que o limite."""
+
+    fingerprint: str
+    sample: str
+    count: int
+    call_sites: list[str]
+
+    def describe(self) -> str:
+        sites = "; ".join(self.call_sites) or "<unknown>"
+        return f"{self.count}x {self.fingerprint} (from {sites})"
+
+
+active_recorders: ContextVar[tuple["QueryRecorder", ...]] = ContextVar(
+    "active_recorders", default=()
+)
+
+
+class QueryRecorder:
+    """
+    Conta os statements executados no contexto por fingerprint e guarda de
+    onde (código da app) eles foram disparados.
+
+    Uso em testes:
+
+        with QueryRecorder(threshold=3) as recorder:
+            await client.get("/api/v1/orders")
+        recorder.assert_no_repeated_queries()
+    """
+
+    def __init__(self, threshold: int | None = None) -> None:
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.counts: Counter[str] = Counter()
+        self.samples: dict[str, str] = {}
+        self.call_sites: dict[str, Counter[str]] = defaultdict(Counter)
+        self._token = None
+
+    def __enter__(self) -> "QueryRecorder":
+        self._token = active_recorders.set((*active_recorders.get(), self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        active_recorders.reset(self._token)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, key: str, statement: str) -> None:
+        self.counts[key] += 1
+        self.samples.setdefault(key, statement)
+        site = call_site()
+        if site is not None:
+            self.call_sites[key][site] += 1
+
+    def repeated(self) -> list[RepeatedQuery]:
+        """Fingerprints executados pelo menos `threshold` vezes."""
+        return [
+            RepeatedQuery(
+                fingerprint=key,
+                sample=self.samples[key],
+                count=count,
+                call_sites=[
+                    f"{site} ({hits}x)"
+                    for site, hits in self.call_sites[key].most_common(
+                        MAX_CALL_SITES
+                    )
+                ],
+            )
+            for key, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+    def assert_no_repeated_queries(self) -> None:
+        repeated = self.repeated()
+        if repeated:
+            raise NPlusOneError(
+                "Repeated queries detected: "
+                + " | ".join(query.describe() for query in repeated)
+            )
+
+
+def record_statement(key: str, statement: str) -> None:
+    """Repassa o statement aos recorders ativos (chamado pelo QueryLog)."""
+    for recorder in active_recorders.get():
+        recorder.record(key, statement)
+
+
+def _frames() -> Iterator[FrameType]:
+    # O SQLAlchemy async executa o driver num greenlet filho: o código da app
+    # que disparou a query está na stack do greenlet pai
+    frame = sys._getframe(1)
+    current = getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        if current is None or current.gr_frame is None:
+            return
+        frame = current.gr_frame
+
+
+def call_site() -> str | None:
+    """Primeiro frame da app (fora de monitoring/ e database/) na stack atual."""
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if filename.startswith(str(APP_ROOT)) and not filename.startswith(
+            IGNORED_PACKAGES
+        ):
+            path = Path(filename).relative_to(APP_ROOT.parent)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return None
+
+
+class NPlusOneMiddleware:
+    """
+    Grava as queries de cada requisição quando N_PLUS_ONE_MODE != "off" e
+    reporta fingerprints repetidos N_PLUS_ONE_THRESHOLD vezes ou mais:
+    "log" emite um warning, "raise" levanta NPlusOneError (para a suíte de testes).
+
+    No modo "raise" a resposta fica retida até o fim da requisição: o erro
+    chega ao cliente (um 500, ou a exceção no transport ASGI dos testes) em vez
+    de uma resposta já enviada.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.N_PLUS_ONE_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+
+        raise_mode = settings.N_PLUS_ONE_MODE == "raise"
+        held: list[Message] = []
+
+        async def hold(message: Message) -> None:
+            held.append(message)
+
+        with QueryRecorder() as recorder:
+            await self.app(scope, receive, hold if raise_mode else send)
+
+        repeated = recorder.repeated()
+        route = current_route() or scope["path"]
+        if repeated and raise_mode:
+            raise NPlusOneError(
+                f"Repeated queries on {route}: "
+                + " | ".join(query.describe() for query in repeated)
+            )
+        for query in repeated:
+            logger.warning("Possible N+1 on %s: %s", route, query.describe())
+        for message in held:
+            await send(message)
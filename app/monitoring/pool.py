@@ -0,0 +1,201 @@
+"""Instrumentação do pool de conexões: espera no checkout, ocupação por rota e pre-ping."""
+
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.monitoring.context import current_route
+from app.monitoring.histogram import Histogram
+
+
+class PoolStats:
+    """Contadores de checkout de um pool."""
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+
+class InstrumentedPoolMixin:
+    """Mede quanto cada checkout esperou por uma conexão (inclui abrir conexões novas)."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.checkout_wait.observe(perf_counter() - started_at)
+
+    def recreate(self):
+        # engine.dispose() recria o pool; as estatísticas sobrevivem
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(InstrumentedPoolMixin, NullPool):
+    pass
+
+
+@dataclass(slots=True)
+class ConnectionHold:
+    """Tempo em que uma rota manteve conexões fora do pool."""
+
+    checkouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+
+class ConnectionHoldTracker:
+    """Mede, por rota, quanto tempo cada conexão fica fora do pool (checkout → checkin)."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, ConnectionHold] = {}
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Registra os listeners de checkout/checkin no pool do engine."""
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["hold"] = (
+            perf_counter(),
+            current_route() or "<background>",
+        )
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        if connection_record is None:
+            return
+
+        hold = connection_record.info.pop("hold", None)
+        if hold is None:
+            return
+
+        started_at, route = hold
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = ConnectionHold()
+        stats.observe(perf_counter() - started_at)
+
+    def snapshot(self) -> list[dict]:
+        """Estatísticas por rota, ordenadas pelo tempo total de ocupação."""
+        rows = [
+            {
+                "route": route,
+                "checkouts": stats.checkouts,
+                "total_ms": stats.total_seconds * 1000,
+                "avg_ms": stats.total_seconds * 1000 / stats.checkouts,
+                "max_ms": stats.max_seconds * 1000,
+            }
+            for route, stats in self._routes.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        self._routes.clear()
+
+
+connection_holds = ConnectionHoldTracker()
+
+
+def install_idle_pre_ping(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Pre-ping apenas de conexões ociosas há mais de `idle_seconds`.
+
+    Evita o round-trip do `pool_pre_ping=True` em todo checkout: conexões que
+    voltaram ao pool há pouco são entregues direto; as antigas são testadas e,
+    se falharem, descartadas (o pool tenta outra conexão).
+    """
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def mark_idle(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info["idle_since"] = perf_counter()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        idle_since = connection_record.info.pop("idle_since", None)
+        if idle_since is None or perf_counter() - idle_since < idle_seconds:
+            return
+
+        stats = getattr(engine.sync_engine.pool, "stats", None)
+        if stats is not None:
+            stats.pings += 1
+        try:
+            dbapi_connection.ping()
+        except Exception as error:
+            if stats is not None:
+                stats.ping_failures += 1
+            raise exc.DisconnectionError() from error
+
+
+class PoolMonitor:
+    """Registro dos engines da aplicação para o endpoint de estatísticas do pool."""
+
+    def __init__(self) -> None:
+        self._engines: dict[str, AsyncEngine] = {}
+
+    def register(self, name: str, engine: AsyncEngine) -> None:
+        self._engines[name] = engine
+        connection_holds.install(engine)
+
+    def snapshot(self) -> list[dict]:
+        return [pool_status(name, engine) for name, engine in self._engines.items()]
+
+
+def pool_status(name: str, engine: AsyncEngine) -> dict:
+    """Estado atual do pool de um engine + histograma de espera no checkout."""
+    pool = engine.sync_engine.pool
+    stats = getattr(pool, "stats", None)
+    wait = stats.checkout_wait if stats else Histogram()
+
+    # NullPool não mantém conexões: não tem tamanho/overflow
+    is_queue = isinstance(pool, AsyncAdaptedQueuePool)
+
+    return {
+        "name": name,
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if is_queue else 0,
+        "checked_in": pool.checkedin() if is_queue else 0,
+        "checked_out": pool.checkedout() if is_queue else 0,
+        "overflow": max(pool.overflow(), 0) if is_queue else 0,
+        "timeouts": stats.timeouts if stats else 0,
+        "pings": stats.pings if stats else 0,
+        "ping_failures": stats.ping_failures if stats else 0,
+        "checkout_wait": {
+            "count": wait.count,
+            "total_ms": wait.sum * 1000,
+            "p50_ms": wait.quantile(0.50) * 1000,
+            "p95_ms": wait.quantile(0.95) * 1000,
+            "p99_ms": wait.quantile(0.99) * 1000,
+            "buckets": [
+                {"le_ms": None if bound == float("inf") else bound * 1000, "count": count}
+                for bound, count in wait.cumulative()
+            ],
+        },
+    }
+
+
+pool_monitor = PoolMonitor()
@@ -0,0 +1,262 @@
+"""Profiling sob demanda de uma requisição (cProfile ou amostragem de stacks)."""
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.dependencies import is_admin_request
+from app.core.config import settings
+from app.monitoring.context import current_request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+PSTATS_LIMIT = 60  # Funções listadas no relatório do cProfile
+# Só um profiler pode estar ativo por processo e ele mede o event loop inteiro
+MAX_CONCURRENT_PROFILES = 1
+
+
+@dataclass(slots=True)
+class Profile:
+    """Resultado do profiling de uma requisição."""
+
+    id: str
+    mode: str
+    route: str
+    path: str
+    created_at: datetime
+    duration_ms: float = 0.0
+    status_code: int | None = None
+    db_queries: int = 0
+    db_ms: float = 0.0
+    stats: str = ""  # Relatório do pstats (modo cprofile)
+    # Stacks colapsadas "a;b;c N" (flamegraph.pl / speedscope), só no modo sample:
+    # o cProfile guarda apenas arestas caller -> callee, e no event loop esse
+    # grafo tem ciclos (retomadas de corrotinas) de onde não saem stacks reais
+    collapsed: str | None = None
+    samples: int = 0
+    statements: list[tuple[float, float, str]] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "route": self.route,
+            "path": self.path,
+            "created_at": self.created_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "status_code": self.status_code,
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_ms, 3),
+        }
+
+    def detail(self) -> dict:
+        return {
+            **self.summary(),
+            "stats": self.stats,
+            "collapsed": self.collapsed,
+            "samples": self.samples,
+            "statements": [
+                {
+                    "offset_ms": round(offset * 1000, 3),
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "statement": statement,
+                }
+                for offset, elapsed, statement in self.statements
+            ],
+        }
+
+
+class ProfileStore:
+    """Últimos perfis gerados (ring buffer em memória, por worker)."""
+
+    def __init__(self, size: int) -> None:
+        self._profiles: deque[Profile] = deque(maxlen=size)
+
+    def add(self, profile: Profile) -> None:
+        self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Profile | None:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> list[Profile]:
+        return list(reversed(self._profiles))
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(settings.PROFILE_HISTORY_SIZE)
+
+
+class StackSampler:
+    """Amostra periodicamente a stack da thread do event loop."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                location = f"{Path(code.co_filename).name}:{code.co_firstlineno}"
+                stack.append(f"{code.co_name} ({location})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.counts.most_common()
+        )
+
+
+def requested_mode(scope: Scope) -> str | None:
+    """Modo pedido via header X-Profile ou query ?_profile= (None = sem profiling)."""
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            mode = value.decode("latin-1").strip().lower()
+            break
+    else:
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        mode = query.get("_profile", "").lower()
+
+    if not mode:
+        return None
+    # "1"/"true" usam o modo padrão (cprofile)
+    return mode if mode in PROFILE_MODES else "cprofile"
+
+
+class ProfilingMiddleware:
+    """
+    Perfila a requisição quando ela pede (X-Profile ou ?_profile=) e vem
+    autenticada por um admin ativo (Bearer). Só uma requisição é perfilada por
+    vez; as demais rodam normalmente com `X-Profile-Status: busy`.
+
+    O profiler mede a thread do event loop inteira: outras requisições
+    concorrentes no mesmo worker aparecem no perfil.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._active = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = current_request.get()
+        mode = requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        # A consulta do usuário não entra no perfil
+        db_queries, db_seconds = stats.db_queries, stats.db_seconds
+        is_admin = await is_admin_request(scope)
+        stats.db_queries, stats.db_seconds = db_queries, db_seconds
+        if not is_admin:
+            await self.app(scope, receive, send)
+            return
+
+        if self._active >= MAX_CONCURRENT_PROFILES:
+            busy_send = _with_headers(send, {"X-Profile-Status": "busy"})
+            await self.app(scope, receive, busy_send)
+            return
+
+        profile = Profile(
+            id=uuid.uuid4().hex[:12],
+            mode=mode,
+            route="",
+            path=scope["path"],
+            created_at=datetime.now(timezone.utc),
+        )
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        send_wrapper = _with_headers(
+            send_with_profile,
+            {"X-Profile-Id": profile.id, "X-Profile-Status": "recorded"},
+        )
+
+        sampler: StackSampler | None = None
+        profiler: cProfile.Profile | None = None
+        started_at = perf_counter()
+        try:
+            self._active += 1
+            stats.statements = []
+            if mode == "sample":
+                sampler = StackSampler(
+                    threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+                )
+                sampler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._active -= 1
+            if sampler is not None:
+                sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+
+            profile.duration_ms = (perf_counter() - started_at) * 1000
+            profile.route = stats.route
+            profile.db_queries = stats.db_queries
+            profile.db_ms = stats.db_seconds * 1000
+            profile.statements = stats.statements
+            if sampler is not None:
+                profile.collapsed = sampler.collapsed()
+                profile.samples = sampler.counts.total()
+            if profiler is not None:
+                profile.stats = _render_stats(profiler)
+            profile_store.add(profile)
+            logger.info("Profile %s recorded for %s", profile.id, profile.route)
+
+
+def _render_stats(profiler: cProfile.Profile) -> str:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(PSTATS_LIMIT)
+    return buffer.getvalue()
+
+
+def _with_headers(send: Send, headers: dict[str, str]) -> Send:
+    async def send_with_headers(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response_headers = MutableHeaders(scope=message)
+            for name, value in headers.items():
+                response_headers.append(name, value)
+        await send(message)
+
+    return send_with_headers
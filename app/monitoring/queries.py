@@ -0,0 +1,178 @@
+"""
+Tempo de cada statement SQL, agregado por fingerprint, com log de queries lentas.
+
+O tempo é de relógio, do execute do cursor até o resultado chegar à sessão.
+Com asyncpg o resultado só é entregue quando o event loop volta à corrotina:
+trabalho de CPU de outra requisição no mesmo worker (ex.: Argon2 no login)
+entra na duração. Queries lentas de forma isolada, sem reprodução no banco
+(EXPLAIN ANALYZE, pg_stat_statements), costumam ser travamentos do loop; o
+lag do loop está em /metrics (event_loop_lag_seconds).
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.monitoring.caches import cache_stats
+from app.monitoring.context import current_request
+from app.monitoring.histogram import Histogram
+from app.monitoring.nplusone import record_statement
+
+logger = logging.getLogger(__name__)
+
+MAX_FINGERPRINTS = 2000
+OVERFLOW_FINGERPRINT = "<other>"
+SAMPLE_MAX_LENGTH = 2000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_CAST = re.compile(r"::\w+(?:\[\])?")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+|\?")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES = re.compile(r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normaliza um statement para agrupar queries de mesmo formato.
+
+    Literais e parâmetros viram `?`, casts são removidos, listas
+    (`IN ($1, $2, ...)`, `VALUES`) colapsam em `(...)` e espaços são compactados.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _CAST.sub("", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _LIST.sub("(...)", normalized)
+    normalized = _VALUES.sub(r"\1", normalized)
+    return _SPACES.sub(" ", normalized).strip()
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Agregado de um fingerprint."""
+
+    sample: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    durations: Histogram = field(default_factory=Histogram)
+    routes: dict[str, int] = field(default_factory=dict)
+
+    def observe(self, seconds: float, route: str | None) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.durations.observe(seconds)
+        if route is not None and (route in self.routes or len(self.routes) < 20):
+            self.routes[route] = self.routes.get(route, 0) + 1
+
+
+class QueryLog:
+    """Hooks de engine que medem cada statement e mantêm a tabela por fingerprint."""
+
+    def __init__(self, slow_threshold_ms: float) -> None:
+        self.slow_threshold = slow_threshold_ms / 1000
+        self._stats: dict[str, QueryStats] = {}
+        self._compiled_cache = cache_stats("sqlalchemy_compiled_sql")
+
+    def install(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["query_started_at"].pop()
+        self.observe(statement, elapsed)
+
+        # Cache de compilação do SQLAlchemy (statement -> SQL)
+        if context is not None:
+            if context.cache_hit is CACHE_HIT:
+                self._compiled_cache.hit()
+            elif context.cache_hit is CACHE_MISS:
+                self._compiled_cache.miss()
+
+    def _handle_error(self, context) -> None:
+        # Statement que falhou (timeout, violação de constraint...) não passa pelo
+        # after_cursor_execute: tira o início da pilha e mede até a falha
+        conn = context.connection
+        if conn is None:
+            return
+        started = conn.info.get("query_started_at")
+        if started:
+            elapsed = perf_counter() - started.pop()
+            if context.statement is not None:
+                self.observe(context.statement, elapsed)
+
+    def observe(self, statement: str, elapsed: float) -> None:
+        """Registra um statement executado (também usado pelos outros coletores)."""
+        request = current_request.get()
+        route = None
+        if request is not None:
+            request.db_queries += 1
+            request.db_seconds += elapsed
+            route = request.route
+            if request.statements is not None:
+                request.record_statement(statement, elapsed)
+
+        key = fingerprint(statement)
+        record_statement(key, statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= MAX_FINGERPRINTS:
+                key = OVERFLOW_FINGERPRINT
+                stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(sample=statement[:SAMPLE_MAX_LENGTH])
+        stats.observe(elapsed, route)
+
+        if elapsed >= self.slow_threshold:
+            logger.warning(
+                "Slow query (%.1f ms wall clock, includes event-loop stalls) on %s: %s",
+                elapsed * 1000,
+                route or "<background>",
+                _SPACES.sub(" ", statement)[:SAMPLE_MAX_LENGTH],
+            )
+
+    def top(self, limit: int = 20, order_by: str = "total") -> list[dict]:
+        """Fingerprints mais caros segundo `order_by` (total, p95, max ou count)."""
+        rows = [
+            {
+                "fingerprint": key,
+                "sample": stats.sample,
+                "count": stats.count,
+                "total_ms": stats.total_seconds * 1000,
+                "avg_ms": stats.total_seconds * 1000 / stats.count,
+                "p95_ms": min(stats.durations.quantile(0.95), stats.max_seconds) * 1000,
+                "max_ms": stats.max_seconds * 1000,
+                "routes": dict(sorted(stats.routes.items(), key=lambda r: -r[1])),
+            }
+            for key, stats in self._stats.items()
+        ]
+        sort_key = {
+            "total": "total_ms",
+            "p95": "p95_ms",
+            "max": "max_ms",
+            "count": "count",
+        }[order_by]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+
+query_log = QueryLog(slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS)
@@ -0,0 +1,136 @@
+"""Tempo por fase da requisição e header Server-Timing."""
+
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.monitoring.context import RequestStats, current_request, has_debug_token
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Soma o tempo do bloco à fase `name` da requisição atual."""
+    stats = current_request.get()
+    if stats is None:
+        yield
+        return
+
+    started_at = perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name] = stats.phases.get(name, 0.0) + perf_counter() - started_at
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute que separa o tempo da rota em fases:
+
+    - deps: parsing do body + dependências (inclui `auth`)
+    - handler: função do endpoint (sem os blocos marcados com `phase("serialize")`)
+    - serialize: validação do response_model + JSON, somada aos blocos marcados
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        # include_router recria as rotas a partir do endpoint já embrulhado
+        if iscoroutinefunction(endpoint) and not hasattr(endpoint, "__timed__"):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            stats = current_request.get()
+            if stats is None:
+                return await handler(request)
+
+            stats.route_started_at = perf_counter()
+            response = await handler(request)
+            if stats.endpoint_finished_at:
+                _add(stats, "serialize", perf_counter() - stats.endpoint_finished_at)
+            return response
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(endpoint)
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        stats = current_request.get()
+        if stats is None:
+            return await endpoint(*args, **kwargs)
+
+        started_at = perf_counter()
+        if stats.route_started_at:
+            _add(stats, "deps", started_at - stats.route_started_at)
+        serialize_before = stats.phases.get("serialize", 0.0)
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            stats.endpoint_finished_at = perf_counter()
+            inner_serialize = stats.phases.get("serialize", 0.0) - serialize_before
+            _add(stats, "handler", stats.endpoint_finished_at - started_at - inner_serialize)
+
+    timed.__timed__ = True
+    return timed
+
+
+def _add(stats: RequestStats, name: str, seconds: float) -> None:
+    stats.phases[name] = stats.phases.get(name, 0.0) + seconds
+
+
+PHASE_ORDER = ("auth", "deps", "handler", "serialize")
+
+
+def server_timing(stats: RequestStats) -> str:
+    """Valor do header Server-Timing (durações em ms)."""
+    entries = [
+        f"{name};dur={stats.phases[name] * 1000:.2f}"
+        for name in PHASE_ORDER
+        if name in stats.phases
+    ]
+    entries.extend(
+        f"{name};dur={seconds * 1000:.2f}"
+        for name, seconds in stats.phases.items()
+        if name not in PHASE_ORDER
+    )
+    entries.append(
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_queries} queries"'
+    )
+    entries.append(f"total;dur={(perf_counter() - stats.started_at) * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    Adiciona Server-Timing à resposta quando SERVER_TIMING_ENABLED=True ou a
+    requisição traz um X-Debug-Token válido.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = current_request.get()
+        if (
+            scope["type"] != "http"
+            or stats is None
+            or not (settings.SERVER_TIMING_ENABLED or has_debug_token(scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
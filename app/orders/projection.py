@@ -0,0 +1,104 @@
+"""
+Projeção de pedidos para o formato do OrderResponse a partir de linhas planas.
+
+Uma única query (pedido + usuário + itens + nome do produto) substitui o
+carregamento das relationships do ORM, e as linhas são agrupadas por pedido
+numa só passada, sem instanciar objetos ORM.
+"""
+
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order_items import OrderItem
+from app.models.orders import Order
+from app.models.products import Product
+from app.models.user import User
+
+# Statement montado uma vez; o IN expansível mantém o SQL compilado em cache
+ORDER_ROWS = (
+    select(
+        Order.id,
+        Order.user_id,
+        Order.total_price,
+        Order.status,
+        Order.created_at,
+        User.name,
+        User.email,
+        OrderItem.id,
+        OrderItem.product_id,
+        OrderItem.quantity,
+        OrderItem.unit_price,
+        Product.name,
+    )
+    .select_from(Order)
+    .outerjoin(User, User.id == Order.user_id)
+    .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+    .outerjoin(Product, Product.id == OrderItem.product_id)
+    .where(Order.id.in_(bindparam("order_ids", expanding=True)))
+    .order_by(Order.id, OrderItem.id)
+)
+
+
+def project_orders(
+    rows: Iterable[Sequence[Any]], order_ids: Sequence[int]
+) -> list[dict]:
+    """Agrupa as linhas por pedido, na ordem de `order_ids`."""
+    orders: dict[int, dict] = {}
+
+    for (
+        order_id,
+        user_id,
+        total_price,
+        status,
+        created_at,
+        user_name,
+        user_email,
+        item_id,
+        product_id,
+        quantity,
+        unit_price,
+        product_name,
+    ) in rows:
+        order = orders.get(order_id)
+        if order is None:
+            order = orders[order_id] = {
+                "id": order_id,
+                "user_id": user_id,
+                "total_price": total_price,
+                "status": status,
+                "created_at": created_at,
+                "user_name": user_name,
+                "user_email": user_email,
+                "items": [],
+            }
+
+        # Pedido sem itens vem com as colunas do item nulas (outer join)
+        if item_id is not None:
+            order["items"].append(
+                {
+                    "id": item_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "product_name": product_name,
+                }
+            )
+
+    return [orders[order_id] for order_id in order_ids if order_id in orders]
+
+
+async def load_orders(db: AsyncSession, order_ids: Sequence[int]) -> list[dict]:
+    """Payloads dos pedidos `order_ids` (na mesma ordem)."""
+    if not order_ids:
+        return []
+
+    result = await db.execute(ORDER_ROWS, {"order_ids": list(order_ids)})
+    return project_orders(result.tuples(), order_ids)
+
+
+async def load_order(db: AsyncSession, order_id: int) -> dict | None:
+    """Payload de um pedido (None se não existir)."""
+    orders = await load_orders(db, [order_id])
+    return orders[0] if orders else None
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db, release_connection
 from app.schemas.orders import (
     OrderCreate,
     OrderUpdateStatus,
     OrderResponse,
-    OrderItemResponse,
     OrderFilter,
+    OrderQuote,
 )
 from app.schemas.responses import SuccessResponse, PaginatedResponse
 from app.orders.service import OrderService
@@ -15,8 +15,10 @@ from app.auth.dependencies import get_current_active_user, require_admin
 from app.models.user import User
 from app.enums.order_status import OrderStatus
 from app.enums.user_role import UserRole
+from app.monitoring.timing import TimedRoute
+from app.schemas.serialization import item_response, paginated_response
 
-router = APIRouter(prefix="/api/v1/orders", tags=["Orders"])
+router = APIRouter(prefix="/api/v1/orders", tags=["Orders"], route_class=TimedRoute)
 
 
 @router.get("", response_model=PaginatedResponse[OrderResponse])
@@ -25,7 +27,7 @@ async def list_orders(
     user_id: int | None = Query(None, description="Filter by user (admin only)"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Listar pedidos (usuário vê apenas seus pedidos, admin vê todos)."""
@@ -43,46 +45,15 @@ async def list_orders(
     )
 
     orders, total = await OrderService.get_orders(db, filters, current_user_filter)
+    await release_connection(db)
 
-    total_pages = (total + page_size - 1) // page_size
-
-    # Montar response com dados extras
-    orders_response = []
-    for order in orders:
-        order_dict = {
-            "id": order.id,
-            "user_id": order.user_id,
-            "total_price": order.total_price,
-            "status": order.status,
-            "created_at": order.created_at,
-            "user_name": order.user.name if order.user else None,
-            "user_email": order.user.email if order.user else None,
-            "items": [
-                {
-                    "id": item.id,
-                    "product_id": item.product_id,
-                    "quantity": item.quantity,
-                    "unit_price": item.unit_price,
-                    "product_name": item.product.name if item.product else None,
-                }
-                for item in order.items
-            ],
-        }
-        orders_response.append(order_dict)
-
-    return PaginatedResponse(
-        data=orders_response,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    return paginated_response(OrderResponse, orders, total, page, page_size)
 
 
 @router.get("/{order_id}", response_model=SuccessResponse[OrderResponse])
 async def get_order(
     order_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Buscar pedido por ID."""
@@ -92,30 +63,10 @@ async def get_order(
         None if current_user.role == UserRole.ADMIN else current_user.id
     )
 
-    order = await OrderService.get_order_by_id(db, order_id, current_user_filter)
-
-    # Montar response
-    order_dict = {
-        "id": order.id,
-        "user_id": order.user_id,
-        "total_price": order.total_price,
-        "status": order.status,
-        "created_at": order.created_at,
-        "user_name": order.user.name if order.user else None,
-        "user_email": order.user.email if order.user else None,
-        "items": [
-            {
-                "id": item.id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "unit_price": item.unit_price,
-                "product_name": item.product.name if item.product else None,
-            }
-            for item in order.items
-        ],
-    }
-
-    return SuccessResponse(data=order_dict, message="Order retrieved successfully")
+    order = await OrderService.get_order(db, order_id, current_user_filter)
+    await release_connection(db)
+
+    return item_response(OrderResponse, order, message="Order retrieved successfully")
 
 
 @router.post("", response_model=SuccessResponse[OrderResponse])
@@ -127,29 +78,23 @@ async def create_order(
     """Criar pedido (usuário cria para si mesmo)."""
 
     order = await OrderService.create_order(db, order_in, current_user.id)
+    await release_connection(db)
+
+    return item_response(OrderResponse, order, message="Order created successfully")
+
+
+@router.post("/quote", response_model=SuccessResponse[OrderQuote])
+async def quote_order(
+    order_in: OrderCreate,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Cotar o carrinho: preços, total e disponibilidade, sem criar pedido."""
+
+    quote = await OrderService.quote_order(db, order_in)
+    await release_connection(db)
 
-    # Montar response
-    order_dict = {
-        "id": order.id,
-        "user_id": order.user_id,
-        "total_price": order.total_price,
-        "status": order.status,
-        "created_at": order.created_at,
-        "user_name": order.user.name if order.user else None,
-        "user_email": order.user.email if order.user else None,
-        "items": [
-            {
-                "id": item.id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "unit_price": item.unit_price,
-                "product_name": item.product.name if item.product else None,
-            }
-            for item in order.items
-        ],
-    }
-
-    return SuccessResponse(data=order_dict, message="Order created successfully")
+    return item_response(OrderQuote, quote)
 
 
 @router.patch("/{order_id}/status", response_model=SuccessResponse[OrderResponse])
@@ -162,29 +107,9 @@ async def update_order_status(
     """Atualizar status do pedido (apenas admin)."""
 
     order = await OrderService.update_order_status(db, order_id, status_in)
+    await release_connection(db)
 
-    # Montar response
-    order_dict = {
-        "id": order.id,
-        "user_id": order.user_id,
-        "total_price": order.total_price,
-        "status": order.status,
-        "created_at": order.created_at,
-        "user_name": order.user.name if order.user else None,
-        "user_email": order.user.email if order.user else None,
-        "items": [
-            {
-                "id": item.id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "unit_price": item.unit_price,
-                "product_name": item.product.name if item.product else None,
-            }
-            for item in order.items
-        ],
-    }
-
-    return SuccessResponse(data=order_dict, message="Order status updated successfully")
+    return item_response(OrderResponse, order, message="Order status updated successfully")
 
 
 @router.delete("/{order_id}", response_model=SuccessResponse[OrderResponse])
@@ -196,17 +121,6 @@ async def cancel_order(
     """Cancelar pedido (usuário cancela próprio pedido)."""
 
     order = await OrderService.cancel_order(db, order_id, current_user.id)
+    await release_connection(db)
 
-    # Montar response
-    order_dict = {
-        "id": order.id,
-        "user_id": order.user_id,
-        "total_price": order.total_price,
-        "status": order.status,
-        "created_at": order.created_at,
-        "user_name": order.user.name if order.user else None,
-        "user_email": order.user.email if order.user else None,
-        "items": [],
-    }
-
-    return SuccessResponse(data=order_dict, message="Order canceled successfully")
+    return item_response(OrderResponse, order, message="Order canceled successfully")
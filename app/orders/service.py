@@ -1,4 +1,4 @@
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
@@ -8,6 +8,10 @@ from app.models.orders import Order
 from app.models.order_items import OrderItem
 from app.models.products import Product
 from app.models.user import User
+from app.cache.invalidation import publish
+from app.cache.responses import response_cache
+from app.products.columnar import product_columns
+from app.orders.projection import load_order, load_orders
 from app.schemas.orders import OrderCreate, OrderUpdateStatus, OrderFilter
 from app.enums.order_status import OrderStatus
 
@@ -15,17 +19,88 @@ from app.enums.order_status import OrderStatus
 class OrderService:
     """Service para lógica de negócio de pedidos."""
 
+    @staticmethod
+    async def _publish_availability(db: AsyncSession, changed: bool) -> None:
+        """
+        Na transação do pedido: avisa os workers quando algum produto esgotou
+        ou voltou a ter estoque (filtro `in_stock` e facetas mudam). As outras
+        mudanças de estoque e de vendas não invalidam o cache: o estoque e a
+        ordem de "mais vendidos" exibidos atrasam até o max-age, e o pedido
+        sempre valida o estoque real.
+        """
+        if changed:
+            await publish(db, "products")
+
+    @staticmethod
+    def _availability_changed(changed: bool) -> None:
+        """Depois do commit: a mesma invalidação no próprio worker."""
+        if changed:
+            response_cache.invalidate("products")
+            product_columns.invalidate()
+
+    @staticmethod
+    async def _lock_products(
+        db: AsyncSession, product_ids: list[int]
+    ) -> dict[int, Product]:
+        """Buscar produtos por ID em uma única query, travando as linhas."""
+        query = (
+            select(Product)
+            .where(Product.id.in_(set(product_ids)))
+            .order_by(Product.id)  # Ordem fixa de lock evita deadlock
+            .with_for_update()
+            .execution_options(populate_existing=True)  # Estoque atual
+        )
+        result = await db.execute(query)
+        return {product.id: product for product in result.scalars()}
+
+    @staticmethod
+    async def _return_units_sold(db: AsyncSession, order_id: int) -> None:
+        """Desconta os itens do pedido de products.units_sold."""
+        result = await db.execute(
+            select(OrderItem.product_id, OrderItem.quantity).where(
+                OrderItem.order_id == order_id
+            )
+        )
+        items = result.all()
+        products = await OrderService._lock_products(
+            db, [product_id for product_id, _ in items]
+        )
+        for product_id, quantity in items:
+            product = products.get(product_id)
+
+            if product:
+                product.units_sold -= quantity
+
+    @staticmethod
+    def _item_issue(
+        product: Product | None, product_id: int, quantity: int, stock: int
+    ) -> tuple[int, str] | None:
+        """(status HTTP, mensagem) que impede o item de entrar no pedido."""
+        if not product:
+            return status.HTTP_404_NOT_FOUND, f"Product {product_id} not found"
+
+        if not product.is_active:
+            return (
+                status.HTTP_400_BAD_REQUEST,
+                f"Product {product.name} is not available",
+            )
+
+        if stock < quantity:
+            return (
+                status.HTTP_400_BAD_REQUEST,
+                f"Insufficient stock for product {product.name}. Available: {stock}",
+            )
+
+        return None
+
     @staticmethod
     async def get_orders(
         db: AsyncSession, filters: OrderFilter, current_user_id: int | None = None
-    ) -> tuple[list[Order], int]:
-        """Buscar pedidos com filtros e paginação."""
+    ) -> tuple[list[dict], int]:
+        """Buscar pedidos com filtros e paginação (payloads do OrderResponse)."""
 
-        # Base query com joins
-        query = select(Order).options(
-            selectinload(Order.user),
-            selectinload(Order.items).selectinload(OrderItem.product),
-        )
+        # Base query: só os IDs da página; os dados vêm da projeção
+        query = select(Order.id)
 
         # Aplicar filtros
         conditions = []
@@ -44,35 +119,47 @@ class OrderService:
             query = query.where(and_(*conditions))
 
         # Count total
-        count_query = select(Order.id)
+        count_query = select(func.count()).select_from(Order)
         if conditions:
             count_query = count_query.where(and_(*conditions))
         total_result = await db.execute(count_query)
-        total = len(total_result.all())
+        total = total_result.scalar_one()
 
         # Paginação
         offset = (filters.page - 1) * filters.page_size
         query = query.offset(offset).limit(filters.page_size)
 
         # Ordenar por data (mais recente primeiro)
-        query = query.order_by(Order.created_at.desc())
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
 
         result = await db.execute(query)
-        orders = result.scalars().all()
+        orders = await load_orders(db, result.scalars().all())
 
-        return list(orders), total
+        return orders, total
+
+    @staticmethod
+    async def get_order(
+        db: AsyncSession, order_id: int, current_user_id: int | None = None
+    ) -> dict:
+        """Buscar pedido por ID (payload do OrderResponse)."""
+        order = await load_order(db, order_id)
+
+        # Se não for admin, só vê seu próprio pedido
+        if not order or (current_user_id and order["user_id"] != current_user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+            )
+
+        return order
 
     @staticmethod
     async def get_order_by_id(
         db: AsyncSession, order_id: int, current_user_id: int | None = None
     ) -> Order:
-        """Buscar pedido por ID."""
+        """Buscar pedido por ID (com os itens)."""
         query = (
             select(Order)
-            .options(
-                selectinload(Order.user),
-                selectinload(Order.items).selectinload(OrderItem.product),
-            )
+            .options(selectinload(Order.items))
             .where(Order.id == order_id)
         )
 
@@ -93,37 +180,31 @@ class OrderService:
     @staticmethod
     async def create_order(
         db: AsyncSession, order_in: OrderCreate, user_id: int
-    ) -> Order:
+    ) -> dict:
         """Criar novo pedido."""
 
         # Validar produtos e calcular total
         total_price = 0.0
         order_items_data = []
 
+        # Buscar todos os produtos de uma vez
+        products = await OrderService._lock_products(
+            db, [item_in.product_id for item_in in order_in.items]
+        )
+        sold_out = False
+
         for item_in in order_in.items:
-            # Buscar produto
-            product_query = select(Product).where(Product.id == item_in.product_id)
-            product_result = await db.execute(product_query)
-            product = product_result.scalar_one_or_none()
-
-            if not product:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Product {item_in.product_id} not found",
-                )
-
-            if not product.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Product {product.name} is not available",
-                )
-
-            # Validar estoque
-            if product.stock < item_in.quantity:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient stock for product {product.name}. Available: {product.stock}",
-                )
+            product = products.get(item_in.product_id)
+
+            # Validar existência, disponibilidade e estoque
+            issue = OrderService._item_issue(
+                product,
+                item_in.product_id,
+                item_in.quantity,
+                product.stock if product else 0,
+            )
+            if issue:
+                raise HTTPException(status_code=issue[0], detail=issue[1])
 
             # Calcular subtotal
             subtotal = product.price * item_in.quantity
@@ -138,8 +219,10 @@ class OrderService:
                 }
             )
 
-            # Atualizar estoque
+            # Atualizar estoque e vendas (ordenação "mais vendidos")
             product.stock -= item_in.quantity
+            product.units_sold += item_in.quantity
+            sold_out = sold_out or product.stock == 0
 
         # Criar pedido
         order = Order(
@@ -156,31 +239,66 @@ class OrderService:
             order_item = OrderItem(order_id=order.id, **item_data)
             db.add(order_item)
 
+        await OrderService._publish_availability(db, sold_out)
         await db.commit()
-        await db.refresh(order)
+        OrderService._availability_changed(sold_out)
 
-        # Carregar relationships
-        await db.refresh(order, ["user", "items"])
-        for item in order.items:
-            await db.refresh(item, ["product"])
+        return await load_order(db, order.id)
 
-        return order
+    @staticmethod
+    async def quote_order(db: AsyncSession, order_in: OrderCreate) -> dict:
+        """
+        Preço e disponibilidade do carrinho como o create_order os veria,
+        sem travar linhas nem escrever: uma única leitura dos produtos.
+        """
+        product_ids = {item_in.product_id for item_in in order_in.items}
+        result = await db.execute(select(Product).where(Product.id.in_(product_ids)))
+        products = {product.id: product for product in result.scalars()}
+
+        # Itens repetidos disputam o mesmo estoque, como no create_order
+        remaining = {id_: product.stock for id_, product in products.items()}
+        items = []
+        total_price = 0.0
+        for item_in in order_in.items:
+            product = products.get(item_in.product_id)
+            stock = remaining.get(item_in.product_id, 0)
+            issue = OrderService._item_issue(
+                product, item_in.product_id, item_in.quantity, stock
+            )
+
+            subtotal = 0.0
+            if not issue:
+                subtotal = product.price * item_in.quantity
+                total_price += subtotal
+                remaining[product.id] = stock - item_in.quantity
+
+            items.append(
+                {
+                    "product_id": item_in.product_id,
+                    "product_name": product.name if product else None,
+                    "quantity": item_in.quantity,
+                    "unit_price": product.price if product else None,
+                    "subtotal": subtotal,
+                    "available_stock": stock if product else 0,
+                    "available": issue is None,
+                    "issue": issue[1] if issue else None,
+                }
+            )
+
+        return {
+            "items": items,
+            "total_price": total_price,
+            "available": all(item["available"] for item in items),
+        }
 
     @staticmethod
     async def update_order_status(
         db: AsyncSession, order_id: int, status_in: OrderUpdateStatus
-    ) -> Order:
+    ) -> dict:
         """Atualizar status do pedido."""
 
         # Buscar pedido (admin only, sem filtro de user)
-        query = (
-            select(Order)
-            .options(
-                selectinload(Order.user),
-                selectinload(Order.items).selectinload(OrderItem.product),
-            )
-            .where(Order.id == order_id)
-        )
+        query = select(Order).where(Order.id == order_id)
 
         result = await db.execute(query)
         order = result.scalar_one_or_none()
@@ -203,15 +321,18 @@ class OrderService:
                 detail="Cannot update status of delivered order",
             )
 
+        # Pedido cancelado sai das vendas (o estoque não volta por aqui)
+        if status_in.status == OrderStatus.CANCELED:
+            await OrderService._return_units_sold(db, order_id)
+
         order.status = status_in.status
 
         await db.commit()
-        await db.refresh(order)
 
-        return order
+        return await load_order(db, order_id)
 
     @staticmethod
-    async def cancel_order(db: AsyncSession, order_id: int, user_id: int) -> Order:
+    async def cancel_order(db: AsyncSession, order_id: int, user_id: int) -> dict:
         """Cancelar pedido (devolve estoque)."""
 
         # Buscar pedido
@@ -230,19 +351,24 @@ class OrderService:
                 detail="Order is already canceled",
             )
 
-        # Devolver estoque
+        # Devolver estoque e descontar das vendas
+        products = await OrderService._lock_products(
+            db, [item.product_id for item in order.items]
+        )
+        restocked = False
         for item in order.items:
-            product_query = select(Product).where(Product.id == item.product_id)
-            product_result = await db.execute(product_query)
-            product = product_result.scalar_one_or_none()
+            product = products.get(item.product_id)
 
             if product:
+                restocked = restocked or product.stock == 0
                 product.stock += item.quantity
+                product.units_sold -= item.quantity
 
         # Atualizar status
         order.status = OrderStatus.CANCELED
 
+        await OrderService._publish_availability(db, restocked)
         await db.commit()
-        await db.refresh(order)
+        OrderService._availability_changed(restocked)
 
-        return order
+        return await load_order(db, order_id)
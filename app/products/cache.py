@@ -0,0 +1,80 @@
+"""
+Cache de produtos por id (já no formato do ProductResponse).
+
+Compartilhado pela busca por id e pela busca em lote: carrinho e lista de
+desejos pedem combinações de ids que quase nunca se repetem (e não acertam
+o cache de respostas), mas os produtos de cada uma se repetem bastante.
+
+Invalidado pelas mesmas tags do cache de respostas ("products" e
+"categories", pois a resposta embute a categoria), inclusive as recebidas
+de outros workers, e limitado por RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Iterable
+
+from app.cache.responses import response_cache
+from app.core.config import settings
+from app.monitoring.caches import cache_stats
+
+TAGS = ("products", "categories")
+
+MAX_ENTRIES = 10_000
+
+
+@dataclass(slots=True)
+class ProductEntry:
+    product: dict
+    expires_at: float
+    generations: tuple[int, ...]
+
+
+class ProductCache:
+    """LRU de produtos por id."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[int, ProductEntry] = OrderedDict()
+        self.stats = cache_stats("products_by_id")
+
+    def snapshot(self) -> tuple[int, ...]:
+        """Gerações a passar para `put_many` (lidas antes da consulta)."""
+        return response_cache.snapshot(TAGS)
+
+    def get_many(self, product_ids: Iterable[int]) -> dict[int, dict]:
+        """Produtos em cache entre `product_ids` (os demais ficam de fora)."""
+        generations = self.snapshot()
+        now = monotonic()
+        found = {}
+        for product_id in product_ids:
+            entry = self.entries.get(product_id)
+            if (
+                entry is not None
+                and entry.expires_at > now
+                and entry.generations == generations
+            ):
+                self.entries.move_to_end(product_id)
+                found[product_id] = entry.product
+                self.stats.hit()
+            else:
+                self.stats.miss()
+        return found
+
+    def put_many(self, products: Iterable[dict], generations: tuple[int, ...]) -> None:
+        """Guarda produtos lidos com as gerações `generations`."""
+        ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+        # Escrita durante a leitura: os produtos já nasceram defasados
+        if ttl <= 0 or self.snapshot() != generations:
+            return
+
+        expires_at = monotonic() + ttl
+        for product in products:
+            self.entries[product["id"]] = ProductEntry(product, expires_at, generations)
+            self.entries.move_to_end(product["id"])
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+product_cache = ProductCache(MAX_ENTRIES)
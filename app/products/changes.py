@@ -0,0 +1,83 @@
+"""
+Feed de mudanças do catálogo (sincronização incremental de clientes).
+
+Produtos e categorias são lidos em ordem de (updated_at, id), a partir da
+posição guardada no token. O token é opaco para o cliente: base64 de um JSON
+com a última posição entregue de cada tabela. Sem token, o feed começa do
+início e devolve o catálogo inteiro (em páginas).
+
+updated_at é o início da transação da escrita: uma transação demorada pode
+commitar depois que linhas mais novas já foram entregues e ficaria para
+trás do token. Por isso o feed só vai até now() - CHANGE_FEED_SAFETY_SECONDS.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+# Posição no feed de uma tabela: (updated_at, id) da última linha entregue
+Position = tuple[datetime, int] | None
+
+
+def encode_token(positions: dict[str, Position]) -> str:
+    """Token opaco com a posição de cada tabela."""
+    data = {
+        key: [position[0].isoformat(), position[1]]
+        for key, position in positions.items()
+        if position is not None
+    }
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str | None, keys: tuple[str, ...]) -> dict[str, Position]:
+    """Posições do token (None = início); token malformado é 400."""
+    positions: dict[str, Position] = {key: None for key in keys}
+    if not token:
+        return positions
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        for key in keys:
+            if key in data:
+                updated_at, id_ = data[key]
+                positions[key] = (datetime.fromisoformat(updated_at), int(id_))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid change token"
+        )
+    return positions
+
+
+async def changed_after(
+    db: AsyncSession, model: Any, position: Position, limit: int
+) -> tuple[list[Any], Position, bool]:
+    """
+    Até `limit` linhas de `model` alteradas depois de `position` (índice
+    (updated_at, id)), a nova posição e se ficaram linhas para a próxima.
+    """
+    safety = timedelta(seconds=settings.CHANGE_FEED_SAFETY_SECONDS)
+    query = (
+        select(model)
+        .where(model.updated_at <= func.now() - safety)
+        .order_by(model.updated_at, model.id)
+        .limit(limit + 1)
+    )
+    if position is not None:
+        query = query.where(tuple_(model.updated_at, model.id) > position)
+
+    rows = list((await db.execute(query)).scalars())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (rows[-1].updated_at, rows[-1].id)
+    return rows, position, has_more
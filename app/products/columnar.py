@@ -0,0 +1,238 @@
+"""
+Motor colunar do catálogo em memória (opcional).
+
+Cada worker guarda as colunas de filtro dos produtos (id, category_id,
+price, stock, is_active, name) em arrays numpy, fisicamente ordenados por
+(name, id), a ordem da listagem. Os filtros de categoria, faixa de preço,
+estoque e ativo viram máscaras vetorizadas; a página são as posições
+selecionadas da máscara, e só os `page_size` produtos dela são lidos do
+banco (pela chave primária). A busca por nome continua no SQL.
+
+Uma tarefa do lifespan carrega a tabela inteira e depois aplica apenas as
+linhas com `updated_at` recente. Enquanto há escrita local ainda não
+aplicada (ou antes da primeira carga), as consultas voltam ao SQL. Escritas
+de outros workers aparecem em até PRODUCT_COLUMN_STORE_REFRESH_SECONDS.
+Produtos apagados fisicamente (fora da API, que só desativa) continuam nas
+colunas até a próxima carga completa.
+
+A ordem por nome é a de code points do Python, igual à do caminho SQL, que
+ordena por `name COLLATE "C"` qualquer que seja a collation do banco.
+"""
+
+import asyncio
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.enums.product_sort import ProductSort
+from app.models.products import Product
+from app.monitoring.caches import cache_stats
+from app.schemas.products import ProductFilter
+
+# updated_at é o início da transação: commits demorados chegam "no passado"
+REFRESH_OVERLAP = timedelta(seconds=5)
+# Acima desta fração de linhas alteradas, recarregar tudo sai mais barato
+FULL_RELOAD_RATIO = 0.1
+
+COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.category_id,
+    Product.price,
+    Product.stock,
+    Product.is_active,
+    Product.updated_at,
+)
+
+
+class ProductColumns:
+    """Colunas de filtro dos produtos, ordenadas por (name, id)."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        # Escritas locais avisadas e aplicadas; diferentes = consultas no SQL
+        self.writes = 0
+        self.applied = 0
+        self.changed = asyncio.Event()
+        self.high_water: datetime | None = None
+        self.stats = cache_stats("product_columns")
+
+    @property
+    def available(self) -> bool:
+        return (
+            settings.PRODUCT_COLUMN_STORE_ENABLED
+            and self.ready
+            and self.applied == self.writes
+        )
+
+    def invalidate(self) -> None:
+        """Chamado após escritas de produtos: acorda a atualização."""
+        self.writes += 1
+        self.changed.set()
+
+    def can_answer(self, filters: ProductFilter) -> bool:
+        """A consulta dispensa o SQL? (busca por nome, outra ordem e cursor não)."""
+        if not settings.PRODUCT_COLUMN_STORE_ENABLED:
+            return False
+        if (
+            filters.name
+            or filters.sort != ProductSort.NAME
+            or filters.cursor
+            or not self.available
+        ):
+            self.stats.miss()
+            return False
+        self.stats.hit()
+        return True
+
+    def query(
+        self, filters: ProductFilter, category_ids: tuple[int, ...] | None
+    ) -> tuple[list[int], int]:
+        """Ids da página (na ordem da listagem) e total."""
+        mask = self.active == filters.is_active
+
+        if category_ids is not None:
+            # Tabela de lookup por category_id: mais rápida que np.isin
+            wanted = np.zeros(self.max_category_id + 1, dtype=bool)
+            known = [id_ for id_ in category_ids if id_ <= self.max_category_id]
+            wanted[known] = True
+            mask &= wanted[self.category_ids]
+
+        if filters.min_price is not None:
+            mask &= self.prices >= filters.min_price
+
+        if filters.max_price is not None:
+            mask &= self.prices <= filters.max_price
+
+        if filters.in_stock is not None:
+            mask &= (self.stocks > 0) == filters.in_stock
+
+        positions = np.flatnonzero(mask)
+        offset = (filters.page - 1) * filters.page_size
+        page = positions[offset : offset + filters.page_size]
+        return self.ids[page].tolist(), len(positions)
+
+    def _load(self, rows: list[tuple]) -> None:
+        """Substitui as colunas pelas linhas dadas (já ordenadas por name, id)."""
+        self.names = [row[1] for row in rows]
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.category_ids = np.array([row[2] for row in rows], dtype=np.int64)
+        self.prices = np.array([row[3] for row in rows], dtype=np.float64)
+        self.stocks = np.array([row[4] for row in rows], dtype=np.int64)
+        self.active = np.array([row[5] for row in rows], dtype=bool)
+        self._index()
+
+    def _index(self) -> None:
+        """Índice id -> posição (via searchsorted) e maior category_id."""
+        self.by_id = np.argsort(self.ids, kind="stable")
+        self.sorted_ids = self.ids[self.by_id]
+        self.max_category_id = (
+            int(self.category_ids.max()) if len(self.category_ids) else 0
+        )
+
+    def _positions(self, ids: list[int]) -> list[int | None]:
+        found = np.searchsorted(self.sorted_ids, ids)
+        positions = []
+        for id_, index in zip(ids, found.tolist()):
+            if index < len(self.sorted_ids) and self.sorted_ids[index] == id_:
+                positions.append(int(self.by_id[index]))
+            else:
+                positions.append(None)
+        return positions
+
+    def _apply(self, rows: list[tuple]) -> None:
+        """
+        Aplica linhas alteradas: atualiza no lugar as que mantêm o nome e
+        reinsere (na posição da ordem por nome) as novas e as renomeadas.
+        """
+        moved: list[tuple] = []
+        removed: list[int] = []
+        for row, position in zip(rows, self._positions([row[0] for row in rows])):
+            if position is not None and self.names[position] == row[1]:
+                self.category_ids[position] = row[2]
+                self.prices[position] = row[3]
+                self.stocks[position] = row[4]
+                self.active[position] = row[5]
+                continue
+            if position is not None:
+                removed.append(position)
+            moved.append(row)
+
+        if not moved:
+            return
+
+        if removed:
+            removed.sort(reverse=True)
+            for position in removed:
+                del self.names[position]
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[removed] = False
+            for name in ("ids", "category_ids", "prices", "stocks", "active"):
+                setattr(self, name, getattr(self, name)[keep])
+
+        moved.sort(key=lambda row: (row[1], row[0]))
+        ids = self.ids
+        points = [
+            bisect_left(
+                range(len(ids)),
+                (row[1], row[0]),
+                key=lambda index: (self.names[index], ids[index]),
+            )
+            for row in moved
+        ]
+        for point, row in zip(reversed(points), reversed(moved)):
+            self.names.insert(point, row[1])
+        for name, column in (
+            ("ids", 0),
+            ("category_ids", 2),
+            ("prices", 3),
+            ("stocks", 4),
+            ("active", 5),
+        ):
+            values = [row[column] for row in moved]
+            setattr(self, name, np.insert(getattr(self, name), points, values))
+        self._index()
+
+    async def reload(self, db: AsyncSession) -> None:
+        """Carga completa (também descarta produtos apagados fisicamente)."""
+        writes = self.writes
+        self.changed.clear()
+        # O banco ordena (collation "C" = ordem de code points do Python)
+        query = select(*COLUMNS).order_by(Product.name.collate("C"), Product.id)
+        rows = list((await db.execute(query)).tuples())
+        self.high_water = max((row[6] for row in rows), default=None)
+        self._load(rows)
+        self.applied = writes
+        self.ready = True
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Aplica as linhas com updated_at desde a última leitura."""
+        if not self.ready:
+            await self.reload(db)
+            return
+
+        # Escritas avisadas até aqui já estão commitadas e entram nesta leitura
+        writes = self.writes
+        self.changed.clear()
+        query = select(*COLUMNS)
+        if self.high_water is not None:
+            query = query.where(Product.updated_at > self.high_water - REFRESH_OVERLAP)
+        rows = list((await db.execute(query)).tuples())
+
+        if len(rows) > len(self.ids) * FULL_RELOAD_RATIO:
+            await self.reload(db)
+            return
+
+        if rows:
+            self.high_water = max(
+                self.high_water or rows[0][6], *(row[6] for row in rows)
+            )
+            self._apply(rows)
+        self.applied = writes
+
+
+product_columns = ProductColumns()
@@ -0,0 +1,194 @@
+"""
+Facetas da listagem de produtos.
+
+Para o conjunto de filtros atual, uma única query com GROUPING SETS devolve
+a contagem por categoria, o histograma de preços, a contagem com/sem estoque
+e o total (o conjunto vazio), que dispensa a query de contagem da listagem.
+
+O resultado não depende da página: fica num cache por assinatura dos
+filtros, invalidado pelas mesmas tags do cache de respostas ("products" e
+"categories") e limitado por RESPONSE_CACHE_TTL_SECONDS. Cálculos
+concorrentes da mesma assinatura são coalescidos.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Hashable
+
+from sqlalchemy import Float, and_, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.responses import response_cache
+from app.cache.singleflight import SingleFlight
+from app.categories.dimension import category_dimension
+from app.core.config import settings
+from app.models.products import Product
+from app.monitoring.caches import cache_stats
+from app.schemas.products import ProductFacets, ProductFilter
+
+# Limites das faixas de preço: [0, 25), [25, 50), ..., [1000, ∞)
+PRICE_BUCKET_BOUNDS = (0.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+# Tags do cache de respostas cujas escritas invalidam as facetas
+TAGS = ("products", "categories")
+
+MAX_ENTRIES = 512
+
+# grouping(category_id, bucket, in_stock): bit ligado = coluna fora do grupo
+BY_CATEGORY, BY_PRICE, BY_STOCK, TOTAL = 0b011, 0b101, 0b110, 0b111
+
+
+def signature(filters: ProductFilter) -> tuple:
+    """Filtros que afetam as facetas (a paginação não entra)."""
+    return (
+        filters.name,
+        filters.category_id,
+        filters.min_price,
+        filters.max_price,
+        filters.in_stock,
+        filters.is_active,
+    )
+
+
+async def compute_facets(
+    db: AsyncSession, conditions: list[Any]
+) -> tuple[ProductFacets, int]:
+    """Facetas e total dos produtos que atendem `conditions`, numa query."""
+    bucket = func.width_bucket(
+        Product.price, literal(list(PRICE_BUCKET_BOUNDS), ARRAY(Float))
+    ).label("bucket")
+    in_stock = (Product.stock > 0).label("in_stock")
+
+    query = (
+        select(
+            func.grouping(Product.category_id, bucket, in_stock),
+            Product.category_id,
+            bucket,
+            in_stock,
+            func.count(),
+        )
+        .where(and_(*conditions))
+        .group_by(
+            func.grouping_sets(
+                tuple_(Product.category_id), tuple_(bucket), tuple_(in_stock), tuple_()
+            )
+        )
+    )
+    result = await db.execute(query)
+
+    total = 0
+    by_category: dict[int, int] = {}
+    by_bucket = [0] * len(PRICE_BUCKET_BOUNDS)
+    by_stock = {True: 0, False: 0}
+    for grouping, category_id, bucket_index, has_stock, count in result.tuples():
+        if grouping == BY_CATEGORY:
+            by_category[category_id] = count
+        elif grouping == BY_PRICE:
+            # width_bucket devolve 1..n para preços >= 0
+            by_bucket[max(bucket_index, 1) - 1] += count
+        elif grouping == BY_STOCK:
+            by_stock[has_stock] = count
+        elif grouping == TOTAL:
+            total = count
+
+    categories = await category_dimension.resolve(by_category)
+    # A contagem de cada categoria também soma na subárvore dos ancestrais
+    subtree: dict[int, int] = {}
+    for category_id, count in by_category.items():
+        category = categories.get(category_id)
+        ancestor_ids = category.ancestor_ids if category else []
+        for id_ in (*ancestor_ids, category_id):
+            subtree[id_] = subtree.get(id_, 0) + count
+
+    category_facets = [
+        {
+            "id": id_,
+            "name": categories[id_].name,
+            "slug": categories[id_].slug,
+            "parent_id": categories[id_].parent_id,
+            "count": by_category.get(id_, 0),
+            "subtree_count": count,
+        }
+        for id_, count in subtree.items()
+        if id_ in categories
+    ]
+    category_facets.sort(key=lambda facet: (-facet["subtree_count"], facet["name"]))
+
+    price_buckets = [
+        {
+            "min": low,
+            "max": (
+                PRICE_BUCKET_BOUNDS[index + 1]
+                if index + 1 < len(PRICE_BUCKET_BOUNDS)
+                else None
+            ),
+            "count": by_bucket[index],
+        }
+        for index, low in enumerate(PRICE_BUCKET_BOUNDS)
+    ]
+
+    facets = ProductFacets(
+        categories=category_facets,
+        price_buckets=price_buckets,
+        in_stock=by_stock[True],
+        out_of_stock=by_stock[False],
+    )
+    return facets, total
+
+
+@dataclass(slots=True)
+class FacetEntry:
+    facets: ProductFacets
+    total: int
+    expires_at: float
+    generations: tuple[int, ...]
+
+
+class FacetCache:
+    """LRU de facetas por assinatura de filtros."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[Hashable, FacetEntry] = OrderedDict()
+        self.stats = cache_stats("product_facets")
+        self.flight = SingleFlight("product_facets")
+
+    async def get(
+        self, db: AsyncSession, filters: ProductFilter, conditions: list[Any]
+    ) -> tuple[ProductFacets, int]:
+        """Facetas e total de `filters`, do cache ou calculados agora."""
+        key = signature(filters)
+        generations = response_cache.snapshot(TAGS)
+
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry.expires_at > monotonic()
+            and entry.generations == generations
+        ):
+            self.entries.move_to_end(key)
+            self.stats.hit()
+            return entry.facets, entry.total
+
+        self.stats.miss()
+        # Só compartilha cálculos iniciados depois da mesma escrita
+        (facets, total), _ = await self.flight.do(
+            (key, generations),
+            lambda: compute_facets(db, conditions),
+            timeout=settings.SINGLE_FLIGHT_TIMEOUT_SECONDS,
+        )
+
+        ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+        if ttl > 0 and response_cache.snapshot(TAGS) == generations:
+            self.entries[key] = FacetEntry(
+                facets, total, monotonic() + ttl, generations
+            )
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return facets, total
+
+
+facet_cache = FacetCache(MAX_ENTRIES)
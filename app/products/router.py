@@ -1,66 +1,144 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.enums.product_sort import ProductSort
+from app.database.session import get_db, get_read_db, release_connection
 from app.schemas.products import (
     ProductCreate,
     ProductUpdate,
     ProductUpdateStock,
     ProductResponse,
     ProductFilter,
+    ProductListResponse,
+    ProductSuggestion,
+    ProductChanges,
+    ProductBatchRequest,
+    ProductBatch,
 )
-from app.schemas.responses import SuccessResponse, PaginatedResponse
+from app.schemas.responses import SuccessResponse
 from app.products.service import ProductService
+from app.cache.responses import cached
 from app.auth.dependencies import get_current_active_user, require_admin
 from app.models.user import User
+from app.monitoring.timing import TimedRoute
+from app.schemas.serialization import item_response, list_response, paginated_response
 
-router = APIRouter(prefix="/api/v1/products", tags=["Products"])
+router = APIRouter(prefix="/api/v1/products", tags=["Products"], route_class=TimedRoute)
 
 
-@router.get("", response_model=PaginatedResponse[ProductResponse])
+@router.get("", response_model=ProductListResponse)
+@cached("products", "categories")
 async def list_products(
     name: str | None = Query(None, description="Filter by product name"),
     category_id: int | None = Query(None, description="Filter by category ID"),
     min_price: float | None = Query(None, ge=0, description="Minimum price"),
     max_price: float | None = Query(None, ge=0, description="Maximum price"),
+    in_stock: bool | None = Query(None, description="Filter by stock availability"),
     is_active: bool = Query(True, description="Filter active/inactive products"),
+    sort: ProductSort = Query(ProductSort.NAME, description="Sort order"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    facets: bool = Query(
+        False, description="Include category, price and stock facets"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Listar produtos com filtros e paginação."""
+    """
+    Listar produtos com filtros, ordenação e paginação por página ou cursor
+    (e, opcionalmente, facetas).
+    """
 
     filters = ProductFilter(
         name=name,
         category_id=category_id,
         min_price=min_price,
         max_price=max_price,
+        in_stock=in_stock,
         is_active=is_active,
+        sort=sort,
+        cursor=cursor,
         page=page,
         page_size=page_size,
     )
 
-    products, total = await ProductService.get_products(db, filters)
+    product_facets = total = None
+    if facets:
+        product_facets, total = await ProductService.get_facets(db, filters)
+    products, total, next_cursor = await ProductService.get_products(db, filters, total)
+    await release_connection(db)
+
+    return paginated_response(
+        ProductResponse,
+        products,
+        total,
+        page,
+        page_size,
+        response_type=ProductListResponse,
+        facets=product_facets,
+        next_cursor=next_cursor,
+    )
 
-    total_pages = (total + page_size - 1) // page_size
 
-    return PaginatedResponse(
-        data=[ProductResponse.model_validate(p) for p in products],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
+# Declarada antes de /{product_id}, que também casaria com /suggest
+@router.get("/suggest", response_model=SuccessResponse[list[ProductSuggestion]])
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Name prefix"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Autocomplete: produtos com uma palavra do nome começando por `q`."""
+
+    suggestions = await ProductService.suggest_products(db, q, limit)
+    await release_connection(db)
+
+    return list_response(ProductSuggestion, suggestions)
+
+
+@router.post("/batch", response_model=SuccessResponse[ProductBatch])
+async def get_products_batch(
+    batch_in: ProductBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Buscar vários produtos por ID numa chamada (na ordem pedida)."""
+
+    products, missing_ids = await ProductService.get_products_by_ids(db, batch_in.ids)
+    await release_connection(db)
+
+    return item_response(
+        ProductBatch, {"products": products, "missing_ids": missing_ids}
     )
 
 
+# Também antes de /{product_id}; lê do primário (réplicas podem estar atrasadas)
+@router.get("/changes", response_model=SuccessResponse[ProductChanges])
+async def list_changes(
+    since: str | None = Query(
+        None, description="Token from the previous call (omit to start over)"
+    ),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum rows per table"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Feed de mudanças do catálogo para sincronização incremental."""
+
+    changes = await ProductService.get_changes(db, since, limit)
+    await release_connection(db)
+
+    return item_response(ProductChanges, changes)
+
+
 @router.get("/{product_id}", response_model=SuccessResponse[ProductResponse])
+@cached("products", "categories")
 async def get_product(
     product_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Buscar produto por ID."""
 
     product = await ProductService.get_product_by_id(db, product_id)
+    await release_connection(db)
 
     return SuccessResponse(
         data=ProductResponse.model_validate(product),
@@ -77,6 +155,7 @@ async def create_product(
     """Criar produto (apenas admin)."""
 
     product = await ProductService.create_product(db, product_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=ProductResponse.model_validate(product),
@@ -94,6 +173,7 @@ async def update_product(
     """Atualizar produto (apenas admin)."""
 
     product = await ProductService.update_product(db, product_id, product_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=ProductResponse.model_validate(product),
@@ -111,6 +191,7 @@ async def update_product_stock(
     """Atualizar estoque do produto (apenas admin)."""
 
     product = await ProductService.update_stock(db, product_id, stock_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=ProductResponse.model_validate(product),
@@ -127,6 +208,7 @@ async def delete_product(
     """Desativar produto (apenas admin)."""
 
     product = await ProductService.delete_product(db, product_id)
+    await release_connection(db)
 
     return SuccessResponse(
         data=ProductResponse.model_validate(product),
@@ -1,15 +1,64 @@
-from sqlalchemy import select, and_, or_
+import logging
+from typing import Iterable
+
+from sqlalchemy import select, and_, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.models.products import Product
+from app.cache.invalidation import publish
+from app.cache.responses import response_cache
+from app.categories.dimension import CategoryRow, category_dimension
+from app.categories.service import CategoryService
 from app.models.categories import Category
+from app.products.cache import product_cache
+from app.products.changes import changed_after, decode_token, encode_token
+from app.products.columnar import product_columns
+from app.products.sorting import after_cursor, decode_cursor, encode_cursor, order_by
+from app.products.facets import facet_cache
+from app.products.suggest import suggest_index
 from app.schemas.products import (
     ProductCreate,
     ProductUpdate,
     ProductUpdateStock,
     ProductFilter,
+    ProductFacets,
+)
+
+logger = logging.getLogger(__name__)
+
+# Corrige units_sold onde divergiu das unidades em pedidos não cancelados;
+# devolve os ids
+RECONCILE_UNITS_SOLD = text(
+    """
+    WITH sold AS (
+        SELECT order_items.product_id, sum(order_items.quantity) AS units
+        FROM order_items
+        JOIN orders ON orders.id = order_items.order_id
+        WHERE orders.status <> 'CANCELED'
+        GROUP BY order_items.product_id
+    )
+    UPDATE products AS p
+    SET units_sold = coalesce(sold.units, 0)
+    FROM products AS current
+    LEFT JOIN sold ON sold.product_id = current.id
+    WHERE p.id = current.id AND p.units_sold <> coalesce(sold.units, 0)
+    RETURNING p.id
+    """
+)
+
+# Colunas expostas no ProductResponse (a categoria vem da dimensão em memória)
+RESPONSE_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "stock",
+    "category_id",
+    "is_active",
+    "created_at",
+    "updated_at",
 )
 
 
@@ -17,22 +66,82 @@ class ProductService:
     """Service para lógica de negócio de produtos."""
 
     @staticmethod
-    async def get_products(
-        db: AsyncSession, filters: ProductFilter
-    ) -> tuple[list[Product], int]:
-        """Buscar produtos com filtros e paginação."""
+    def _changed(product: Product | None = None) -> None:
+        """
+        Descarta as cópias locais do catálogo após uma escrita (os outros
+        workers recebem o `publish` feito na transação).
+        """
+        response_cache.invalidate("products")
+        product_columns.invalidate()
+        if product is not None:
+            suggest_index.upsert(product.id, product.name, product.is_active)
 
-        # Base query com join de category
-        query = select(Product).options(selectinload(Product.category))
+    @staticmethod
+    async def reconcile_units_sold(db: AsyncSession) -> int:
+        """Recalcula os units_sold divergentes; retorna quantos produtos mudaram."""
+        result = await db.execute(RECONCILE_UNITS_SOLD)
+        fixed = len(result.all())
+        if fixed:
+            await publish(db, "products")
+        await db.commit()
 
-        # Aplicar filtros
+        if fixed:
+            response_cache.invalidate("products")
+            logger.warning("Reconciled units sold of %d products", fixed)
+        return fixed
+
+    @staticmethod
+    def _to_response(product: Product, category: CategoryRow | None) -> dict:
+        """Produto no formato do ProductResponse."""
+        data = {field: getattr(product, field) for field in RESPONSE_FIELDS}
+        data["category"] = category
+        return data
+
+    @staticmethod
+    async def _with_categories(products: Iterable[Product]) -> list[dict]:
+        """Anexa a categoria de cada produto sem consultar o banco."""
+        products = list(products)
+        categories = await category_dimension.resolve(
+            {product.category_id for product in products}
+        )
+        return [
+            ProductService._to_response(product, categories.get(product.category_id))
+            for product in products
+        ]
+
+    @staticmethod
+    async def _ensure_category(category_id: int) -> CategoryRow:
+        category = await category_dimension.get(category_id)
+        if category is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
+            )
+        return category
+
+    @staticmethod
+    async def _move_active_count(
+        db: AsyncSession, before: tuple[int, bool], after: tuple[int, bool]
+    ) -> None:
+        """Ajusta os contadores de (categoria, ativo) antes -> depois."""
+        if before == after:
+            return
+        if before[1]:
+            await CategoryService.adjust_active_product_count(db, before[0], -1)
+        if after[1]:
+            await CategoryService.adjust_active_product_count(db, after[0], 1)
+
+    @staticmethod
+    async def _filter_conditions(db: AsyncSession, filters: ProductFilter) -> list:
+        """Condições WHERE dos filtros da listagem."""
         conditions = []
 
         if filters.name:
             conditions.append(Product.name.ilike(f"%{filters.name}%"))
 
         if filters.category_id:
-            conditions.append(Product.category_id == filters.category_id)
+            # A categoria e as descendentes, resolvidas pela árvore em memória
+            category_ids = await category_dimension.subtree_ids(filters.category_id)
+            conditions.append(Product.category_id.in_(category_ids))
 
         if filters.min_price is not None:
             conditions.append(Product.price >= filters.min_price)
@@ -40,36 +149,172 @@ class ProductService:
         if filters.max_price is not None:
             conditions.append(Product.price <= filters.max_price)
 
+        if filters.in_stock is not None:
+            conditions.append(
+                Product.stock > 0 if filters.in_stock else Product.stock <= 0
+            )
+
         conditions.append(Product.is_active == filters.is_active)
+        return conditions
+
+    @staticmethod
+    async def get_facets(
+        db: AsyncSession, filters: ProductFilter
+    ) -> tuple[ProductFacets, int]:
+        """Facetas e total dos filtros (a paginação é ignorada)."""
+        conditions = await ProductService._filter_conditions(db, filters)
+        return await facet_cache.get(db, filters, conditions)
+
+    @staticmethod
+    async def get_products(
+        db: AsyncSession, filters: ProductFilter, total: int | None = None
+    ) -> tuple[list[dict], int, str | None]:
+        """
+        Buscar produtos com filtros, ordenação e paginação (por página ou
+        cursor); devolve também o cursor da página seguinte. Um `total` já
+        conhecido (ex.: das facetas) dispensa a query de contagem.
+        """
+
+        if product_columns.can_answer(filters):
+            return await ProductService._get_products_from_columns(db, filters, total)
+
+        # A categoria de cada produto vem da dimensão em memória
+        query = select(Product)
+
+        # Aplicar filtros
+        conditions = await ProductService._filter_conditions(db, filters)
 
         if conditions:
             query = query.where(and_(*conditions))
 
         # Count total
-        count_query = select(Product.id).where(and_(*conditions))
-        total_result = await db.execute(count_query)
-        total = len(total_result.all())
-
-        # Paginação
-        offset = (filters.page - 1) * filters.page_size
-        query = query.offset(offset).limit(filters.page_size)
-
-        # Ordenar por nome
-        query = query.order_by(Product.name)
+        if total is None:
+            count_query = select(Product.id).where(and_(*conditions))
+            total_result = await db.execute(count_query)
+            total = len(total_result.all())
+
+        # Paginação: depois do cursor ou por offset; uma linha a mais diz se
+        # há próxima página
+        if filters.cursor:
+            position = decode_cursor(filters.sort, filters.cursor)
+            query = query.where(after_cursor(filters.sort, position))
+        else:
+            query = query.offset((filters.page - 1) * filters.page_size)
+        query = query.order_by(*order_by(filters.sort)).limit(filters.page_size + 1)
 
         result = await db.execute(query)
         products = result.scalars().all()
 
-        return list(products), total
+        next_cursor = None
+        if len(products) > filters.page_size:
+            products = products[: filters.page_size]
+            next_cursor = encode_cursor(filters.sort, products[-1])
+
+        products = await ProductService._with_categories(products)
+        return products, total, next_cursor
 
     @staticmethod
-    async def get_product_by_id(db: AsyncSession, product_id: int) -> Product:
-        """Buscar produto por ID."""
-        query = (
-            select(Product)
-            .options(selectinload(Product.category))
-            .where(Product.id == product_id)
+    async def _get_products_from_columns(
+        db: AsyncSession, filters: ProductFilter, total: int | None
+    ) -> tuple[list[dict], int, str | None]:
+        """Página e total pelo motor colunar; só a página é lida do banco."""
+        category_ids = None
+        if filters.category_id:
+            category_ids = await category_dimension.subtree_ids(filters.category_id)
+        page_ids, columns_total = product_columns.query(filters, category_ids)
+
+        result = await db.execute(select(Product).where(Product.id.in_(page_ids)))
+        by_id = {product.id: product for product in result.scalars()}
+        products = [by_id[id_] for id_ in page_ids if id_ in by_id]
+
+        next_cursor = None
+        if products and filters.page * filters.page_size < columns_total:
+            next_cursor = encode_cursor(filters.sort, products[-1])
+
+        if total is None:
+            total = columns_total
+        products = await ProductService._with_categories(products)
+        return products, total, next_cursor
+
+    @staticmethod
+    async def suggest_products(
+        db: AsyncSession, query: str, limit: int
+    ) -> list[dict]:
+        """Produtos ativos com alguma palavra do nome começando por `query`."""
+        if settings.PRODUCT_SUGGEST_ENABLED and suggest_index.ready:
+            return suggest_index.suggest(query, limit)
+
+        # Índice ainda não construído (ou desligado): prefixo de uma palavra
+        # do nome no SQL, como no índice (mas sem ignorar acentos)
+        word_prefix = or_(
+            Product.name.istartswith(query, autoescape=True),
+            Product.name.icontains(f" {query}", autoescape=True),
+        )
+        result = await db.execute(
+            select(Product.id, Product.name)
+            .where(Product.is_active, word_prefix)
+            .order_by(Product.name)
+            .limit(limit)
         )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def get_changes(db: AsyncSession, since: str | None, limit: int) -> dict:
+        """
+        Produtos (inclusive desativados) e categorias alterados depois do
+        token `since`, até `limit` de cada, e o token da próxima chamada.
+        """
+        positions = decode_token(since, ("p", "c"))
+        products, positions["p"], more_products = await changed_after(
+            db, Product, positions["p"], limit
+        )
+        categories, positions["c"], more_categories = await changed_after(
+            db, Category, positions["c"], limit
+        )
+
+        return {
+            "products": await ProductService._with_categories(products),
+            "categories": categories,
+            "next_token": encode_token(positions),
+            "has_more": more_products or more_categories,
+        }
+
+    @staticmethod
+    async def get_product_by_id(db: AsyncSession, product_id: int) -> dict:
+        """Buscar produto por ID."""
+        products, _ = await ProductService.get_products_by_ids(db, [product_id])
+        if not products:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
+            )
+        return products[0]
+
+    @staticmethod
+    async def get_products_by_ids(
+        db: AsyncSession, product_ids: list[int]
+    ) -> tuple[list[dict], list[int]]:
+        """
+        Produtos na ordem pedida (sem repetir ids) e os ids inexistentes.
+        Os que não estão no cache de produtos vêm numa única query.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        generations = product_cache.snapshot()
+        found = product_cache.get_many(product_ids)
+
+        pending = [id_ for id_ in product_ids if id_ not in found]
+        if pending:
+            result = await db.execute(select(Product).where(Product.id.in_(pending)))
+            products = await ProductService._with_categories(result.scalars())
+            product_cache.put_many(products, generations)
+            found.update((product["id"], product) for product in products)
+
+        missing = [id_ for id_ in product_ids if id_ not in found]
+        return [found[id_] for id_ in product_ids if id_ in found], missing
+
+    @staticmethod
+    async def _get_product(db: AsyncSession, product_id: int) -> Product:
+        """Produto (ORM) para as escritas."""
+        query = select(Product).where(Product.id == product_id)
 
         result = await db.execute(query)
         product = result.scalar_one_or_none()
@@ -82,81 +327,81 @@ class ProductService:
         return product
 
     @staticmethod
-    async def create_product(db: AsyncSession, product_in: ProductCreate) -> Product:
+    async def create_product(db: AsyncSession, product_in: ProductCreate) -> dict:
         """Criar novo produto."""
 
         # Validar se categoria existe
-        category_query = select(Category).where(Category.id == product_in.category_id)
-        category_result = await db.execute(category_query)
-        if not category_result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
-            )
+        category = await ProductService._ensure_category(product_in.category_id)
 
         # Criar produto
         product = Product(**product_in.model_dump())
         db.add(product)
+        await CategoryService.adjust_active_product_count(db, product.category_id, 1)
+        await publish(db, "products")
         await db.commit()
+        ProductService._changed(product)
         await db.refresh(product)
 
-        # Carregar relationship
-        await db.refresh(product, ["category"])
-
-        return product
+        return ProductService._to_response(product, category)
 
     @staticmethod
     async def update_product(
         db: AsyncSession, product_id: int, product_in: ProductUpdate
-    ) -> Product:
+    ) -> dict:
         """Atualizar produto."""
 
-        product = await ProductService.get_product_by_id(db, product_id)
+        product = await ProductService._get_product(db, product_id)
 
         # Validar categoria se foi alterada
         if product_in.category_id and product_in.category_id != product.category_id:
-            category_query = select(Category).where(
-                Category.id == product_in.category_id
-            )
-            category_result = await db.execute(category_query)
-            if not category_result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
-                )
+            await ProductService._ensure_category(product_in.category_id)
+
+        previous = (product.category_id, product.is_active)
 
         # Atualizar apenas campos fornecidos
         update_data = product_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(product, field, value)
 
+        await ProductService._move_active_count(
+            db, previous, (product.category_id, product.is_active)
+        )
+        await publish(db, "products")
         await db.commit()
+        ProductService._changed(product)
         await db.refresh(product)
-        await db.refresh(product, ["category"])
 
-        return product
+        return (await ProductService._with_categories([product]))[0]
 
     @staticmethod
     async def update_stock(
         db: AsyncSession, product_id: int, stock_in: ProductUpdateStock
-    ) -> Product:
+    ) -> dict:
         """Atualizar estoque do produto."""
 
-        product = await ProductService.get_product_by_id(db, product_id)
+        product = await ProductService._get_product(db, product_id)
         product.stock = stock_in.stock
 
+        await publish(db, "products")
         await db.commit()
+        ProductService._changed()
         await db.refresh(product)
-        await db.refresh(product, ["category"])
 
-        return product
+        return (await ProductService._with_categories([product]))[0]
 
     @staticmethod
-    async def delete_product(db: AsyncSession, product_id: int) -> Product:
+    async def delete_product(db: AsyncSession, product_id: int) -> dict:
         """Desativar produto (soft delete)."""
 
-        product = await ProductService.get_product_by_id(db, product_id)
+        product = await ProductService._get_product(db, product_id)
+        await ProductService._move_active_count(
+            db, (product.category_id, product.is_active), (product.category_id, False)
+        )
         product.is_active = False
 
+        await publish(db, "products")
         await db.commit()
+        ProductService._changed(product)
         await db.refresh(product)
 
-        return product
+        return (await ProductService._with_categories([product]))[0]
@@ -0,0 +1,98 @@
+"""
+Ordenações da listagem de produtos e cursores de paginação.
+
+Cada ordenação é uma coluna indexada junto com o id, que desempata: (coluna,
+id) define uma ordem total, e a página seguinte começa logo depois da última
+linha entregue (keyset), sem OFFSET. O cursor é opaco para o cliente: base64
+de um JSON com a ordenação e os valores (coluna, id) dessa última linha.
+
+"Mais vendidos" usa `products.units_sold`, mantido pelo OrderService na
+transação de cada pedido, em vez de agregar os itens de pedido na consulta.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+from app.enums.product_sort import ProductSort
+from app.models.products import Product
+
+# Ordenação -> (coluna, decrescente)
+SORTS = {
+    ProductSort.NAME: (Product.name, False),
+    ProductSort.PRICE_ASC: (Product.price, False),
+    ProductSort.PRICE_DESC: (Product.price, True),
+    ProductSort.NEWEST: (Product.created_at, True),
+    ProductSort.BEST_SELLING: (Product.units_sold, True),
+}
+
+
+def sort_key(sort: ProductSort) -> Any:
+    """
+    Expressão ordenada. O nome vai em collation "C" (índice ix_products_name_id),
+    a ordem de code points do motor colunar: a listagem não muda de ordem
+    conforme o caminho que respondeu.
+    """
+    column, _ = SORTS[sort]
+    return column.collate("C") if sort == ProductSort.NAME else column
+
+
+def order_by(sort: ProductSort) -> tuple:
+    """ORDER BY da ordenação (o id na mesma direção aproveita o índice)."""
+    column, descending = sort_key(sort), SORTS[sort][1]
+    if descending:
+        return column.desc(), Product.id.desc()
+    return column, Product.id
+
+
+def after_cursor(sort: ProductSort, position: tuple[Any, int]) -> Any:
+    """
+    Condição das linhas depois de `position` na ordenação. Compara na mesma
+    collation do ORDER BY: o cursor vale para páginas do SQL e do motor colunar.
+    """
+    column, descending = sort_key(sort), SORTS[sort][1]
+    key = tuple_(column, Product.id)
+    return key < position if descending else key > position
+
+
+def encode_cursor(sort: ProductSort, product: Any) -> str:
+    """Cursor da página seguinte à última linha `product` (ORM ou dict)."""
+    column, _ = SORTS[sort]
+    if isinstance(product, dict):
+        value, id_ = product[column.key], product["id"]
+    else:
+        value, id_ = getattr(product, column.key), product.id
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    raw = json.dumps({"s": sort.value, "v": value, "i": id_}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: ProductSort, cursor: str) -> tuple[Any, int]:
+    """Posição (valor, id) do cursor; malformado ou de outra ordenação é 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if data["s"] != sort.value:
+            raise ValueError("cursor from another sort")
+
+        value = data["v"]
+        if sort == ProductSort.NEWEST:
+            value = datetime.fromisoformat(value)
+        elif sort in (ProductSort.PRICE_ASC, ProductSort.PRICE_DESC):
+            value = float(value)
+        elif sort == ProductSort.BEST_SELLING:
+            value = int(value)
+        elif not isinstance(value, str):
+            raise ValueError("name cursor must be a string")
+        return value, int(data["i"])
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -0,0 +1,277 @@
+"""
+Índice de prefixos do autocomplete de nomes de produto.
+
+Os nomes dos produtos ativos são normalizados como os slugs de categoria
+(minúsculas, sem acento, palavras [a-z0-9] separadas por espaço) e
+concatenados num único texto. O índice é um array com o início de cada
+palavra nesse texto, ordenado pelo texto dali até o fim do nome: os nomes em
+que alguma palavra começa com o prefixo digitado formam um intervalo
+contíguo, achado por busca binária. Dentro dele, os resultados saem por
+popularidade (unidades vendidas, lidas na reconstrução).
+
+As escritas posteriores à reconstrução vão para um delta pequeno e ordenado
+e as entradas antigas dos produtos alterados passam a ser ignoradas. O delta
+recebe as escritas do próprio worker na hora e as dos outros workers pelas
+linhas com `updated_at` recente; quando passa de DELTA_LIMIT produtos, o
+índice é reconstruído a partir do banco.
+"""
+
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.categories.service import CategoryService
+from app.models.products import Product
+from app.monitoring.caches import cache_stats
+
+SEPARATOR = "\n"  # Menor que qualquer caractere normalizado
+REFRESH_OVERLAP = timedelta(seconds=5)
+DELTA_LIMIT = 5000  # Produtos no delta antes de reconstruir o índice
+MEMO_SIZE = 4096  # Respostas memorizadas (descartadas a cada mudança)
+
+
+def normalize(name: str) -> str:
+    """Nome sem acentos, em minúsculas, com as palavras separadas por espaço."""
+    return CategoryService.generate_slug(name).replace("-", " ")
+
+
+def word_suffixes(normalized: str) -> list[str]:
+    """O nome a partir de cada palavra ("kit smart" -> kit smart, smart)."""
+    starts = [0] + [i + 1 for i, char in enumerate(normalized) if char == " "]
+    return [normalized[start:] for start in starts] if normalized else []
+
+
+class SuggestIndex:
+    """Entradas (início de palavra) ordenadas + delta das escritas recentes."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.high_water: datetime | None = None
+        self.stats = cache_stats("product_suggest")
+        self._clear()
+
+    def _clear(self) -> None:
+        self.text = ""
+        # Por produto (ordenados por id): id, nome original e peso
+        self.ids = np.empty(0, dtype=np.int64)
+        self.names: list[str] = []
+        self.popularity: dict[int, float] = {}
+        # Por entrada (ordenadas pelo texto): início, produto e peso
+        self.starts = np.empty(0, dtype=np.int64)
+        self.owners = np.empty(0, dtype=np.int64)
+        self.weights = np.empty(0, dtype=np.float64)
+        # Delta: (sufixo normalizado, id) e id -> nome dos produtos reescritos
+        self.delta: list[tuple[str, int]] = []
+        self.delta_names: dict[int, str] = {}
+        # Produtos cujas entradas do texto não valem mais
+        self.overridden: set[int] = set()
+        self.memo: OrderedDict[tuple[str, int], list[dict]] = OrderedDict()
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return not self.ready or len(self.overridden) > DELTA_LIMIT
+
+    def _build(
+        self, rows: list[tuple[int, str]], popularity: dict[int, float]
+    ) -> dict:
+        """
+        Monta o índice a partir de (id, nome) dos produtos ativos. Roda numa
+        thread e não toca no estado atual: devolve os atributos novos.
+        """
+        rows.sort()
+        parts: list[str] = []
+        starts: list[int] = []
+        ends: list[int] = []
+        owners: list[int] = []
+        offset = 0
+        for index, (_, name) in enumerate(rows):
+            normalized = normalize(name)
+            end = offset + len(normalized)
+            for suffix in word_suffixes(normalized):
+                starts.append(end - len(suffix))
+                ends.append(end)
+                owners.append(index)
+            parts.append(normalized)
+            offset = end + len(SEPARATOR)
+
+        text = SEPARATOR.join(parts) + SEPARATOR
+        order = sorted(
+            range(len(starts)), key=lambda entry: text[starts[entry] : ends[entry]]
+        )
+
+        owners_array = np.array(owners, dtype=np.int64)[order]
+        product_weights = np.array(
+            [popularity.get(id_, 0.0) for id_, _ in rows], dtype=np.float64
+        )
+        return {
+            "text": text,
+            "ids": np.array([id_ for id_, _ in rows], dtype=np.int64),
+            "names": [name for _, name in rows],
+            "popularity": popularity,
+            "starts": np.array(starts, dtype=np.int64)[order],
+            "owners": owners_array,
+            "weights": product_weights[owners_array],
+        }
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reconstrução completa (produtos ativos e unidades vendidas)."""
+        products = await db.execute(
+            select(
+                Product.id, Product.name, Product.units_sold, Product.updated_at
+            ).where(Product.is_active)
+        )
+        rows = []
+        popularity = {}
+        high_water = self.high_water
+        for id_, name, units_sold, updated_at in products.tuples():
+            rows.append((id_, name))
+            if units_sold:
+                popularity[id_] = float(units_sold)
+            if high_water is None or updated_at > high_water:
+                high_water = updated_at
+        # Com 1M de produtos leva segundos: fora do event loop
+        fields = await asyncio.to_thread(self._build, rows, popularity)
+
+        # Escritas aplicadas durante a montagem voltam pela sobreposição
+        self._clear()
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.high_water = high_water
+        self.ready = True
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Aplica as linhas com updated_at recente (escritas de outros workers)."""
+        if self.needs_rebuild:
+            await self.rebuild(db)
+            return
+
+        query = select(Product.id, Product.name, Product.is_active, Product.updated_at)
+        if self.high_water is not None:
+            query = query.where(Product.updated_at > self.high_water - REFRESH_OVERLAP)
+        for id_, name, is_active, updated_at in (await db.execute(query)).tuples():
+            self.upsert(id_, name, is_active)
+            if self.high_water is None or updated_at > self.high_water:
+                self.high_water = updated_at
+
+    def _product_index(self, product_id: int) -> int | None:
+        index = int(np.searchsorted(self.ids, product_id))
+        if index < len(self.ids) and self.ids[index] == product_id:
+            return index
+        return None
+
+    def _current_name(self, product_id: int) -> str | None:
+        """Nome indexado hoje (None = fora do índice)."""
+        if product_id in self.delta_names:
+            return self.delta_names[product_id]
+        if product_id in self.overridden:
+            return None
+        index = self._product_index(product_id)
+        return None if index is None else self.names[index]
+
+    def upsert(self, product_id: int, name: str, is_active: bool) -> None:
+        """Reflete a escrita de um produto (idempotente)."""
+        if not self.ready:
+            return
+        if self._current_name(product_id) == (name if is_active else None):
+            return
+
+        old_name = self.delta_names.pop(product_id, None)
+        if old_name is not None:
+            for suffix in word_suffixes(normalize(old_name)):
+                index = bisect_left(self.delta, (suffix, product_id))
+                del self.delta[index]
+
+        self.overridden.add(product_id)
+        if is_active:
+            self.delta_names[product_id] = name
+            for suffix in word_suffixes(normalize(name)):
+                insort(self.delta, (suffix, product_id))
+        self.memo.clear()
+
+    def _main_matches(self, prefix: str, limit: int) -> list[tuple[float, int]]:
+        """(peso, índice do produto) das melhores entradas do texto."""
+        size = len(prefix)
+
+        def key(start: int) -> str:
+            return self.text[start : start + size]
+
+        low = bisect_left(self.starts, prefix, key=key)
+        high = bisect_right(self.starts, prefix, key=key)
+        if low == high:
+            return []
+
+        weights = self.weights[low:high]
+        owners = self.owners[low:high]
+        # Candidatos a mais cobrem produtos repetidos (2 palavras) e reescritos
+        wanted = limit * 2 + len(self.overridden)
+        while True:
+            if wanted >= len(weights):
+                best = np.argsort(-weights, kind="stable")
+            else:
+                best = np.argpartition(-weights, wanted)[:wanted]
+                best = best[np.argsort(-weights[best], kind="stable")]
+
+            matches: dict[int, float] = {}
+            for position in best.tolist():
+                owner = int(owners[position])
+                if owner in matches or int(self.ids[owner]) in self.overridden:
+                    continue
+                matches[owner] = float(weights[position])
+                if len(matches) == limit:
+                    break
+            if len(matches) == limit or len(best) == len(weights):
+                return [(weight, owner) for owner, weight in matches.items()]
+            wanted *= 4
+
+    def suggest(self, query: str, limit: int) -> list[dict]:
+        """Até `limit` produtos com alguma palavra começando por `query`."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        memo_key = (prefix, limit)
+        cached = self.memo.get(memo_key)
+        if cached is not None:
+            self.memo.move_to_end(memo_key)
+            self.stats.hit()
+            return cached
+        self.stats.miss()
+
+        candidates = [
+            (weight, int(self.ids[owner]), self.names[owner])
+            for weight, owner in self._main_matches(prefix, limit)
+        ]
+        seen: set[int] = set()
+        index = bisect_left(self.delta, (prefix,))
+        while index < len(self.delta) and self.delta[index][0].startswith(prefix):
+            product_id = self.delta[index][1]
+            if product_id not in seen:
+                seen.add(product_id)
+                candidates.append(
+                    (
+                        self.popularity.get(product_id, 0.0),
+                        product_id,
+                        self.delta_names[product_id],
+                    )
+                )
+            index += 1
+
+        # Mais vendidos primeiro (sort estável: empates na ordem do índice)
+        candidates.sort(key=lambda candidate: -candidate[0])
+        result = [
+            {"id": product_id, "name": name}
+            for _, product_id, name in candidates[:limit]
+        ]
+
+        self.memo[memo_key] = result
+        while len(self.memo) > MEMO_SIZE:
+            self.memo.popitem(last=False)
+        return result
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,66 @@
+"""Tarefas de manutenção dos produtos (lifespan e CLI)."""
+
+import asyncio
+import logging
+from contextlib import suppress
+from time import monotonic
+
+from app.database.session import AsyncSessionLocal
+from app.products.columnar import product_columns
+from app.products.service import ProductService
+from app.products.suggest import suggest_index
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_product_columns(interval: float) -> None:
+    """
+    Carrega o motor colunar e aplica as mudanças a cada `interval` segundos,
+    ou logo após uma escrita local.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await product_columns.refresh(db)
+        except Exception:
+            logger.exception("Product column store refresh failed")
+
+        with suppress(TimeoutError):
+            await asyncio.wait_for(product_columns.changed.wait(), interval)
+
+
+async def refresh_suggest_index(interval: float, rebuild_interval: float) -> None:
+    """
+    Constrói o índice do autocomplete, aplica as escritas dos outros workers
+    a cada `interval` segundos e reconstrói tudo (popularidade inclusive) a
+    cada `rebuild_interval`.
+    """
+    rebuilt_at = monotonic()
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                if rebuild_interval > 0 and monotonic() - rebuilt_at > rebuild_interval:
+                    await suggest_index.rebuild(db)
+                    rebuilt_at = monotonic()
+                else:
+                    await suggest_index.refresh(db)
+        except Exception:
+            logger.exception("Product suggestion index refresh failed")
+
+        await asyncio.sleep(interval)
+
+
+async def reconcile_units_sold() -> int:
+    """Reconcilia units_sold de todos os produtos uma vez."""
+    async with AsyncSessionLocal() as db:
+        return await ProductService.reconcile_units_sold(db)
+
+
+async def reconcile_units_sold_periodically(interval: float) -> None:
+    """Reconcilia a cada `interval` segundos (corrige escritas fora dos services)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_units_sold()
+        except Exception:
+            logger.exception("Product units sold reconciliation failed")
@@ -10,13 +10,15 @@ class CategoryBase(BaseModel):
 class CategoryCreate(CategoryBase):
     """Schema para criar categoria."""
 
-    pass
+    parent_id: int | None = None  # None = categoria raiz
 
 
 class CategoryUpdate(BaseModel):
     """Schema para atualizar categoria."""
 
     name: str | None = Field(None, min_length=3, max_length=100)
+    # Enviar parent_id (inclusive null, que torna raiz) move a subárvore
+    parent_id: int | None = None
 
 
 class CategoryResponse(CategoryBase):
@@ -26,9 +28,12 @@ class CategoryResponse(CategoryBase):
 
     id: int
     slug: str
+    parent_id: int | None = None
 
 
 class CategoryWithProductCount(CategoryResponse):
     """Categoria com contagem de produtos."""
 
     product_count: int = 0
+    # Produtos ativos da categoria e de todas as descendentes
+    subtree_product_count: int = 0
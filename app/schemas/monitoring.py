@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ConnectionHoldResponse(BaseModel):
+    """Ocupação de conexões do pool por rota."""
+
+    route: str
+    checkouts: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+
+
+class HistogramBucket(BaseModel):
+    """Bucket acumulado de histograma (le_ms=None representa +Inf)."""
+
+    le_ms: float | None
+    count: int
+
+
+class CheckoutWaitResponse(BaseModel):
+    """Distribuição do tempo de espera por uma conexão do pool."""
+
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: list[HistogramBucket]
+
+
+class PoolStatsResponse(BaseModel):
+    """Estado do pool de conexões de um engine."""
+
+    name: str
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    timeouts: int
+    pings: int
+    ping_failures: int
+    checkout_wait: CheckoutWaitResponse
+
+
+class ReplicaStatusResponse(BaseModel):
+    """Saúde e lag de uma read replica."""
+
+    name: str
+    healthy: bool
+    lag_seconds: float | None
+    error: str | None
+
+
+class QueryStatsResponse(BaseModel):
+    """Agregado de execução de um fingerprint de SQL."""
+
+    fingerprint: str
+    sample: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    p95_ms: float
+    max_ms: float
+    routes: dict[str, int]
+
+
+class ProfileSummaryResponse(BaseModel):
+    """Requisição perfilada sob demanda."""
+
+    id: str
+    mode: str
+    route: str
+    path: str
+    created_at: datetime
+    duration_ms: float
+    status_code: int | None
+    db_queries: int
+    db_ms: float
+
+
+class ProfiledStatementResponse(BaseModel):
+    """Statement executado durante a requisição perfilada."""
+
+    offset_ms: float
+    duration_ms: float
+    statement: str
+
+
+class ProfileResponse(ProfileSummaryResponse):
+    """Perfil completo: pstats (cprofile), stacks colapsadas (sample) e SQL."""
+
+    stats: str
+    collapsed: str | None
+    samples: int
+    statements: list[ProfiledStatementResponse]
@@ -31,6 +31,27 @@ class OrderCreate(BaseModel):
     items: list[OrderItemCreate] = Field(..., min_length=1)
 
 
+class OrderQuoteItem(BaseModel):
+    """Item da cotação do carrinho."""
+
+    product_id: int
+    product_name: str | None = None  # None = produto inexistente
+    quantity: int
+    unit_price: float | None = None
+    subtotal: float  # 0 para itens indisponíveis
+    available_stock: int  # Descontados os itens anteriores do mesmo produto
+    available: bool
+    issue: str | None = None  # O erro que o POST /orders devolveria
+
+
+class OrderQuote(BaseModel):
+    """Cotação do carrinho (nada é reservado)."""
+
+    items: list[OrderQuoteItem]
+    total_price: float  # Soma dos itens disponíveis
+    available: bool  # Todos os itens podem ser pedidos
+
+
 class OrderUpdateStatus(BaseModel):
     """Schema para atualizar status do pedido."""
 
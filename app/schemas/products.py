@@ -1,6 +1,10 @@
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+from app.enums.product_sort import ProductSort
+from app.schemas.categories import CategoryResponse
+from app.schemas.responses import PaginatedResponse
+
 
 class CategoryInProduct(BaseModel):
     """Category info dentro do product."""
@@ -64,6 +68,73 @@ class ProductFilter(BaseModel):
     category_id: int | None = None
     min_price: float | None = Field(None, ge=0)
     max_price: float | None = Field(None, ge=0)
+    in_stock: bool | None = None
     is_active: bool = True
+    sort: ProductSort = ProductSort.NAME
+    cursor: str | None = None  # Quando presente, substitui `page`
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=10, ge=1, le=100)
+
+
+class ProductSuggestion(BaseModel):
+    """Sugestão do autocomplete."""
+
+    id: int
+    name: str
+
+
+class CategoryFacet(BaseModel):
+    """Contagem de produtos de uma categoria nos filtros atuais."""
+
+    id: int
+    name: str
+    slug: str
+    parent_id: int | None = None
+    count: int  # Produtos da própria categoria
+    subtree_count: int  # Produtos da categoria e das descendentes
+
+
+class PriceBucketFacet(BaseModel):
+    """Faixa do histograma de preços (max None = sem limite)."""
+
+    min: float
+    max: float | None = None
+    count: int
+
+
+class ProductFacets(BaseModel):
+    """Facetas da listagem de produtos."""
+
+    categories: list[CategoryFacet]
+    price_buckets: list[PriceBucketFacet]
+    in_stock: int
+    out_of_stock: int
+
+
+class ProductListResponse(PaginatedResponse[ProductResponse]):
+    """Listagem de produtos, com as facetas quando pedidas."""
+
+    facets: ProductFacets | None = None
+    next_cursor: str | None = None  # None = última página
+
+
+class ProductChanges(BaseModel):
+    """Página do feed de mudanças do catálogo."""
+
+    products: list[ProductResponse]  # Inclui os desativados (is_active=False)
+    categories: list[CategoryResponse]
+    next_token: str  # Passar como `since` na próxima chamada
+    has_more: bool  # Há mudanças além desta página
+
+
+class ProductBatchRequest(BaseModel):
+    """Ids da busca em lote (carrinho, lista de desejos)."""
+
+    ids: list[int] = Field(..., min_length=1, max_length=100)
+
+
+class ProductBatch(BaseModel):
+    """Produtos encontrados, na ordem pedida, e os ids inexistentes."""
+
+    products: list[ProductResponse]
+    missing_ids: list[int]
@@ -0,0 +1,90 @@
+"""
+Caminho rápido de serialização das respostas.
+
+As rotas validam cada linha uma única vez (TypeAdapter em cache,
+`from_attributes`) e devolvem o JSON já em bytes, gerado pelo serializador
+do pydantic-core. Como a rota retorna um `Response`, o FastAPI não revalida
+o payload contra o `response_model`, que continua declarado para o OpenAPI.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.monitoring.timing import phase
+from app.schemas.responses import PaginatedResponse, SuccessResponse
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter por tipo (montar validador e serializador é caro)."""
+    return TypeAdapter(tp)
+
+
+class JSONBytesResponse(Response):
+    """Resposta JSON cujo corpo já chega serializado."""
+
+    media_type = "application/json"
+
+
+def validate_rows(schema: type[BaseModel], rows: Iterable[Any]) -> list[BaseModel]:
+    """Converte objetos ORM (ou dicts) para `schema` numa única chamada."""
+    return type_adapter(list[schema]).validate_python(rows, from_attributes=True)
+
+
+def paginated_response(
+    schema: type[BaseModel],
+    rows: Iterable[Any],
+    total: int,
+    page: int,
+    page_size: int,
+    response_type: type[PaginatedResponse] | None = None,
+    **fields: Any,
+) -> JSONBytesResponse:
+    """
+    PaginatedResponse[schema] serializado direto para bytes. Uma subclasse em
+    `response_type` acrescenta os próprios campos (em `fields`, já validados).
+    """
+    with phase("serialize"):
+        response_type = response_type or PaginatedResponse[schema]
+        payload = response_type.model_construct(
+            success=True,
+            data=validate_rows(schema, rows),
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=(total + page_size - 1) // page_size,
+            **fields,
+        )
+        body = type_adapter(response_type).dump_json(payload)
+    return JSONBytesResponse(body)
+
+
+def list_response(
+    schema: type[BaseModel], rows: Iterable[Any], message: str | None = None
+) -> JSONBytesResponse:
+    """SuccessResponse[list[schema]] serializado direto para bytes."""
+    with phase("serialize"):
+        response_type = SuccessResponse[list[schema]]
+        payload = response_type.model_construct(
+            success=True, data=validate_rows(schema, rows), message=message
+        )
+        body = type_adapter(response_type).dump_json(payload)
+    return JSONBytesResponse(body)
+
+
+def item_response(
+    schema: type[BaseModel], row: Any, message: str | None = None
+) -> JSONBytesResponse:
+    """SuccessResponse[schema] serializado direto para bytes."""
+    with phase("serialize"):
+        response_type = SuccessResponse[schema]
+        payload = response_type.model_construct(
+            success=True,
+            data=type_adapter(schema).validate_python(row, from_attributes=True),
+            message=message,
+        )
+        body = type_adapter(response_type).dump_json(payload)
+    return JSONBytesResponse(body)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db, release_connection
 from app.schemas.user import (
     UserUpdate,
     UserUpdatePassword,
@@ -15,8 +15,10 @@ from app.users.service import UserService
 from app.auth.dependencies import get_current_active_user, require_admin
 from app.models.user import User
 from app.enums.user_role import UserRole
+from app.monitoring.timing import TimedRoute
+from app.schemas.serialization import paginated_response
 
-router = APIRouter(prefix="/api/v1/users", tags=["Users"])
+router = APIRouter(prefix="/api/v1/users", tags=["Users"], route_class=TimedRoute)
 
 
 @router.get("", response_model=PaginatedResponse[UserResponse])
@@ -26,7 +28,7 @@ async def list_users(
     search: str | None = Query(None, description="Search by name or email"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin),
 ):
     """Listar usuários (apenas admin)."""
@@ -36,22 +38,15 @@ async def list_users(
     )
 
     users, total = await UserService.get_users(db, filters)
+    await release_connection(db)
 
-    total_pages = (total + page_size - 1) // page_size
-
-    return PaginatedResponse(
-        data=[UserResponse.model_validate(u) for u in users],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    return paginated_response(UserResponse, users, total, page, page_size)
 
 
 @router.get("/{user_id}", response_model=SuccessResponse[UserResponse])
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Buscar usuário por ID (próprio usuário ou admin)."""
@@ -64,6 +59,7 @@ async def get_user(
         )
 
     user = await UserService.get_user_by_id(db, user_id)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user), message="User retrieved successfully"
@@ -87,6 +83,7 @@ async def update_user(
         )
 
     user = await UserService.update_user(db, user_id, user_in, current_user.id)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user), message="User updated successfully"
@@ -110,6 +107,7 @@ async def update_password(
         )
 
     user = await UserService.update_password(db, user_id, password_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user), message="Password updated successfully"
@@ -133,6 +131,7 @@ async def update_user_role(
         )
 
     user = await UserService.update_role(db, user_id, role_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user), message="User role updated successfully"
@@ -156,6 +155,7 @@ async def update_user_status(
         )
 
     user = await UserService.update_status(db, user_id, status_in)
+    await release_connection(db)
 
     return SuccessResponse(
         data=UserResponse.model_validate(user),
@@ -178,5 +178,6 @@ async def delete_user(
         )
 
     await UserService.delete_user(db, user_id)
+    await release_connection(db)
 
     return SuccessResponse(data=None, message="User deleted successfully")
@@ -10,6 +10,7 @@ from app.schemas.user import (
     UserUpdateStatus,
     UserFilter,
 )
+from app.database.session import release_connection
 from app.auth.security import get_password_hash, verify_password
 from app.enums.user_role import UserRole
 
@@ -115,6 +116,9 @@ class UserService:
 
         user = await UserService.get_user_by_id(db, user_id)
 
+        # Argon2 é caro: devolve a conexão ao pool durante verificação e hash
+        await release_connection(db)
+
         # Verificar senha atual
         if not verify_password(password_in.current_password, user.password_hash):
             raise HTTPException(
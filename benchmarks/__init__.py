@@ -0,0 +1 @@
+"""Benchmarks da API (carga end-to-end e micro-benchmarks)."""
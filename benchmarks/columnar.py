@@ -0,0 +1,160 @@
+"""
+Benchmark do motor colunar do catálogo contra o caminho SQL.
+
+Executa as mesmas listagens (`ProductService.get_products`) com o motor
+colunar desligado e ligado, confere que as duas devolvem a mesma página e o
+mesmo total, e compara as latências. O banco é o configurado no .env; para
+1M de produtos, rode antes `python -m app.cli seed --scale 100`.
+
+Uso:
+    python -m benchmarks.columnar
+    python -m benchmarks.columnar --iterations 50 --output columnar.json
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from statistics import median, quantiles
+from time import perf_counter
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.models.categories import Category
+from app.models.products import Product
+from app.products.columnar import product_columns
+from app.products.service import ProductService
+from app.schemas.products import ProductFilter
+
+app = typer.Typer(help="Columnar catalog engine vs SQL benchmark")
+console = Console()
+
+
+async def scenarios(db) -> dict[str, ProductFilter]:
+    """Filtros típicos da vitrine, com a maior árvore e a maior folha."""
+    child = aliased(Category)
+    root_id = await db.scalar(
+        select(Category.id)
+        .where(Category.parent_id.is_(None))
+        .order_by(Category.subtree_product_count.desc())
+        .limit(1)
+    )
+    leaf_id = await db.scalar(
+        select(Category.id)
+        .where(~select(child.id).where(child.parent_id == Category.id).exists())
+        .order_by(Category.active_product_count.desc())
+        .limit(1)
+    )
+    total = await db.scalar(select(func.count(Product.id)))
+    deep_page = max(1, total // 2 // 20)
+
+    return {
+        "first page": ProductFilter(page_size=20),
+        "category tree": ProductFilter(category_id=root_id, page_size=20),
+        "leaf category": ProductFilter(category_id=leaf_id, page_size=20),
+        "price range": ProductFilter(min_price=50, max_price=150, page_size=20),
+        "tree + price + stock": ProductFilter(
+            category_id=root_id, max_price=100, in_stock=True, page_size=20
+        ),
+        "deep page": ProductFilter(page=deep_page, page_size=20),
+    }
+
+
+async def measure(db, filters: ProductFilter, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        started_at = perf_counter()
+        await ProductService.get_products(db, filters)
+        timings.append((perf_counter() - started_at) * 1000)
+    return timings
+
+
+def summary(timings: list[float]) -> dict:
+    return {
+        "p50_ms": round(median(timings), 3),
+        "p95_ms": round(quantiles(timings, n=20)[-1], 3),
+    }
+
+
+async def run_benchmark(iterations: int) -> tuple[float, int, list[dict]]:
+    async with AsyncSessionLocal() as db:
+        settings.PRODUCT_COLUMN_STORE_ENABLED = True
+        started_at = perf_counter()
+        await product_columns.reload(db)
+        load_seconds = perf_counter() - started_at
+
+        results = []
+        for name, filters in (await scenarios(db)).items():
+            settings.PRODUCT_COLUMN_STORE_ENABLED = False
+            sql_rows, sql_total, _ = await ProductService.get_products(db, filters)
+            sql = summary(await measure(db, filters, iterations))
+
+            settings.PRODUCT_COLUMN_STORE_ENABLED = True
+            rows, total, _ = await ProductService.get_products(db, filters)
+            columnar = summary(await measure(db, filters, iterations))
+
+            # Os dois caminhos precisam devolver a mesma página
+            assert total == sql_total, name
+            assert [row["id"] for row in rows] == [row["id"] for row in sql_rows], name
+            results.append(
+                {
+                    "scenario": name,
+                    "total": total,
+                    "sql": sql,
+                    "columnar": columnar,
+                    "speedup": round(sql["p50_ms"] / columnar["p50_ms"], 2),
+                }
+            )
+        return load_seconds, len(product_columns.ids), results
+
+
+@app.command()
+def run(
+    iterations: int = typer.Option(20, help="Requests per scenario and path"),
+    output: Path | None = typer.Option(None, help="Write results JSON to this file"),
+):
+    """Compare product listing latency of the SQL and columnar paths."""
+
+    load_seconds, products, results = asyncio.run(run_benchmark(iterations))
+    console.print(
+        f"Loaded {products:,} products into the column store in {load_seconds:.2f}s"
+    )
+
+    table = Table(title="🧮 Columnar catalog vs SQL", header_style="bold cyan")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Matches", justify="right")
+    table.add_column("SQL p50/p95 ms", justify="right")
+    table.add_column("Columnar p50/p95 ms", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+    for result in results:
+        sql, columnar = result["sql"], result["columnar"]
+        table.add_row(
+            result["scenario"],
+            f"{result['total']:,}",
+            f"{sql['p50_ms']:.2f} / {sql['p95_ms']:.2f}",
+            f"{columnar['p50_ms']:.2f} / {columnar['p95_ms']:.2f}",
+            f"{result['speedup']:.2f}x",
+        )
+
+    console.print(table)
+    if output:
+        output.write_text(
+            json.dumps(
+                {
+                    "products": products,
+                    "load_seconds": load_seconds,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        console.print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    app()
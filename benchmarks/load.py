@@ -0,0 +1,480 @@
+"""
+Benchmark de carga end-to-end da API.
+
+Uso:
+    python -m benchmarks.load run                        # in-process (ASGI)
+    python -m benchmarks.load run --url http://localhost:8000
+    python -m benchmarks.load run --output results.json --baseline baseline.json
+    python -m benchmarks.load compare results.json baseline.json --tolerance 0.15
+
+O modo in-process usa o banco configurado no .env, como a própria API.
+Rode `python -m app.cli seed` (ou `seed --scale`) antes.
+"""
+
+import asyncio
+import json
+import platform
+import random
+import subprocess
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+app = typer.Typer(help="End-to-end load benchmark for the API")
+console = Console()
+
+SEARCH_TERMS = ["a", "e", "pro", "smart", "kit", "livro", "camisa", "mesa"]
+
+
+@dataclass
+class BenchContext:
+    """Dados compartilhados pelos cenários (tokens e IDs existentes)."""
+
+    client: httpx.AsyncClient
+    admin_headers: dict[str, str]
+    customer_headers: dict[str, str]
+    customer_email: str
+    customer_password: str
+    product_ids: list[int]
+    category_ids: list[int]
+    rng: random.Random = field(default_factory=random.Random)
+
+
+@dataclass
+class ScenarioResult:
+    """Latências e erros de um cenário."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "throughput_rps": (
+                round(requests / self.elapsed, 2) if self.elapsed else 0.0
+            ),
+            "mean_ms": round(sum(latencies) / requests * 1000, 3) if requests else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentil com interpolação linear (valores já ordenados)."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{response.request.method} {response.request.url.path} -> "
+            f"{response.status_code}: {response.text[:200]}"
+        )
+    return response
+
+
+# Cenários: cada chamada é uma iteração medida (a operação do usuário)
+
+
+async def catalog_browse(ctx: BenchContext) -> None:
+    """Visitante anônimo: categorias, uma página de produtos e um produto."""
+    client, rng = ctx.client, ctx.rng
+    _check(await client.get("/api/v1/categories"))
+    params = {"page": rng.randint(1, 5), "page_size": 20}
+    if ctx.category_ids and rng.random() < 0.5:
+        params["category_id"] = rng.choice(ctx.category_ids)
+    _check(await client.get("/api/v1/products", params=params))
+    _check(await client.get(f"/api/v1/products/{rng.choice(ctx.product_ids)}"))
+
+
+async def search(ctx: BenchContext) -> None:
+    """Busca por nome com faixa de preço."""
+    rng = ctx.rng
+    params = {"name": rng.choice(SEARCH_TERMS), "page_size": 20}
+    if rng.random() < 0.5:
+        params["min_price"] = rng.choice([0, 10, 50])
+        params["max_price"] = params["min_price"] + rng.choice([50, 200, 1000])
+    _check(await ctx.client.get("/api/v1/products", params=params))
+
+
+async def login(ctx: BenchContext) -> None:
+    """Login JSON (dominado pelo Argon2)."""
+    _check(
+        await ctx.client.post(
+            "/api/v1/auth/login/json",
+            json={"email": ctx.customer_email, "password": ctx.customer_password},
+        )
+    )
+
+
+async def checkout(ctx: BenchContext) -> float:
+    """Pedido com 1-5 itens; o cancelamento (devolve o estoque) não é medido."""
+    rng = ctx.rng
+    product_ids = rng.sample(
+        ctx.product_ids, k=min(len(ctx.product_ids), rng.randint(1, 5))
+    )
+    payload = {"items": [{"product_id": pid, "quantity": 1} for pid in product_ids]}
+
+    started_at = perf_counter()
+    response = _check(
+        await ctx.client.post(
+            "/api/v1/orders", json=payload, headers=ctx.customer_headers
+        )
+    )
+    elapsed = perf_counter() - started_at
+
+    order_id = response.json()["data"]["id"]
+    await ctx.client.delete(f"/api/v1/orders/{order_id}", headers=ctx.customer_headers)
+    return elapsed
+
+
+async def order_history(ctx: BenchContext) -> None:
+    """Cliente lista os próprios pedidos."""
+    _check(await ctx.client.get("/api/v1/orders", headers=ctx.customer_headers))
+
+
+async def admin_listings(ctx: BenchContext) -> None:
+    """Admin lista usuários e pedidos de todos."""
+    client = ctx.client
+    _check(
+        await client.get(
+            "/api/v1/users", params={"page_size": 50}, headers=ctx.admin_headers
+        )
+    )
+    _check(
+        await client.get(
+            "/api/v1/orders", params={"page_size": 50}, headers=ctx.admin_headers
+        )
+    )
+
+
+SCENARIOS: dict[str, Callable[[BenchContext], Awaitable[float | None]]] = {
+    "catalog_browse": catalog_browse,
+    "search": search,
+    "login": login,
+    "checkout": checkout,
+    "order_history": order_history,
+    "admin_listings": admin_listings,
+}
+
+
+async def _token(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = _check(
+        await client.post(
+            "/api/v1/auth/login/json", json={"email": email, "password": password}
+        )
+    )
+    return response.json()["data"]["access_token"]
+
+
+async def _ids(client: httpx.AsyncClient, path: str) -> list[int]:
+    ids, page = [], 1
+    while len(ids) < 1000:
+        response = _check(
+            await client.get(path, params={"page": page, "page_size": 100})
+        )
+        data = response.json()["data"]
+        ids.extend(row["id"] for row in data)
+        if len(data) < 100:
+            break
+        page += 1
+    return ids
+
+
+async def prepare(
+    client: httpx.AsyncClient,
+    admin: tuple[str, str],
+    customer: tuple[str, str],
+    seed: int,
+) -> BenchContext:
+    """Autentica admin/cliente e coleta IDs de produtos e categorias."""
+    admin_token = await _token(client, *admin)
+
+    # Garante o cliente do benchmark (register falha se já existir)
+    await client.post(
+        "/api/v1/auth/register",
+        json={"name": "Bench Customer", "email": customer[0], "password": customer[1]},
+    )
+    customer_token = await _token(client, *customer)
+
+    categories = _check(
+        await client.get("/api/v1/categories", params={"include_count": False})
+    ).json()["data"]
+    product_ids = await _ids(client, "/api/v1/products")
+    if not product_ids:
+        raise RuntimeError("No active products: seed the database first")
+
+    return BenchContext(
+        client=client,
+        admin_headers={"Authorization": f"Bearer {admin_token}"},
+        customer_headers={"Authorization": f"Bearer {customer_token}"},
+        customer_email=customer[0],
+        customer_password=customer[1],
+        product_ids=product_ids,
+        category_ids=[category["id"] for category in categories],
+        rng=random.Random(seed),
+    )
+
+
+async def run_scenario(
+    ctx: BenchContext,
+    scenario: Callable[[BenchContext], Awaitable[float | None]],
+    duration: float,
+    concurrency: int,
+    warmup: int,
+) -> ScenarioResult:
+    """Roda o cenário por `duration` segundos com `concurrency` workers."""
+    for _ in range(warmup):
+        await scenario(ctx)
+
+    result = ScenarioResult()
+    deadline = perf_counter() + duration
+
+    async def worker() -> None:
+        while perf_counter() < deadline:
+            started_at = perf_counter()
+            try:
+                measured = await scenario(ctx)
+            except Exception as exc:  # noqa: BLE001 - conta e segue
+                result.errors += 1
+                if result.errors == 1:
+                    console.print(f"[red]{exc}[/red]")
+                continue
+            result.latencies.append(
+                measured if measured is not None else perf_counter() - started_at
+            )
+
+    started_at = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = perf_counter() - started_at
+    return result
+
+
+@asynccontextmanager
+async def _client(url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            yield client
+        return
+
+    from app.main import app as api
+
+    # Executa o lifespan (rotas de métricas, health check de réplicas...)
+    async with api.router.lifespan_context(api):
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            yield client
+
+
+async def run_benchmark(
+    url: str | None,
+    scenarios: list[str],
+    duration: float,
+    concurrency: int,
+    warmup: int,
+    admin: tuple[str, str],
+    customer: tuple[str, str],
+    seed: int,
+) -> dict:
+    async with _client(url) as client:
+        ctx = await prepare(client, admin, customer, seed)
+        results = {}
+        for name in scenarios:
+            console.print(f"▶ {name} ({duration:.0f}s, concurrency={concurrency})")
+            result = await run_scenario(
+                ctx, SCENARIOS[name], duration, concurrency, warmup
+            )
+            results[name] = result.summary()
+
+    return {
+        "meta": {
+            "target": url or "in-process",
+            "duration_s": duration,
+            "concurrency": concurrency,
+            "seed": seed,
+            "products": len(ctx.product_ids),
+            "python": platform.python_version(),
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "scenarios": results,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Regressões do resultado atual contra o baseline: p95 acima de
+    baseline * (1 + tolerance) ou throughput abaixo de baseline * (1 - tolerance).
+    """
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        if base["p95_ms"] and now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {now['p95_ms']:.2f} ms > {base['p95_ms']:.2f} ms"
+            )
+        if base["throughput_rps"] and now["throughput_rps"] < base["throughput_rps"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {now['throughput_rps']:.1f} rps "
+                f"< {base['throughput_rps']:.1f} rps"
+            )
+        if now["errors"] > base["errors"]:
+            regressions.append(
+                f"{name}: {now['errors']} errors (baseline {base['errors']})"
+            )
+    return regressions
+
+
+def _print_results(results: dict, baseline: dict | None = None) -> None:
+    table = Table(
+        title="📈 Load benchmark", show_header=True, header_style="bold cyan"
+    )
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("RPS", justify="right", style="green")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right", style="yellow")
+    table.add_column("p99 ms", justify="right")
+    if baseline:
+        table.add_column("Δ p95", justify="right")
+
+    for name, row in results["scenarios"].items():
+        cells = [
+            name,
+            str(row["requests"]),
+            str(row["errors"]),
+            f"{row['throughput_rps']:.1f}",
+            f"{row['p50_ms']:.2f}",
+            f"{row['p95_ms']:.2f}",
+            f"{row['p99_ms']:.2f}",
+        ]
+        if baseline:
+            base = baseline["scenarios"].get(name)
+            if base and base["p95_ms"]:
+                cells.append(f"{(row['p95_ms'] / base['p95_ms'] - 1) * 100:+.1f}%")
+            else:
+                cells.append("-")
+        table.add_row(*cells)
+
+    console.print(table)
+
+
+def _report(current: dict, baseline_path: Path | None, tolerance: float) -> None:
+    if baseline_path is None:
+        _print_results(current)
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    _print_results(current, baseline)
+    regressions = compare_results(current, baseline, tolerance)
+    if regressions:
+        console.print(f"[bold red]Regressions (tolerance {tolerance:.0%}):[/bold red]")
+        for regression in regressions:
+            console.print(f"  ✗ {regression}")
+        raise typer.Exit(1)
+    console.print(
+        f"[bold green]✓ No regressions (tolerance {tolerance:.0%})[/bold green]"
+    )
+
+
+@app.command()
+def run(
+    url: str | None = typer.Option(None, help="Running API URL (default: in-process)"),
+    scenario: list[str] = typer.Option(
+        list(SCENARIOS), "--scenario", "-s", help="Scenarios to run (repeatable)"
+    ),
+    duration: float = typer.Option(10.0, help="Seconds per scenario"),
+    concurrency: int = typer.Option(8, help="Concurrent virtual users"),
+    warmup: int = typer.Option(5, help="Unmeasured iterations per scenario"),
+    admin_email: str = typer.Option("admin@example.com"),
+    admin_password: str = typer.Option("admin123"),
+    customer_email: str = typer.Option("bench@example.com"),
+    customer_password: str = typer.Option("bench-password"),
+    seed: int = typer.Option(42, help="Random seed for request parameters"),
+    output: Path | None = typer.Option(None, help="Write results JSON to this file"),
+    baseline: Path | None = typer.Option(None, help="Baseline JSON to compare with"),
+    tolerance: float = typer.Option(0.15, help="Allowed regression (0.15 = 15%)"),
+):
+    """Run the load scenarios and report throughput and latency percentiles."""
+
+    unknown = set(scenario) - set(SCENARIOS)
+    if unknown:
+        console.print(
+            f"[bold red]Unknown scenarios:[/bold red] {', '.join(sorted(unknown))}"
+        )
+        raise typer.Exit(2)
+
+    results = asyncio.run(
+        run_benchmark(
+            url,
+            scenario,
+            duration,
+            concurrency,
+            warmup,
+            (admin_email, admin_password),
+            (customer_email, customer_password),
+            seed,
+        )
+    )
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"Results written to {output}")
+    else:
+        console.print_json(data=results)
+
+    _report(results, baseline, tolerance)
+
+
+@app.command()
+def compare(
+    current: Path = typer.Argument(..., help="Results JSON"),
+    baseline: Path = typer.Argument(..., help="Baseline JSON"),
+    tolerance: float = typer.Option(0.15, help="Allowed regression (0.15 = 15%)"),
+):
+    """Compare two result files; exits with 1 on regressions."""
+
+    _report(json.loads(current.read_text()), baseline, tolerance)
+
+
+if __name__ == "__main__":
+    app()
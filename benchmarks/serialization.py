@@ -0,0 +1,263 @@
+"""
+Micro-benchmark de serialização das respostas de lista.
+
+Compara, em linhas/segundo, o caminho antigo das rotas (model_validate por
+linha, revalidação contra o response_model e json.dumps do JSONResponse)
+com o caminho rápido de `app.schemas.serialization` (uma validação por
+linha e JSON direto em bytes), para PaginatedResponse[ProductResponse] e
+PaginatedResponse[OrderResponse] — este também montado pela projeção de
+linhas planas de `app.orders.projection`. Não acessa o banco.
+
+Uso:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --page-size 10 --page-size 100 --output ser.json
+"""
+
+import json
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from app.enums.order_status import OrderStatus
+from app.models import Category, Order, OrderItem, Product, User
+from app.orders.projection import project_orders
+from app.schemas.orders import OrderResponse
+from app.schemas.products import ProductResponse
+from app.schemas.responses import PaginatedResponse
+from app.schemas.serialization import paginated_response, type_adapter
+
+app = typer.Typer(help="Serialization micro-benchmark for list responses")
+console = Console()
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+ITEMS_PER_ORDER = 5
+TOTAL = 1000  # Total de linhas informado na paginação
+
+
+def make_products(count: int) -> list[Product]:
+    """Produtos ORM transientes (como os devolvidos pelo service)."""
+    category = Category(id=1, name="Eletrônicos", slug="eletronicos")
+    return [
+        Product(
+            id=index,
+            name=f"Produto {index}",
+            description="Descrição do produto " * 4,
+            price=19.9 + index,
+            stock=index % 50,
+            category_id=1,
+            is_active=True,
+            created_at=NOW - timedelta(days=index),
+            updated_at=NOW,
+            category=category,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def make_orders(count: int) -> list[Order]:
+    """Pedidos ORM transientes com usuário e itens carregados."""
+    user = User(id=1, name="Customer Test", email="customer@example.com")
+    products = make_products(ITEMS_PER_ORDER)
+    return [
+        Order(
+            id=index,
+            user_id=1,
+            total_price=99.5,
+            status=OrderStatus.PAID,
+            created_at=NOW - timedelta(hours=index),
+            user=user,
+            items=[
+                OrderItem(
+                    id=index * 10 + position,
+                    product_id=product.id,
+                    quantity=2,
+                    unit_price=product.price,
+                    product=product,
+                )
+                for position, product in enumerate(products)
+            ],
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def order_dicts(orders: list[Order]) -> list[dict]:
+    """Dicts montados como no router de pedidos."""
+    return [
+        {
+            "id": order.id,
+            "user_id": order.user_id,
+            "total_price": order.total_price,
+            "status": order.status,
+            "created_at": order.created_at,
+            "user_name": order.user.name if order.user else None,
+            "user_email": order.user.email if order.user else None,
+            "items": [
+                {
+                    "id": item.id,
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "product_name": item.product.name if item.product else None,
+                }
+                for item in order.items
+            ],
+        }
+        for order in orders
+    ]
+
+
+def fastapi_response_model(response_type: Any, content: Any) -> bytes:
+    """
+    O que o FastAPI faz com o retorno quando há response_model: valida de
+    novo (from_attributes), serializa para tipos JSON e o JSONResponse
+    chama json.dumps.
+    """
+    # O FastAPI também monta o adaptador (ModelField) uma única vez por rota
+    adapter = type_adapter(response_type)
+    value = adapter.validate_python(content, from_attributes=True)
+    data = adapter.dump_python(value, mode="json")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def legacy_products(products: list[Product]) -> bytes:
+    response = PaginatedResponse(
+        data=[ProductResponse.model_validate(p) for p in products],
+        total=TOTAL,
+        page=1,
+        page_size=len(products),
+        total_pages=(TOTAL + len(products) - 1) // len(products),
+    )
+    return fastapi_response_model(PaginatedResponse[ProductResponse], response)
+
+
+def fast_products(products: list[Product]) -> bytes:
+    return paginated_response(ProductResponse, products, TOTAL, 1, len(products)).body
+
+
+def legacy_orders(orders: list[Order]) -> bytes:
+    response = PaginatedResponse(
+        data=order_dicts(orders),
+        total=TOTAL,
+        page=1,
+        page_size=len(orders),
+        total_pages=(TOTAL + len(orders) - 1) // len(orders),
+    )
+    return fastapi_response_model(PaginatedResponse[OrderResponse], response)
+
+
+def fast_orders(orders: list[Order]) -> bytes:
+    return paginated_response(
+        OrderResponse, order_dicts(orders), TOTAL, 1, len(orders)
+    ).body
+
+
+def make_order_rows(count: int) -> tuple[list[Order], list[tuple], list[int]]:
+    """Os mesmos pedidos em ORM e nas linhas planas da projeção."""
+    orders = make_orders(count)
+    rows = [
+        (
+            order.id,
+            order.user_id,
+            order.total_price,
+            order.status,
+            order.created_at,
+            order.user.name,
+            order.user.email,
+            item.id,
+            item.product_id,
+            item.quantity,
+            item.unit_price,
+            item.product.name,
+        )
+        for order in orders
+        for item in order.items
+    ]
+    return orders, rows, [order.id for order in orders]
+
+
+def legacy_projection(fixture: tuple[list[Order], list[tuple], list[int]]) -> bytes:
+    return legacy_orders(fixture[0])
+
+
+def fast_projection(fixture: tuple[list[Order], list[tuple], list[int]]) -> bytes:
+    _, rows, order_ids = fixture
+    return paginated_response(
+        OrderResponse, project_orders(rows, order_ids), TOTAL, 1, len(order_ids)
+    ).body
+
+
+# Caso -> (fábrica de fixture, caminho antigo, caminho rápido)
+CASES: dict[str, tuple[Callable[[int], Any], Callable, Callable]] = {
+    "products": (make_products, legacy_products, fast_products),
+    "orders": (make_orders, legacy_orders, fast_orders),
+    "orders_projection": (make_order_rows, legacy_projection, fast_projection),
+}
+
+
+def rows_per_second(
+    function: Callable[[Any], bytes], fixture: Any, rows: int, repeat: int
+) -> float:
+    """Melhor de `repeat` medições (cada uma com ~0,2 s de execuções)."""
+    timer = timeit.Timer(lambda: function(fixture))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return rows / best
+
+
+@app.command()
+def run(
+    page_size: list[int] = typer.Option(
+        [1, 10, 50, 100], "--page-size", "-p", help="Rows per page (repeatable)"
+    ),
+    repeat: int = typer.Option(5, help="Measurements per case (best is kept)"),
+    output: Path | None = typer.Option(None, help="Write results JSON to this file"),
+):
+    """Measure rows/second of the legacy and fast serialization paths."""
+
+    table = Table(title="⚡ List serialization", header_style="bold cyan")
+    table.add_column("Response", style="cyan")
+    table.add_column("Rows", justify="right")
+    table.add_column("Legacy rows/s", justify="right")
+    table.add_column("Fast rows/s", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+
+    results = []
+    for name, (factory, legacy_path, fast_path) in CASES.items():
+        for size in page_size:
+            fixture = factory(size)
+            # Os dois caminhos precisam produzir o mesmo JSON
+            legacy_body, fast_body = legacy_path(fixture), fast_path(fixture)
+            assert json.loads(legacy_body) == json.loads(fast_body), name
+            legacy = rows_per_second(legacy_path, fixture, size, repeat)
+            fast = rows_per_second(fast_path, fixture, size, repeat)
+            results.append(
+                {
+                    "response": f"PaginatedResponse[{name}]",
+                    "rows": size,
+                    "legacy_rows_per_s": round(legacy),
+                    "fast_rows_per_s": round(fast),
+                    "speedup": round(fast / legacy, 2),
+                }
+            )
+            table.add_row(
+                name,
+                str(size),
+                f"{legacy:,.0f}",
+                f"{fast:,.0f}",
+                f"{fast / legacy:.2f}x",
+            )
+
+    console.print(table)
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,103 @@
+"""
+Fixtures da suíte.
+
+Os testes sobem a app (com lifespan) num transport ASGI e usam o banco do
+.env: aponte POSTGRES_DB para um banco dedicado, migrado com
+`alembic upgrade head`. Cada teste cria as próprias categorias e produtos com
+nomes únicos, então o banco não precisa estar vazio.
+
+N_PLUS_ONE_MODE=raise: uma requisição com N+1 falha o teste que a fez.
+"""
+
+import os
+
+os.environ.setdefault("N_PLUS_ONE_MODE", "raise")
+
+import uuid
+
+import httpx
+import pytest
+
+from app.database.seed import seed_only_admin
+from app.main import app
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
+
+
+def unique(prefix: str) -> str:
+    """Nome único por execução (evita colisão de slug com dados anteriores)."""
+    return f"{prefix} {uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    await seed_only_admin()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+async def admin_headers(client):
+    return await _login(client, ADMIN_EMAIL, ADMIN_PASSWORD)
+
+
+@pytest.fixture(scope="session")
+async def customer_headers(client):
+    email = f"customer-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "name": "Test Customer", "password": "customer123"},
+    )
+    assert response.status_code == 200, response.text
+    return await _login(client, email, "customer123")
+
+
+@pytest.fixture
+def create_category(client, admin_headers):
+    async def create(name: str | None = None, parent_id: int | None = None) -> dict:
+        response = await client.post(
+            "/api/v1/categories",
+            json={"name": name or unique("Categoria"), "parent_id": parent_id},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    return create
+
+
+@pytest.fixture
+def create_product(client, admin_headers):
+    async def create(category_id: int, **fields) -> dict:
+        payload = {
+            "name": unique("Produto"),
+            "price": 10.0,
+            "stock": 10,
+            "category_id": category_id,
+            **fields,
+        }
+        response = await client.post(
+            "/api/v1/products", json=payload, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    return create
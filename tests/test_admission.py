@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.admission import (
+    AdmissionControlMiddleware,
+    AdmissionController,
+    Overloaded,
+    classify,
+)
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def _scope(path: str, method: str = "GET") -> dict:
+    return {"type": "http", "path": path, "method": method, "headers": []}
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/api/v1/products", "catalog"),
+        ("GET", "/api/v1/categories/1", "catalog"),
+        ("POST", "/api/v1/products", "admin"),
+        ("POST", "/api/v1/products/batch", "catalog"),
+        ("POST", "/api/v1/orders/quote", "catalog"),
+        ("POST", "/api/v1/orders", "checkout"),
+        ("POST", "/api/v1/auth/login", "auth"),
+        ("GET", "/api/v1/users", "admin"),
+        ("GET", "/health", None),
+    ],
+)
+def test_classify(method, path, expected):
+    assert classify(_scope(path, method)) == expected
+
+
+async def test_full_queue_and_queue_timeout_are_shed():
+    controller = AdmissionController({"catalog": (1, 1)}, max_concurrency=0)
+    catalog = controller.classes["catalog"]
+
+    await controller.acquire(catalog, timeout=1)
+    queued = asyncio.create_task(controller.acquire(catalog, timeout=0.05))
+    await asyncio.sleep(0)
+    with pytest.raises(Overloaded, match="queue full"):
+        await controller.acquire(catalog, timeout=1)
+    with pytest.raises(Overloaded, match="queue timeout"):
+        await queued
+
+    assert (catalog.shed_queue_full, catalog.shed_timeout) == (1, 1)
+    assert (catalog.active, catalog.queued, catalog.admitted) == (1, 0, 1)
+    controller.release(catalog)
+    assert controller.active == 0
+
+
+async def test_freed_slots_go_to_the_highest_priority_queue():
+    controller = AdmissionController(
+        {"checkout": (2, 5), "catalog": (2, 5)}, max_concurrency=2
+    )
+    checkout, catalog = controller.classes["checkout"], controller.classes["catalog"]
+    await controller.acquire(catalog, timeout=1)
+    await controller.acquire(catalog, timeout=1)
+
+    admitted = []
+
+    async def wait(route_class):
+        await controller.acquire(route_class, timeout=1)
+        admitted.append(route_class.name)
+
+    tasks = [asyncio.create_task(wait(catalog))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(wait(checkout)))
+    await asyncio.sleep(0)
+
+    # O catálogo chegou antes, mas a vaga global vai para o checkout
+    controller.release(catalog)
+    assert (checkout.active, checkout.queued) == (1, 0)
+    assert (catalog.active, catalog.queued) == (1, 1)
+    controller.release(catalog)
+    await asyncio.gather(*tasks)
+    assert admitted == ["checkout", "catalog"]
+
+
+async def test_middleware_answers_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_CONTROL_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "ADMISSION_RETRY_AFTER_SECONDS", 3)
+    controller = AdmissionController({"catalog": (1, 0)}, max_concurrency=0)
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmissionControlMiddleware(app, controller)
+
+    async def call(path: str) -> list[dict]:
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware(_scope(path), None, send)
+        return sent
+
+    first = asyncio.create_task(call("/api/v1/products"))
+    await asyncio.sleep(0)
+
+    start, body = await call("/api/v1/products")
+    assert start["status"] == 503
+    headers = dict(start["headers"])
+    assert headers[b"retry-after"] == b"3"
+    assert json.loads(body["body"]) == {"detail": "Service overloaded, retry later"}
+
+    # Rotas isentas não passam pelo limite
+    release.set()
+    assert (await call("/health"))[0]["status"] == 200
+    assert (await first)[0]["status"] == 200
+    assert controller.active == 0
@@ -0,0 +1,162 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.categories.tasks import reconcile_product_counts
+from app.database.session import AsyncSessionLocal
+from app.models.categories import Category
+
+pytestmark = pytest.mark.anyio
+
+
+async def _paths(*category_ids: int) -> dict[int, str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Category.id, Category.path).where(Category.id.in_(category_ids))
+        )
+        return dict(result.all())
+
+
+async def _subtree_counts(client, *category_ids: int) -> dict[int, int]:
+    response = await client.get("/api/v1/categories")
+    assert response.status_code == 200, response.text
+    return {
+        category["id"]: category["subtree_product_count"]
+        for category in response.json()["data"]
+        if category["id"] in category_ids
+    }
+
+
+async def _counts(client, category_id: int) -> tuple[int, int]:
+    """(product_count, subtree_product_count) da listagem de categorias."""
+    response = await client.get("/api/v1/categories")
+    assert response.status_code == 200, response.text
+    category = next(c for c in response.json()["data"] if c["id"] == category_id)
+    return category["product_count"], category["subtree_product_count"]
+
+
+async def _product_ids(client, category_id: int) -> set[int]:
+    response = await client.get(
+        "/api/v1/products", params={"category_id": category_id, "page_size": 100}
+    )
+    assert response.status_code == 200, response.text
+    return {product["id"] for product in response.json()["data"]}
+
+
+async def _move(client, admin_headers, category_id: int, parent_id: int | None):
+    return await client.put(
+        f"/api/v1/categories/{category_id}",
+        json={"parent_id": parent_id},
+        headers=admin_headers,
+    )
+
+
+async def test_move_rewrites_subtree_paths_and_counts(
+    client, admin_headers, create_category, create_product
+):
+    a = (await create_category())["id"]
+    b = (await create_category())["id"]
+    c = (await create_category(parent_id=a))["id"]
+    d = (await create_category(parent_id=c))["id"]
+    in_a = (await create_product(a))["id"]
+    in_c = (await create_product(c))["id"]
+    in_d = (await create_product(d))["id"]
+
+    assert await _paths(c, d) == {c: f"/{a}/", d: f"/{a}/{c}/"}
+    assert await _subtree_counts(client, a, b, c, d) == {a: 3, b: 0, c: 2, d: 1}
+
+    response = await _move(client, admin_headers, c, b)
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["parent_id"] == b
+
+    assert await _paths(c, d) == {c: f"/{b}/", d: f"/{b}/{c}/"}
+    assert await _subtree_counts(client, a, b, c, d) == {a: 1, b: 2, c: 2, d: 1}
+    assert await _product_ids(client, a) == {in_a}
+    assert await _product_ids(client, b) == {in_c, in_d}
+
+    # null = de volta para a raiz
+    response = await _move(client, admin_headers, c, None)
+    assert response.status_code == 200, response.text
+    assert await _paths(c, d) == {c: "/", d: f"/{c}/"}
+    assert await _subtree_counts(client, b, c) == {b: 0, c: 2}
+    assert await _product_ids(client, b) == set()
+
+
+async def test_move_into_own_subtree_is_rejected(
+    client, admin_headers, create_category
+):
+    a = (await create_category())["id"]
+    b = (await create_category(parent_id=a))["id"]
+    c = (await create_category(parent_id=b))["id"]
+
+    for parent_id in (a, c):
+        response = await _move(client, admin_headers, a, parent_id)
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            "Category cannot be moved into its own subtree"
+        )
+    assert await _paths(a, b, c) == {a: "/", b: f"/{a}/", c: f"/{a}/{b}/"}
+
+
+async def test_product_writes_update_ancestor_counts(
+    client, admin_headers, create_category, create_product
+):
+    a = (await create_category())["id"]
+    b = (await create_category(parent_id=a))["id"]
+    other = (await create_category())["id"]
+    product = await create_product(b)
+    assert await _subtree_counts(client, a, b, other) == {a: 1, b: 1, other: 0}
+
+    response = await client.put(
+        f"/api/v1/products/{product['id']}",
+        json={"category_id": other},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert await _subtree_counts(client, a, b, other) == {a: 0, b: 0, other: 1}
+
+    response = await client.delete(
+        f"/api/v1/products/{product['id']}", headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert await _subtree_counts(client, other) == {other: 0}
+
+
+async def test_counts_follow_product_activation(
+    client, admin_headers, create_category, create_product
+):
+    a = (await create_category())["id"]
+    b = (await create_category(parent_id=a))["id"]
+    product = await create_product(b)
+    await create_product(b)
+    assert await _counts(client, b) == (2, 2)
+    assert await _counts(client, a) == (0, 2)
+
+    url = f"/api/v1/products/{product['id']}"
+    response = await client.put(url, json={"is_active": False}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert await _counts(client, b) == (1, 1)
+    assert await _counts(client, a) == (0, 1)
+
+    response = await client.put(url, json={"is_active": True}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert await _counts(client, a) == (0, 2)
+
+
+async def test_reconcile_fixes_drifted_counts(client, create_category, create_product):
+    a = (await create_category())["id"]
+    b = (await create_category(parent_id=a))["id"]
+    await create_product(b)
+
+    # Escrita fora dos services (ex.: SQL manual) deixa os contadores errados
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Category)
+            .where(Category.id.in_([a, b]))
+            .values(active_product_count=7, subtree_product_count=7)
+        )
+        await db.commit()
+
+    assert await reconcile_product_counts() >= 2
+    assert await _counts(client, a) == (0, 1)
+    assert await _counts(client, b) == (1, 1)
+    assert await reconcile_product_counts() == 0
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.products.changes import decode_token, encode_token
+
+pytestmark = pytest.mark.anyio
+
+
+def test_token_round_trip():
+    at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    token = encode_token({"p": (at, 42), "c": None})
+    # Opaco e seguro em query string
+    assert "=" not in token and "+" not in token and "/" not in token
+
+    assert decode_token(token, ("p", "c")) == {"p": (at, 42), "c": None}
+    # Chaves fora das pedidas são ignoradas; sem token, tudo do início
+    assert decode_token(token, ("c",)) == {"c": None}
+    assert decode_token(None, ("p", "c")) == {"p": None, "c": None}
+
+
+@pytest.mark.parametrize("token", ["%%%", "bm90LWpzb24", "eyJwIjpbIngiLDFdfQ"])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(HTTPException) as error:
+        decode_token(token, ("p", "c"))
+    assert error.value.status_code == 400
+
+
+async def _now() -> datetime:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.now()))
+
+
+async def _feed(client, token: str, limit: int = 1) -> tuple[dict, dict, str]:
+    """Percorre o feed até has_more=False: último estado de cada id e token."""
+    products, categories = {}, {}
+    while True:
+        response = await client.get(
+            "/api/v1/products/changes", params={"since": token, "limit": limit}
+        )
+        assert response.status_code == 200, response.text
+        page = response.json()["data"]
+        products.update((row["id"], row) for row in page["products"])
+        categories.update((row["id"], row) for row in page["categories"])
+        token = page["next_token"]
+        if not page["has_more"]:
+            return products, categories, token
+
+
+async def test_feed_pages_through_changes_after_the_token(
+    client, admin_headers, create_category, create_product, monkeypatch
+):
+    monkeypatch.setattr(settings, "CHANGE_FEED_SAFETY_SECONDS", 0.0)
+    start = await _now()
+    token = encode_token({"p": (start, 0), "c": (start, 0)})
+
+    category = await create_category()
+    kept = await create_product(category["id"])
+    removed = await create_product(category["id"])
+    for product, payload in [(kept, {"price": 12.5}), (removed, {"is_active": False})]:
+        response = await client.put(
+            f"/api/v1/products/{product['id']}", json=payload, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+
+    products, categories, token = await _feed(client, token)
+    # Um item por id, no estado mais recente; desativados também vêm
+    assert products[kept["id"]]["price"] == 12.5
+    assert products[removed["id"]]["is_active"] is False
+    assert categories[category["id"]]["slug"] == category["slug"]
+
+    # Do último token em diante, só o que mudou depois; contagens de
+    # produtos da categoria não a colocam no feed
+    added = await create_product(category["id"])
+    products, categories, _ = await _feed(client, token, limit=500)
+    assert added["id"] in products
+    assert kept["id"] not in products and removed["id"] not in products
+    assert category["id"] not in categories
+
+
+async def test_recent_changes_wait_for_the_safety_window(
+    client, create_category, create_product, monkeypatch
+):
+    start = await _now()
+    token = encode_token({"p": (start, 0), "c": (start, 0)})
+    category = await create_category()
+    product = await create_product(category["id"])
+
+    # Mais novas que now() - CHANGE_FEED_SAFETY_SECONDS: ainda não entregues
+    products, categories, next_token = await _feed(client, token, limit=500)
+    assert product["id"] not in products and category["id"] not in categories
+    # A posição não avança sobre elas
+    assert decode_token(next_token, ("p", "c")) == decode_token(token, ("p", "c"))
+
+    # Passada a janela, aparecem a partir do mesmo token
+    monkeypatch.setattr(settings, "CHANGE_FEED_SAFETY_SECONDS", 0.0)
+    products, categories, _ = await _feed(client, next_token, limit=500)
+    assert product["id"] in products and category["id"] in categories
+
+
+async def test_invalid_token_is_a_400(client):
+    response = await client.get("/api/v1/products/changes", params={"since": "%%%"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid change token"
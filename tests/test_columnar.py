@@ -0,0 +1,176 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.enums.product_sort import ProductSort
+from app.products import columnar as columnar_module
+from app.products import service as service_module
+from app.products.columnar import ProductColumns
+from app.products.service import ProductService
+from app.schemas.products import ProductFilter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def columns(client, monkeypatch) -> ProductColumns:
+    """Motor próprio do teste, usado também pelo ProductService."""
+    monkeypatch.setattr(settings, "PRODUCT_COLUMN_STORE_ENABLED", True)
+    columns = ProductColumns()
+    monkeypatch.setattr(service_module, "product_columns", columns)
+    return columns
+
+
+@pytest.fixture
+async def catalog(client, admin_headers, create_category, create_product):
+    """
+    Raiz > filha, com nomes que dependem da ordem de code points; um
+    produto inativo na raiz.
+    """
+    root = await create_category()
+    child = await create_category(parent_id=root["id"])
+    tag = uuid.uuid4().hex[:8]
+    for name, category, price, stock in [
+        ("beta", root, 5.0, 3),
+        ("Zeta", root, 50.0, 0),
+        ("Ábaco", child, 15.0, 2),
+        ("alfa", child, 150.0, 0),
+        ("Beta", child, 25.0, 7),
+        ("zulu", root, 25.0, 1),
+    ]:
+        await create_product(
+            category["id"], name=f"{name} {tag}", price=price, stock=stock
+        )
+    inactive = await create_product(root["id"], name=f"delta {tag}")
+    response = await client.put(
+        f"/api/v1/products/{inactive['id']}",
+        json={"is_active": False},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    return root, child
+
+
+async def _reload(columns: ProductColumns) -> None:
+    async with AsyncSessionLocal() as db:
+        await columns.reload(db)
+
+
+async def _listing(filters: ProductFilter, columnar: bool) -> tuple[list[int], int]:
+    """Ids e total da listagem pelo motor colunar ou pelo SQL."""
+    enabled = settings.PRODUCT_COLUMN_STORE_ENABLED
+    settings.PRODUCT_COLUMN_STORE_ENABLED = columnar
+    try:
+        assert service_module.product_columns.can_answer(filters) is columnar
+        async with AsyncSessionLocal() as db:
+            products, total, _ = await ProductService.get_products(db, filters)
+    finally:
+        settings.PRODUCT_COLUMN_STORE_ENABLED = enabled
+    return [product["id"] for product in products], total
+
+
+async def _assert_same_listing(**fields) -> None:
+    filters = ProductFilter(**fields)
+    assert await _listing(filters, True) == await _listing(filters, False)
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {},
+        {"min_price": 20},
+        {"max_price": 25},
+        {"min_price": 10, "max_price": 100},
+        {"in_stock": True},
+        {"in_stock": False},
+        {"is_active": False},
+        {"page": 2, "page_size": 2},
+        {"page": 4, "page_size": 2},
+    ],
+)
+async def test_columns_and_sql_agree(columns, catalog, fields):
+    root, child = catalog
+    await _reload(columns)
+    await _assert_same_listing(category_id=root["id"], **fields)
+    await _assert_same_listing(category_id=child["id"], **fields)
+
+
+async def test_columns_follow_the_name_order_of_sql(columns, catalog):
+    root, _ = catalog
+    await _reload(columns)
+    filters = ProductFilter(category_id=root["id"], page_size=100)
+    ids, total = await _listing(filters, True)
+    assert total == 6
+
+    # Code points: maiúsculas antes de minúsculas, acentos no fim
+    async with AsyncSessionLocal() as db:
+        products, *_ = await ProductService.get_products(db, filters)
+    names = [product["name"].split()[0] for product in products]
+    assert names == ["Beta", "Zeta", "alfa", "beta", "zulu", "Ábaco"]
+    assert ids == [product["id"] for product in products]
+
+
+async def test_unknown_category_ids_select_nothing(columns, catalog):
+    await _reload(columns)
+    ids, total = columns.query(ProductFilter(), (columns.max_category_id + 1,))
+    assert (ids, total) == ([], 0)
+
+
+async def test_can_answer_falls_back_to_sql(columns, monkeypatch):
+    filters = ProductFilter()
+    # Antes da primeira carga
+    assert not columns.can_answer(filters)
+
+    await _reload(columns)
+    assert columns.can_answer(filters)
+    assert not columns.can_answer(ProductFilter(name="x"))
+    assert not columns.can_answer(ProductFilter(sort=ProductSort.PRICE_ASC))
+    assert not columns.can_answer(ProductFilter(cursor="abc"))
+
+    # Escrita local ainda não aplicada
+    columns.invalidate()
+    assert columns.changed.is_set()
+    assert not columns.can_answer(filters)
+    async with AsyncSessionLocal() as db:
+        await columns.refresh(db)
+    assert columns.can_answer(filters)
+
+    monkeypatch.setattr(settings, "PRODUCT_COLUMN_STORE_ENABLED", False)
+    assert not columns.can_answer(filters)
+
+
+async def test_refresh_applies_renames_inserts_and_updates(
+    columns, catalog, client, admin_headers, create_product, monkeypatch
+):
+    root, child = catalog
+    # Sempre pelo caminho incremental, qualquer que seja o tamanho da tabela
+    monkeypatch.setattr(columnar_module, "FULL_RELOAD_RATIO", float("inf"))
+    await _reload(columns)
+    filters = ProductFilter(category_id=root["id"], page_size=100)
+    before, _ = await _listing(filters, True)
+
+    tag = uuid.uuid4().hex[:8]
+    renamed, changed = before[0], before[1]
+    for product_id, payload in [
+        (renamed, {"name": f"zz {tag}"}),
+        (changed, {"price": 999.0, "stock": 0}),
+    ]:
+        response = await client.put(
+            f"/api/v1/products/{product_id}", json=payload, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+    inserted = await create_product(child["id"], name=f"AAA {tag}")
+
+    assert not columns.available
+    async with AsyncSessionLocal() as db:
+        await columns.refresh(db)
+    assert columns.available
+
+    ids, total = await _listing(filters, True)
+    assert total == 7
+    assert ids[0] == inserted["id"] and ids[-2:] == [renamed, before[-1]]
+    await _assert_same_listing(category_id=root["id"], page_size=100)
+    await _assert_same_listing(category_id=root["id"], min_price=500)
+    await _assert_same_listing(category_id=child["id"], in_stock=False)
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import select
+
+from app.database.session import AsyncSessionLocal, engine, release_connection
+from app.models.products import Product
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_release_after_reads_returns_the_connection(
+    create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"], name="Produto Liberado")
+    pool = engine.sync_engine.pool
+
+    async with AsyncSessionLocal() as db:
+        checked_out = pool.checkedout()
+        loaded = await db.get(Product, product["id"])
+        assert pool.checkedout() == checked_out + 1
+
+        await release_connection(db)
+        assert not db.in_transaction()
+        assert pool.checkedout() == checked_out
+        # Objetos carregados continuam utilizáveis, sem nova consulta
+        assert loaded in db
+        assert loaded.name == "Produto Liberado"
+
+        # Uma consulta depois obtém outra conexão normalmente
+        assert await db.scalar(select(Product.name).where(Product.id == product["id"]))
+
+
+async def test_release_keeps_transactions_with_writes(create_category, create_product):
+    category = await create_category()
+    product = await create_product(category["id"], stock=3)
+
+    async with AsyncSessionLocal() as db:
+        loaded = await db.get(Product, product["id"])
+        loaded.stock = 7
+        await release_connection(db)  # Alteração pendente
+        assert db.in_transaction()
+
+        await db.flush()
+        await release_connection(db)  # Já enviada, ainda sem commit
+        assert db.in_transaction()
+        await db.rollback()
+
+    async with AsyncSessionLocal() as db:
+        assert (await db.get(Product, product["id"])).stock == 3
+
+
+async def test_connection_holds_are_tracked_per_route(client, admin_headers):
+    response = await client.delete(
+        "/api/v1/admin/db/connections", headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/auth/me", headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/admin/db/connections", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    holds = {row["route"]: row for row in response.json()["data"]}
+    me = holds["GET /api/v1/auth/me"]
+    assert me["checkouts"] >= 1
+    assert me["max_ms"] >= me["avg_ms"] > 0
+
+
+async def test_connection_holds_require_admin(client, customer_headers):
+    response = await client.get(
+        "/api/v1/admin/db/connections", headers=customer_headers
+    )
+    assert response.status_code == 403
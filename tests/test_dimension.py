@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.categories import dimension as dimension_module
+from app.categories.dimension import (
+    CategoryDimension,
+    category_dimension,
+    notify_statement,
+)
+from app.database.session import AsyncSessionLocal
+from app.models.categories import Category
+
+pytestmark = pytest.mark.anyio
+
+
+async def _insert_category(parent_id: int | None = None, path: str = "/") -> int:
+    """Categoria criada por fora do CategoryService (sem NOTIFY)."""
+    slug = f"dimensao-{uuid.uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as db:
+        category_id = await db.scalar(
+            insert(Category)
+            .values(name=slug, slug=slug, parent_id=parent_id, path=path)
+            .returning(Category.id)
+        )
+        await db.commit()
+    return category_id
+
+
+async def test_reload_builds_maps_and_subtrees(client, create_category):
+    root = await create_category()
+    child = await create_category(parent_id=root["id"])
+    grandchild = await create_category(parent_id=child["id"])
+
+    dimension = CategoryDimension()
+    assert dimension.stale
+    await dimension.ensure_fresh()
+    assert not dimension.stale
+
+    row = dimension.by_id[grandchild["id"]]
+    assert dimension.by_slug[grandchild["slug"]] is row
+    assert row.ancestor_ids == [root["id"], child["id"]]
+    assert set(await dimension.subtree_ids(root["id"])) == {
+        root["id"],
+        child["id"],
+        grandchild["id"],
+    }
+    assert await dimension.subtree_ids(grandchild["id"]) == (grandchild["id"],)
+
+    # Sem invalidação a cópia não muda; depois dela, a próxima leitura recarrega
+    new_id = await _insert_category(parent_id=root["id"], path=f"/{root['id']}/")
+    await dimension.ensure_fresh()
+    assert new_id not in dimension.by_id
+    dimension.invalidate()
+    await dimension.ensure_fresh()
+    assert new_id in await dimension.subtree_ids(root["id"])
+
+
+async def test_unknown_ids_force_a_rate_limited_reload(client, monkeypatch):
+    dimension = CategoryDimension()
+    await dimension.ensure_fresh()
+    new_id = await _insert_category()
+
+    # Recém-carregada: o id desconhecido não força releitura
+    assert await dimension.get(new_id) is None
+
+    monkeypatch.setattr(dimension_module, "FORCED_RELOAD_SECONDS", 0.0)
+    assert (await dimension.get(new_id)).id == new_id
+
+
+async def test_notify_from_another_worker_invalidates(client, create_category):
+    category = await create_category()
+    await category_dimension.ensure_fresh()
+    generation = category_dimension.generation
+
+    # Outro worker renomeia e publica o NOTIFY na mesma transação
+    new_name = f"{category['name']} Notificada"
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Category).where(Category.id == category["id"]).values(name=new_name)
+        )
+        await db.execute(notify_statement())
+        await db.commit()
+
+    for _ in range(100):
+        if category_dimension.generation > generation:
+            break
+        await asyncio.sleep(0.02)
+    assert category_dimension.stale
+
+    assert (await category_dimension.get(category["id"])).name == new_name
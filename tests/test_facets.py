@@ -0,0 +1,109 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def tree(client, admin_headers, create_category, create_product):
+    """A > B > C; ativos: 1 em B, 2 em C; um inativo em B."""
+    a = await create_category()
+    b = await create_category(parent_id=a["id"])
+    c = await create_category(parent_id=b["id"])
+    products = [
+        await create_product(b["id"], price=10.0, stock=5),
+        await create_product(c["id"], price=30.0, stock=0),
+        await create_product(c["id"], price=2000.0, stock=1),
+    ]
+    inactive = await create_product(b["id"], price=10.0, stock=5)
+    response = await client.put(
+        f"/api/v1/products/{inactive['id']}",
+        json={"is_active": False},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    return a, b, c, products
+
+
+async def _listing(client, **params) -> dict:
+    response = await client.get(
+        "/api/v1/products", params={"facets": True, "page_size": 1, **params}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _categories(facets: dict) -> dict[int, tuple[int, int]]:
+    return {
+        facet["id"]: (facet["count"], facet["subtree_count"])
+        for facet in facets["categories"]
+    }
+
+
+def _buckets(facets: dict) -> dict[float, int]:
+    return {bucket["min"]: bucket["count"] for bucket in facets["price_buckets"]}
+
+
+async def test_facets_count_categories_prices_and_stock(client, tree):
+    a, b, c, _ = tree
+    body = await _listing(client, category_id=a["id"])
+    facets = body["facets"]
+
+    # Total das facetas e da listagem vêm da mesma query
+    assert body["total"] == 3
+    assert _categories(facets) == {a["id"]: (0, 3), b["id"]: (1, 3), c["id"]: (2, 2)}
+    # Ordenadas pela subárvore (desempate por nome)
+    assert facets["categories"][-1]["id"] == c["id"]
+    assert _buckets(facets) == {
+        0.0: 1,
+        25.0: 1,
+        50.0: 0,
+        100.0: 0,
+        250.0: 0,
+        500.0: 0,
+        1000.0: 1,
+    }
+    assert facets["price_buckets"][-1]["max"] is None
+    assert (facets["in_stock"], facets["out_of_stock"]) == (2, 1)
+    assert sum(bucket["count"] for bucket in facets["price_buckets"]) == body["total"]
+
+
+async def test_facets_follow_the_filters(client, tree):
+    a, b, c, _ = tree
+    body = await _listing(client, category_id=c["id"], min_price=20)
+    assert body["total"] == 2
+    # Só a subárvore filtrada; os ancestrais somam o que está nela
+    assert _categories(body["facets"]) == {
+        a["id"]: (0, 2),
+        b["id"]: (0, 2),
+        c["id"]: (2, 2),
+    }
+
+    body = await _listing(client, category_id=a["id"], in_stock=True)
+    assert body["total"] == 2
+    assert (body["facets"]["in_stock"], body["facets"]["out_of_stock"]) == (2, 0)
+    assert body["page_size"] == 1 and len(body["data"]) == 1
+
+
+async def test_product_writes_refresh_cached_facets(client, admin_headers, tree):
+    a, _, _, products = tree
+    before = (await _listing(client, category_id=a["id"]))["facets"]
+    assert before["out_of_stock"] == 1
+
+    response = await client.put(
+        f"/api/v1/products/{products[1]['id']}",
+        json={"stock": 4},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    # Outra página, mesma assinatura de filtros: facetas já atualizadas
+    after = (await _listing(client, category_id=a["id"], page=2))["facets"]
+    assert (after["in_stock"], after["out_of_stock"]) == (3, 0)
+
+
+async def test_listing_without_facets(client, tree):
+    a, *_ = tree
+    response = await client.get("/api/v1/products", params={"category_id": a["id"]})
+    body = response.json()
+    assert body["total"] == 3
+    assert body.get("facets") is None
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks.load import (
+    SCENARIOS,
+    ScenarioResult,
+    app,
+    compare_results,
+    percentile,
+    prepare,
+    run_scenario,
+)
+
+
+def _results(**scenarios: tuple[float, float, int]) -> dict:
+    return {
+        "scenarios": {
+            name: {
+                "requests": 100,
+                "errors": errors,
+                "throughput_rps": rps,
+                "p50_ms": p95 / 2,
+                "p95_ms": p95,
+                "p99_ms": p95 * 2,
+            }
+            for name, (p95, rps, errors) in scenarios.items()
+        }
+    }
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.95) == pytest.approx(4.8)
+    assert percentile(values, 1.0) == 5.0
+    assert percentile([], 0.95) == 0.0
+
+
+def test_scenario_summary():
+    result = ScenarioResult(latencies=[0.03, 0.01, 0.02, 0.04], errors=1, elapsed=2.0)
+    summary = result.summary()
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["throughput_rps"] == 2.0
+    assert summary["p50_ms"] == 25.0
+    assert summary["max_ms"] == 40.0
+    assert ScenarioResult().summary()["p95_ms"] == 0.0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = _results(browse=(10.0, 100.0, 0), login=(50.0, 20.0, 0))
+
+    within = _results(browse=(11.4, 86.0, 0), login=(40.0, 25.0, 0), new=(1, 1, 5))
+    assert compare_results(within, baseline, tolerance=0.15) == []
+
+    worse = _results(browse=(11.6, 84.0, 0), login=(50.0, 20.0, 2))
+    assert compare_results(worse, baseline, tolerance=0.15) == [
+        "browse: p95 11.60 ms > 10.00 ms",
+        "browse: throughput 84.0 rps < 100.0 rps",
+        "login: 2 errors (baseline 0)",
+    ]
+
+
+def test_compare_command_exit_code(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(_results(browse=(10.0, 100.0, 0))))
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps(_results(browse=(9.0, 120.0, 0))))
+    slow = tmp_path / "slow.json"
+    slow.write_text(json.dumps(_results(browse=(20.0, 100.0, 0))))
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["compare", str(fast), str(baseline)])
+    assert result.exit_code == 0, result.output
+    assert "No regressions" in result.output
+
+    result = runner.invoke(app, ["compare", str(slow), str(baseline)])
+    assert result.exit_code == 1
+    assert "browse: p95 20.00 ms > 10.00 ms" in result.output
+
+
+@pytest.mark.anyio
+async def test_scenarios_run_against_the_app(client, create_category, create_product):
+    category = await create_category()
+    await create_product(category["id"], stock=1000)
+
+    ctx = await prepare(
+        client,
+        ("admin@example.com", "admin123"),
+        ("bench@example.com", "bench-password"),
+        seed=42,
+    )
+    for name in ("catalog_browse", "order_history"):
+        result = await run_scenario(
+            ctx, SCENARIOS[name], duration=0.2, concurrency=2, warmup=1
+        )
+        assert result.errors == 0, name
+        assert result.latencies, name
@@ -0,0 +1,102 @@
+import math
+import re
+from collections import defaultdict
+
+import pytest
+
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+# Formato texto 0.0.4: nome{labels} valor
+SAMPLE = re.compile(
+    r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)"
+    r'(?:\{(?P<labels>(?:[a-zA-Z_]\w*="(?:[^"\\]|\\.)*",?)*)\})?'
+    r" (?P<value>\S+)$"
+)
+LABEL = re.compile(r'([a-zA-Z_]\w*)="((?:[^"\\]|\\.)*)"')
+
+
+def _parse(text: str) -> tuple[dict[str, str], list[tuple[str, dict, float]]]:
+    """Valida a exposição e retorna (tipos por métrica, amostras)."""
+    types: dict[str, str] = {}
+    samples = []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types, f"duplicate TYPE for {name}"
+            types[name] = kind
+            continue
+        if line.startswith("# HELP "):
+            continue
+
+        match = SAMPLE.match(line)
+        assert match, f"invalid sample line: {line!r}"
+        name = match["name"]
+        family = re.sub(r"_(bucket|sum|count)$", "", name)
+        assert name in types or family in types, f"sample before TYPE: {line!r}"
+        labels = dict(LABEL.findall(match["labels"] or ""))
+        samples.append((name, labels, float(match["value"])))
+    return types, samples
+
+
+async def test_metrics_are_valid_prometheus_text(client):
+    response = await client.get("/api/v1/products")
+    assert response.status_code == 200
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text.endswith("\n")
+    types, samples = _parse(response.text)
+
+    # Histogramas: buckets acumulados, +Inf == _count
+    buckets = defaultdict(list)
+    counts = {}
+    for name, labels, value in samples:
+        family, _, suffix = name.rpartition("_")
+        if types.get(family) != "histogram":
+            continue
+        series = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+        if suffix == "bucket":
+            le = math.inf if labels["le"] == "+Inf" else float(labels["le"])
+            buckets[(family, series)].append((le, value))
+        elif suffix == "count":
+            counts[(family, series)] = value
+
+    assert buckets
+    for key, values in buckets.items():
+        bounds = [bound for bound, _ in values]
+        assert bounds == sorted(bounds) and bounds[-1] == math.inf, key
+        cumulative = [count for _, count in values]
+        assert cumulative == sorted(cumulative), key
+        assert cumulative[-1] == counts[key], key
+
+    requests = {
+        (labels["method"], labels["route"], labels["status"]): value
+        for name, labels, value in samples
+        if name == "http_requests_total"
+    }
+    assert requests[("GET", "/api/v1/products", "2xx")] >= 1
+    assert types["http_requests_total"] == "counter"
+    assert types["db_pool_size"] == "gauge"
+    assert ("db_pool_size", {"pool": "primary"}, settings.DB_POOL_SIZE) in samples
+
+
+async def test_unmatched_paths_share_one_series(client):
+    for path in ("/nope/1", "/nope/2"):
+        assert (await client.get(path)).status_code == 404
+
+    _, samples = _parse((await client.get("/metrics")).text)
+    routes = {labels["route"] for name, labels, _ in samples if "route" in labels}
+    assert "<unmatched>" in routes
+    assert not any(route.startswith("/nope") for route in routes)
+
+
+async def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape")
+    assert (await client.get("/metrics")).status_code == 401
+    response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    response = await client.get("/metrics", headers={"Authorization": "Bearer scrape"})
+    assert response.status_code == 200
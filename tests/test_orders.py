@@ -0,0 +1,232 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.models.products import Product
+from app.monitoring.nplusone import NPlusOneError, NPlusOneMiddleware, record_statement
+from app.orders.projection import load_orders, project_orders
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stocks(products: list[dict]) -> set[int]:
+    """Estoques no banco (as leituras da API podem vir do cache)."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Product.stock).where(Product.id.in_([p["id"] for p in products]))
+        )
+        return set(result.scalars())
+
+
+async def test_create_and_cancel_order_without_repeated_queries(
+    client, customer_headers, create_category, create_product
+):
+    """Pedido com vários itens: com N_PLUS_ONE_MODE=raise, um N+1 falha aqui."""
+    category = await create_category()
+    products = [
+        await create_product(category["id"], price=5.0 + i, stock=10) for i in range(6)
+    ]
+
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": p["id"], "quantity": 2} for p in products]},
+        headers=customer_headers,
+    )
+    assert response.status_code == 200, response.text
+    order = response.json()["data"]
+    assert order["total_price"] == pytest.approx(sum(2 * p["price"] for p in products))
+    assert len(order["items"]) == len(products)
+
+    assert await _stocks(products) == {8}
+
+    response = await client.delete(
+        f"/api/v1/orders/{order['id']}", headers=customer_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["status"] == "Canceled"
+
+    assert await _stocks(products) == {10}
+
+
+def test_project_orders_groups_rows_in_the_requested_order():
+    order = (None, 7, 30.0, "Pending", None, "Ana", "ana@example.com")
+    rows = [
+        (1, *order[1:], 10, 100, 1, 10.0, "Caneca"),
+        (1, *order[1:], 11, 101, 2, 10.0, "Prato"),
+        # Pedido sem itens: colunas do item nulas (outer join)
+        (2, *order[1:], None, None, None, None, None),
+        (3, *order[1:], 12, 100, 1, 10.0, "Caneca"),
+    ]
+
+    projected = project_orders(rows, [3, 99, 1, 2])
+    assert [o["id"] for o in projected] == [3, 1, 2]
+    assert [item["id"] for item in projected[1]["items"]] == [10, 11]
+    assert projected[1]["items"][1] == {
+        "id": 11,
+        "product_id": 101,
+        "quantity": 2,
+        "unit_price": 10.0,
+        "product_name": "Prato",
+    }
+    assert projected[2]["items"] == []
+    assert projected[0]["user_name"] == "Ana"
+
+
+async def test_loaded_orders_match_the_api(
+    client, customer_headers, create_category, create_product
+):
+    category = await create_category()
+    first, second = (
+        await create_product(category["id"], price=3.0),
+        await create_product(category["id"], price=4.0),
+    )
+    order_ids = []
+    for items in ([first], [first, second]):
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": p["id"], "quantity": 1} for p in items]},
+            headers=customer_headers,
+        )
+        assert response.status_code == 200, response.text
+        order_ids.append(response.json()["data"]["id"])
+
+    async with AsyncSessionLocal() as db:
+        loaded = await load_orders(db, order_ids[::-1])
+    assert [order["id"] for order in loaded] == order_ids[::-1]
+    assert [item["product_name"] for item in loaded[0]["items"]] == [
+        first["name"],
+        second["name"],
+    ]
+
+    response = await client.get(
+        "/api/v1/orders", params={"page_size": 100}, headers=customer_headers
+    )
+    assert response.status_code == 200, response.text
+    listed = {order["id"]: order for order in response.json()["data"]}
+    for order_id in order_ids:
+        detail = await client.get(
+            f"/api/v1/orders/{order_id}", headers=customer_headers
+        )
+        assert detail.json()["data"] == listed[order_id]
+    assert listed[order_ids[1]]["total_price"] == pytest.approx(7.0)
+    assert listed[order_ids[1]]["user_email"].startswith("customer-")
+
+
+async def test_quote_requires_authentication(client):
+    response = await client.post(
+        "/api/v1/orders/quote", json={"items": [{"product_id": 1, "quantity": 1}]}
+    )
+    assert response.status_code == 401
+
+
+async def test_quote_prices_the_cart_without_reserving_stock(
+    client, customer_headers, admin_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"], price=12.5, stock=5)
+    inactive = await create_product(category["id"], stock=5)
+    response = await client.put(
+        f"/api/v1/products/{inactive['id']}",
+        json={"is_active": False},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    missing_id = 2_000_000_000
+    response = await client.post(
+        "/api/v1/orders/quote",
+        json={
+            "items": [
+                {"product_id": product["id"], "quantity": 3},
+                # Mesma linha de novo: só restam 2 depois da primeira
+                {"product_id": product["id"], "quantity": 3},
+                {"product_id": inactive["id"], "quantity": 1},
+                {"product_id": missing_id, "quantity": 1},
+            ]
+        },
+        headers=customer_headers,
+    )
+    assert response.status_code == 200, response.text
+    quote = response.json()["data"]
+    first, second, not_active, missing = quote["items"]
+
+    assert first["available"] and first["issue"] is None
+    assert first["subtotal"] == pytest.approx(37.5)
+    assert first["available_stock"] == 5
+    assert not second["available"] and second["subtotal"] == 0
+    assert second["available_stock"] == 2
+    assert second["issue"] == (
+        f"Insufficient stock for product {product['name']}. Available: 2"
+    )
+    assert not_active["issue"] == f"Product {inactive['name']} is not available"
+    assert missing["product_name"] is None
+    assert missing["issue"] == f"Product {missing_id} not found"
+    assert quote["total_price"] == pytest.approx(37.5)
+    assert not quote["available"]
+
+    assert await _stocks([product]) == {5}
+
+
+async def test_quote_issue_matches_the_order_error(
+    client, customer_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"], stock=1)
+    cart = {"items": [{"product_id": product["id"], "quantity": 2}]}
+
+    quote = await client.post(
+        "/api/v1/orders/quote", json=cart, headers=customer_headers
+    )
+    order = await client.post("/api/v1/orders", json=cart, headers=customer_headers)
+    assert order.status_code == 400
+    assert order.json()["detail"] == quote.json()["data"]["items"][0]["issue"]
+
+
+def _repeating_app(repeats: int):
+    async def app(scope, receive, send):
+        for _ in range(repeats):
+            record_statement("SELECT ? FROM products", "SELECT 1 FROM products")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def _call(app, sent: list[dict]) -> None:
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/api/v1/orders", "headers": []}
+    await NPlusOneMiddleware(app)(scope, None, send)
+
+
+async def test_raise_mode_fails_before_the_response_starts(monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_MODE", "raise")
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+    sent = []
+    with pytest.raises(NPlusOneError, match="3x SELECT"):
+        await _call(_repeating_app(3), sent)
+    assert sent == []
+
+
+async def test_raise_mode_sends_the_held_response(monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_MODE", "raise")
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+
+    sent = []
+    await _call(_repeating_app(2), sent)
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.body",
+    ]
+
+
+async def test_log_mode_streams_the_response(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_MODE", "log")
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+
+    sent = []
+    await _call(_repeating_app(3), sent)
+    assert len(sent) == 2
+    assert "Possible N+1 on /api/v1/orders" in caplog.text
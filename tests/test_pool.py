@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.monitoring.pool import (
+    InstrumentedQueuePool,
+    install_idle_pre_ping,
+    pool_status,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def make_engine():
+    """Engine de um só slot, com o pool instrumentado e pre-ping de ociosas."""
+    engines = []
+
+    def make(idle_seconds: float):
+        engine = create_async_engine(
+            settings.DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        install_idle_pre_ping(engine, idle_seconds)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+
+async def _backend_pid(engine) -> int:
+    async with engine.connect() as conn:
+        return await conn.scalar(text("SELECT pg_backend_pid()"))
+
+
+async def test_idle_pre_ping_only_checks_old_connections(make_engine):
+    fresh = make_engine(idle_seconds=3600)
+    await _backend_pid(fresh)
+    await _backend_pid(fresh)
+    assert fresh.sync_engine.pool.stats.pings == 0
+
+    idle = make_engine(idle_seconds=0)
+    await _backend_pid(idle)  # Conexão nova: sem ping
+    await _backend_pid(idle)
+    assert idle.sync_engine.pool.stats.pings == 1
+
+
+async def test_dead_idle_connection_is_replaced(make_engine):
+    engine = make_engine(idle_seconds=0)
+    pid = await _backend_pid(engine)
+
+    async with make_engine(idle_seconds=3600).connect() as conn:
+        await conn.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    # O ping falha, a conexão é descartada e o checkout abre outra
+    assert await _backend_pid(engine) != pid
+    stats = engine.sync_engine.pool.stats
+    assert (stats.pings, stats.ping_failures) == (1, 1)
+
+
+async def test_pool_status_reports_usage_and_timeouts(make_engine):
+    engine = make_engine(idle_seconds=3600)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        status = pool_status("test", engine)
+        assert status["pool_class"] == "InstrumentedQueuePool"
+        assert (status["size"], status["checked_out"]) == (1, 1)
+
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect() as other:
+                await other.execute(text("SELECT 1"))
+
+    status = pool_status("test", engine)
+    assert (status["checked_out"], status["checked_in"]) == (0, 1)
+    assert status["timeouts"] == 1
+    wait = status["checkout_wait"]
+    assert wait["count"] == 2
+    assert wait["total_ms"] >= 100  # O checkout que esperou o pool_timeout
+    assert wait["buckets"][-1] == {"le_ms": None, "count": 2}
+
+
+async def test_admin_pool_endpoint(client, admin_headers):
+    response = await client.get("/api/v1/admin/db/pool", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    pools = {pool["name"]: pool for pool in response.json()["data"]}
+    assert pools["primary"]["size"] == settings.DB_POOL_SIZE
+    assert pools["primary"]["checkout_wait"]["count"] > 0
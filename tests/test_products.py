@@ -0,0 +1,155 @@
+import pytest
+
+from app.enums.product_sort import ProductSort
+from app.products.cache import product_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def _list(client, **params) -> dict:
+    response = await client.get("/api/v1/products", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def _walk_cursor(client, **params) -> list[int]:
+    """Ids de todas as páginas seguindo next_cursor."""
+    ids, cursor = [], None
+    while True:
+        page = await _list(client, **params, **({"cursor": cursor} if cursor else {}))
+        ids += [product["id"] for product in page["data"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture
+async def catalog(client, customer_headers, create_category, create_product):
+    """Categoria com 7 produtos; o de preço 30 é o mais vendido."""
+    category = await create_category()
+    names = ["banana", "Banana", "apple", "Zebra", "zebra", "Água", "cherry"]
+    prices = [20.0, 10.0, 30.0, 10.0, 50.0, 40.0, 20.0]
+    products = [
+        await create_product(
+            category["id"], name=f"{name} {category['slug']}", price=price
+        )
+        for name, price in zip(names, prices)
+    ]
+
+    best_seller = products[2]
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": best_seller["id"], "quantity": 3}]},
+        headers=customer_headers,
+    )
+    assert response.status_code == 200, response.text
+    return category, products
+
+
+@pytest.mark.parametrize("sort", list(ProductSort))
+async def test_cursor_pages_match_offset_pages(client, catalog, sort):
+    category, products = catalog
+    params = {"category_id": category["id"], "sort": sort.value, "page_size": 3}
+
+    by_offset = []
+    for page in (1, 2, 3):
+        by_offset += [
+            p["id"] for p in (await _list(client, **params, page=page))["data"]
+        ]
+
+    by_cursor = await _walk_cursor(client, **params)
+    assert by_cursor == by_offset
+    assert sorted(by_cursor) == sorted(p["id"] for p in products)
+
+
+async def test_sorts_order_products(client, catalog):
+    category, _ = catalog
+    params = {"category_id": category["id"], "page_size": 10}
+
+    async def names(sort: ProductSort) -> list[str]:
+        page = await _list(client, **params, sort=sort.value)
+        return [p["name"].split()[0] for p in page["data"]]
+
+    # Collation "C": maiúsculas antes de minúsculas, acentuadas por último
+    assert await names(ProductSort.NAME) == [
+        "Banana",
+        "Zebra",
+        "apple",
+        "banana",
+        "cherry",
+        "zebra",
+        "Água",
+    ]
+    assert (await names(ProductSort.PRICE_DESC))[:2] == ["zebra", "Água"]
+    assert (await names(ProductSort.BEST_SELLING))[0] == "apple"
+    assert (await names(ProductSort.NEWEST))[0] == "cherry"
+
+
+async def test_cursor_from_another_sort_is_rejected(client, catalog):
+    category, _ = catalog
+    params = {"category_id": category["id"], "page_size": 3}
+    cursor = (await _list(client, **params, sort="price_asc"))["next_cursor"]
+
+    response = await client.get(
+        "/api/v1/products", params={**params, "sort": "name", "cursor": cursor}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+    response = await client.get(
+        "/api/v1/products", params={**params, "cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+async def _batch(client, ids: list[int]) -> dict:
+    response = await client.post("/api/v1/products/batch", json={"ids": ids})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+async def test_batch_keeps_order_dedupes_and_reports_missing(
+    client, create_category, create_product
+):
+    category = await create_category()
+    a, b, c = [await create_product(category["id"]) for _ in range(3)]
+    missing = 2_000_000_000
+
+    batch = await _batch(client, [c["id"], a["id"], missing, a["id"], b["id"], missing])
+    assert [product["id"] for product in batch["products"]] == [
+        c["id"],
+        a["id"],
+        b["id"],
+    ]
+    assert batch["missing_ids"] == [missing]
+    # Mesmo formato da busca por id, com a categoria embutida
+    single = (await client.get(f"/api/v1/products/{a['id']}")).json()["data"]
+    assert batch["products"][1] == single
+    assert single["category"]["id"] == category["id"]
+
+
+async def test_batch_reads_from_the_product_cache_until_a_write(
+    client, admin_headers, create_category, create_product
+):
+    category = await create_category()
+    a, b = [await create_product(category["id"]) for _ in range(2)]
+    ids = [a["id"], b["id"]]
+    await _batch(client, ids)
+
+    stats = product_cache.stats
+    hits, misses = stats.hits, stats.misses
+    await _batch(client, ids[::-1])
+    assert (stats.hits - hits, stats.misses - misses) == (2, 0)
+
+    response = await client.put(
+        f"/api/v1/products/{a['id']}", json={"price": 77.0}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    batch = await _batch(client, ids)
+    assert batch["products"][0]["price"] == 77.0
+
+
+@pytest.mark.parametrize("ids", [[], list(range(1, 102))])
+async def test_batch_size_is_limited(client, ids):
+    response = await client.post("/api/v1/products/batch", json={"ids": ids})
+    assert response.status_code == 422
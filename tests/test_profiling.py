@@ -0,0 +1,87 @@
+import pytest
+
+from app.monitoring import profiling
+from app.monitoring.context import RequestContextMiddleware
+from app.monitoring.profiling import ProfilingMiddleware, profile_store
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_admin_requests_are_profiled(client, admin_headers):
+    for mode in ("cprofile", "sample"):
+        response = await client.get(
+            "/api/v1/products", headers={**admin_headers, "X-Profile": mode}
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers["x-profile-status"] == "recorded"
+
+        profile_id = response.headers["x-profile-id"]
+        response = await client.get(
+            f"/api/v1/admin/profiles/{profile_id}", headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        profile = response.json()["data"]
+        assert profile["mode"] == mode
+        assert profile["route"] == "GET /api/v1/products"
+        assert profile["status_code"] == 200
+        # A consulta que confere o admin não entra no perfil
+        assert profile["db_queries"] == len(profile["statements"])
+        if mode == "cprofile":
+            assert "cumulative" in profile["stats"]
+
+
+async def test_profiling_requires_an_admin(client, customer_headers):
+    for headers in (
+        {},
+        customer_headers,
+        {"Authorization": "Bearer not-a-jwt"},
+        {"X-Debug-Token": "anything"},
+    ):
+        response = await client.get(
+            "/api/v1/products", params={"_profile": "1"}, headers=headers
+        )
+        assert response.status_code == 200, response.text
+        assert "x-profile-id" not in response.headers
+
+
+async def test_failed_profiler_start_releases_the_slot(
+    client, admin_headers, monkeypatch
+):
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    def broken_start(self):
+        raise RuntimeError("sampler unavailable")
+
+    middleware = ProfilingMiddleware(app)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/profiled",
+        "query_string": b"",
+        "headers": [
+            (b"authorization", admin_headers["Authorization"].encode()),
+            (b"x-profile", b"sample"),
+        ],
+    }
+    stack = RequestContextMiddleware(middleware)
+
+    monkeypatch.setattr(profiling.StackSampler, "start", broken_start)
+    with pytest.raises(RuntimeError):
+        await stack(scope, None, send)
+    assert middleware._active == 0
+    assert calls == []
+
+    # O slot foi liberado: a próxima requisição é perfilada normalmente
+    monkeypatch.undo()
+    profiles = len(profile_store.list())
+    await stack(scope, None, send)
+    assert calls == ["/profiled"]
+    assert len(profile_store.list()) == profiles + 1
@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+
+from app.monitoring.queries import QueryLog, fingerprint
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        (
+            "SELECT * FROM products WHERE id = 42 AND name = 'O''Neil'",
+            "SELECT * FROM products WHERE id = ? AND name = ?",
+        ),
+        (
+            "SELECT * FROM products WHERE id IN ($1::INTEGER, $2::INTEGER, $3)",
+            "SELECT * FROM products WHERE id IN (...)",
+        ),
+        (
+            "INSERT INTO t (a, b) VALUES (%(a)s, %(b)s), (%(a_1)s, %(b_1)s)",
+            "INSERT INTO t (a, b) VALUES (...)",
+        ),
+        (
+            "SELECT col_1, x.y2\n    FROM  t1   LIMIT :limit OFFSET -5",
+            "SELECT col_1, x.y2 FROM t1 LIMIT ? OFFSET ?",
+        ),
+    ],
+)
+def test_fingerprint_groups_statements_of_the_same_shape(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_query_log_aggregates_by_fingerprint_and_logs_slow_queries(caplog):
+    query_log = QueryLog(slow_threshold_ms=100)
+    with caplog.at_level(logging.WARNING, logger="app.monitoring.queries"):
+        query_log.observe("SELECT * FROM t WHERE id = 1", 0.01)
+        query_log.observe("SELECT * FROM t WHERE id = 2", 0.25)
+
+    rows = query_log.top(limit=10, order_by="total")
+    assert len(rows) == 1
+    assert rows[0]["fingerprint"] == "SELECT * FROM t WHERE id = ?"
+    assert rows[0]["count"] == 2
+    assert rows[0]["max_ms"] == pytest.approx(250)
+
+    # Só a segunda passa do limite; o log avisa que o tempo inclui o event loop
+    (record,) = caplog.records
+    assert "250.0 ms wall clock, includes event-loop stalls" in record.getMessage()
+    assert "<background>" in record.getMessage()
@@ -0,0 +1,109 @@
+from time import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.replicas import (
+    ReadYourWritesMiddleware,
+    Replica,
+    ReplicaRouter,
+    primary_until,
+    sign_primary_until,
+)
+from app.monitoring.context import (
+    RequestContextMiddleware,
+    RequestStats,
+    current_request,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def router():
+    """Roteador com uma "réplica" apontando para o próprio banco de testes."""
+    replica = Replica("replica-test", create_async_engine(settings.DATABASE_URL))
+    router = ReplicaRouter(
+        [replica],
+        max_lag_seconds=5.0,
+        check_interval=60.0,
+        read_your_writes_seconds=5.0,
+    )
+    await router.refresh()
+    assert replica.healthy
+    yield router
+
+    # Os hooks de escrita são globais (Session): não vazam para outros testes
+    event.remove(Session, "after_flush", router._on_flush)
+    event.remove(Session, "do_orm_execute", router._on_orm_execute)
+    await replica.engine.dispose()
+
+
+def _request(*headers: tuple[bytes, bytes]) -> RequestStats:
+    return RequestStats({"type": "http", "method": "GET", "headers": list(headers)})
+
+
+def _engine_for(router: ReplicaRouter, stats: RequestStats):
+    token = current_request.set(stats)
+    try:
+        return router.engine_for_read()
+    finally:
+        current_request.reset(token)
+
+
+def test_primary_until_token_round_trip():
+    until = time() + 5
+    token = sign_primary_until(until)
+    assert primary_until(token) == pytest.approx(until, abs=0.001)
+
+    value, _, signature = token.partition(".")
+    assert primary_until(f"{int(value) + 60_000}.{signature}") == 0.0
+    assert primary_until(f"{value}.{'0' * 32}") == 0.0
+    assert primary_until("garbage") == 0.0
+
+
+async def test_reads_go_to_primary_while_token_is_valid(router):
+    replica = router.replicas[0].engine
+    assert _engine_for(router, _request()) is replica
+
+    # Token de outro worker, por header ou cookie
+    token = sign_primary_until(time() + 5).encode()
+    assert _engine_for(router, _request((b"x-primary-until", token))) is None
+    cookie = b"theme=dark; primary_until=" + token
+    assert _engine_for(router, _request((b"cookie", cookie))) is None
+
+    # Expirado ou adulterado: volta para a réplica
+    expired = sign_primary_until(time() - 1).encode()
+    assert _engine_for(router, _request((b"x-primary-until", expired))) is replica
+    forged = token.split(b".")[0] + b"." + b"f" * 32
+    assert _engine_for(router, _request((b"x-primary-until", forged))) is replica
+
+
+async def test_write_sets_token_that_another_worker_accepts(router):
+    async def app(scope, receive, send):
+        # Escrita no meio da requisição (o que o hook after_flush faz)
+        router._mark_write()
+        assert router.engine_for_read() is None
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "headers": []}
+    stack = RequestContextMiddleware(ReadYourWritesMiddleware(app))
+    await stack(scope, None, send)
+
+    headers = dict(messages[0]["headers"])
+    token = headers[b"x-primary-until"]
+    assert headers[b"set-cookie"].startswith(b"primary_until=" + token + b";")
+    assert time() < primary_until(token.decode()) <= time() + 5
+
+    # Sem estado no processo: só o token decide
+    assert _engine_for(router, _request((b"x-primary-until", token))) is None
+    assert _engine_for(router, _request()) is router.replicas[0].engine
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.cache.invalidation import TAGS, publish
+from app.cache.responses import response_cache
+from app.database.session import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def _get(client, url: str, **params):
+    response = await client.get(url, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+async def test_product_write_invalidates_cached_reads(
+    client, admin_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"], price=10.0)
+    url = f"/api/v1/products/{product['id']}"
+
+    first = await _get(client, url)
+    assert first.headers["x-cache"] == "MISS"
+    assert (await _get(client, url)).headers["x-cache"] == "HIT"
+    listing = await _get(client, "/api/v1/products", category_id=category["id"])
+    assert listing.json()["data"][0]["price"] == 10.0
+
+    response = await client.put(url, json={"price": 99.0}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    after = await _get(client, url)
+    assert after.headers["x-cache"] == "MISS"
+    assert after.json()["data"]["price"] == 99.0
+    listing = await _get(client, "/api/v1/products", category_id=category["id"])
+    assert listing.json()["data"][0]["price"] == 99.0
+    batch = await client.post("/api/v1/products/batch", json={"ids": [product["id"]]})
+    assert batch.json()["data"]["products"][0]["price"] == 99.0
+
+    # O ETag antigo não vale mais
+    response = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    response = await client.get(url, headers={"If-None-Match": after.headers["etag"]})
+    assert response.status_code == 304
+
+
+async def test_category_rename_invalidates_embedded_category(
+    client, admin_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"])
+    url = f"/api/v1/products/{product['id']}"
+    await _get(client, url)
+    await _get(client, f"/api/v1/categories/slug/{category['slug']}")
+
+    new_name = f"{category['name']} Renomeada"
+    response = await client.put(
+        f"/api/v1/categories/{category['id']}",
+        json={"name": new_name},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    new_slug = response.json()["data"]["slug"]
+
+    assert (await _get(client, url)).json()["data"]["category"]["name"] == new_name
+    response = await client.get(f"/api/v1/categories/slug/{category['slug']}")
+    assert response.status_code == 404
+    await _get(client, f"/api/v1/categories/slug/{new_slug}")
+
+
+async def test_orders_invalidate_only_when_availability_changes(
+    client, customer_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"], stock=10)
+    url = f"/api/v1/products/{product['id']}"
+    in_stock = {"category_id": category["id"], "in_stock": True}
+    await _get(client, url)
+    await _get(client, "/api/v1/products", **in_stock)
+
+    async def order(quantity: int) -> int:
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": product["id"], "quantity": quantity}]},
+            headers=customer_headers,
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["data"]["id"]
+
+    # Estoque 10 -> 6: o cache continua valendo (estoque exibido atrasa)
+    first = await order(4)
+    response = await _get(client, url)
+    assert response.headers["x-cache"] == "HIT"
+    assert response.json()["data"]["stock"] == 10
+
+    # 6 -> 0: esgotou, sai do filtro in_stock
+    second = await order(6)
+    response = await _get(client, url)
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["data"]["stock"] == 0
+    assert (await _get(client, "/api/v1/products", **in_stock)).json()["data"] == []
+
+    # Cancelar devolve estoque a partir de 0: invalida de novo
+    response = await client.delete(f"/api/v1/orders/{second}", headers=customer_headers)
+    assert response.status_code == 200, response.text
+    assert (await _get(client, url)).json()["data"]["stock"] == 6
+    listing = await _get(client, "/api/v1/products", **in_stock)
+    assert [p["id"] for p in listing.json()["data"]] == [product["id"]]
+
+    response = await client.delete(f"/api/v1/orders/{first}", headers=customer_headers)
+    assert response.status_code == 200, response.text
+    assert (await _get(client, url)).headers["x-cache"] == "HIT"
+
+
+async def test_invalidations_from_other_workers_are_applied(client):
+    """Um NOTIFY de outro processo avança as gerações deste worker."""
+    before = response_cache.snapshot(TAGS)
+    async with AsyncSessionLocal() as db:
+        await publish(db, "products")
+        await db.commit()
+
+    for _ in range(100):
+        if response_cache.snapshot(TAGS) != before:
+            break
+        await asyncio.sleep(0.02)
+    products, categories = response_cache.snapshot(TAGS)
+    assert products > before[0]
+    assert categories == before[1]
+
+
+async def test_authenticated_reads_bypass_the_cache(
+    client, admin_headers, create_category, create_product
+):
+    category = await create_category()
+    product = await create_product(category["id"])
+    url = f"/api/v1/products/{product['id']}"
+    await _get(client, url)
+
+    response = await client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+    assert "x-cache" not in response.headers
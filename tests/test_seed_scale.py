@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.database.seed_scale import (
+    DEFAULT_EPOCH,
+    HISTORY_DAYS,
+    SEEDED_TABLES,
+    ScaleSeeder,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def _generate(seed: int, epoch: datetime = DEFAULT_EPOCH) -> dict[str, list]:
+    """Roda os geradores sem banco, guardando as linhas de cada COPY."""
+    rows: dict[str, list] = {table: [] for table in SEEDED_TABLES}
+
+    async def copy(table: str, records, columns: list[str]) -> None:
+        for record in records:
+            row = dict(zip(columns, record))
+            row.pop("password_hash", None)  # Argon2 usa salt aleatório
+            rows[table].append(row)
+
+    seeder = ScaleSeeder(scale=0.01, seed=seed, batch_size=40, epoch=epoch)
+    seeder.copy = copy
+    seeder.first_ids = dict.fromkeys(SEEDED_TABLES, 1)
+    await seeder.seed_users()
+    await seeder.seed_categories()
+    await seeder.seed_products()
+    await seeder.seed_orders()
+    return rows
+
+
+async def test_same_seed_generates_the_same_rows():
+    first = await _generate(seed=7)
+    assert len(first["users"]) == 100
+    assert len(first["orders"]) == 500
+    assert first == await _generate(seed=7)
+    assert first["orders"] != (await _generate(seed=8))["orders"]
+
+
+async def test_timestamps_end_at_the_epoch():
+    epoch = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    rows = await _generate(seed=7, epoch=epoch)
+
+    created = [
+        row["created_at"]
+        for table in ("users", "products", "orders")
+        for row in rows[table]
+    ]
+    assert max(created) <= epoch
+    assert (epoch - min(created)).days <= HISTORY_DAYS
+
+    # Pedido sempre depois do cadastro do cliente
+    users = {row["id"]: row["created_at"] for row in rows["users"]}
+    assert all(row["created_at"] >= users[row["user_id"]] for row in rows["orders"])
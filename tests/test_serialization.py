@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.categories import CategoryResponse
+from app.schemas.responses import PaginatedResponse, SuccessResponse
+from app.schemas.serialization import (
+    item_response,
+    list_response,
+    paginated_response,
+    type_adapter,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def _rows() -> list[SimpleNamespace]:
+    """Objetos com atributos, como as linhas do ORM."""
+    return [
+        SimpleNamespace(id=1, name="Eletrônicos", slug="eletronicos", parent_id=None),
+        SimpleNamespace(id=2, name="Celulares", slug="celulares", parent_id=1),
+    ]
+
+
+def test_fast_path_matches_the_response_model():
+    rows = _rows()
+    validated = [CategoryResponse.model_validate(row) for row in rows]
+
+    response = paginated_response(
+        CategoryResponse, rows, total=21, page=2, page_size=10
+    )
+    assert response.media_type == "application/json"
+    expected = PaginatedResponse[CategoryResponse](
+        data=validated, total=21, page=2, page_size=10, total_pages=3
+    )
+    assert json.loads(response.body) == expected.model_dump(mode="json")
+
+    response = list_response(CategoryResponse, rows, message="ok")
+    expected = SuccessResponse[list[CategoryResponse]](data=validated, message="ok")
+    assert json.loads(response.body) == expected.model_dump(mode="json")
+
+    response = item_response(CategoryResponse, rows[1])
+    expected = SuccessResponse[CategoryResponse](data=validated[1])
+    assert json.loads(response.body) == expected.model_dump(mode="json")
+
+
+def test_fast_path_still_validates_rows():
+    invalid = SimpleNamespace(id="x", name="Ok", slug="ok", parent_id=None)
+    with pytest.raises(ValidationError):
+        list_response(CategoryResponse, [invalid])
+
+
+def test_type_adapters_are_cached():
+    assert type_adapter(list[CategoryResponse]) is type_adapter(list[CategoryResponse])
+
+
+async def test_list_routes_return_the_declared_shape(client, create_category):
+    category = await create_category()
+    response = await client.get("/api/v1/categories")
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["success"] is True
+    listed = next(row for row in body["data"] if row["id"] == category["id"])
+    assert set(listed) == {
+        "id",
+        "name",
+        "slug",
+        "parent_id",
+        "product_count",
+        "subtree_product_count",
+    }
+
+    response = await client.get("/api/v1/products", params={"page_size": 1})
+    body = response.json()
+    assert set(body) >= {"success", "data", "total", "page", "page_size"}
+    assert body["total_pages"] == body["total"]
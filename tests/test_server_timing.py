@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.database.session import engine
+
+pytestmark = pytest.mark.anyio
+
+SLOW_USER_QUERY = 0.05
+
+
+def _phases(header: str) -> dict[str, float]:
+    phases = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";")[:2]
+        phases[name] = float(duration.removeprefix("dur="))
+    return phases
+
+
+@pytest.fixture
+def slow_user_query():
+    """Atrasa o SELECT do usuário autenticado dentro do tempo medido como db."""
+
+    def sleep(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            time.sleep(SLOW_USER_QUERY)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", sleep)
+    yield
+    event.remove(engine.sync_engine, "before_cursor_execute", sleep)
+
+
+async def test_server_timing_requires_debug_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG_TOKEN", "secret")
+    response = await client.get("/api/v1/products")
+    assert "server-timing" not in response.headers
+
+    response = await client.get("/api/v1/products", headers={"X-Debug-Token": "wrong"})
+    assert "server-timing" not in response.headers
+
+    response = await client.get("/api/v1/products", headers={"X-Debug-Token": "secret"})
+    phases = _phases(response.headers["server-timing"])
+    assert list(phases) == ["deps", "handler", "serialize", "db", "total"]
+    assert 'desc="' in response.headers["server-timing"]
+
+
+async def test_auth_phase_excludes_the_user_query(
+    client, admin_headers, monkeypatch, slow_user_query
+):
+    monkeypatch.setattr(settings, "DEBUG_TOKEN", "secret")
+    response = await client.get(
+        "/api/v1/auth/me", headers={**admin_headers, "X-Debug-Token": "secret"}
+    )
+    assert response.status_code == 200, response.text
+
+    phases = _phases(response.headers["server-timing"])
+    assert list(phases)[:3] == ["auth", "deps", "handler"]
+    assert phases["db"] >= SLOW_USER_QUERY * 1000
+    # O SELECT lento só conta em db (e em deps, que engloba a dependência)
+    assert phases["auth"] < SLOW_USER_QUERY * 1000
+    assert phases["deps"] >= SLOW_USER_QUERY * 1000
+    assert phases["total"] >= phases["deps"]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.cache.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+def _slow(calls: list, result=None, delay: float = 0.05, error: bool = False):
+    async def function():
+        calls.append(result)
+        await asyncio.sleep(delay)
+        if error:
+            raise RuntimeError("boom")
+        return result
+
+    return function
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test-shared")
+    calls = []
+    results = await asyncio.gather(
+        *(flight.do("key", _slow(calls, "value")) for _ in range(5)),
+        flight.do("other", _slow(calls, "other")),
+    )
+
+    assert calls == ["value", "other"]
+    assert results[:5] == [("value", False)] + [("value", True)] * 4
+    assert results[5] == ("other", False)
+    assert (flight.stats.leaders, flight.stats.collapsed) == (2, 4)
+    assert flight.stats.in_flight == 0
+    assert flight.calls == {}
+
+    # Terminada a chamada, a próxima executa de novo
+    assert await flight.do("key", _slow(calls, "again")) == ("again", False)
+
+
+async def test_followers_run_their_own_call_when_the_leader_fails():
+    flight = SingleFlight("test-failure")
+    calls = []
+    leader = asyncio.create_task(flight.do("key", _slow(calls, error=True)))
+    await asyncio.sleep(0)
+    follower = await flight.do("key", _slow(calls, "retry", delay=0))
+
+    with pytest.raises(RuntimeError):
+        await leader
+    assert follower == ("retry", False)
+    assert calls == [None, "retry"]
+    assert flight.stats.collapsed == 0
+
+
+async def test_follower_timeout():
+    flight = SingleFlight("test-timeout")
+    calls = []
+    leader = asyncio.create_task(flight.do("key", _slow(calls, "slow", delay=0.2)))
+    await asyncio.sleep(0)
+    follower = await flight.do("key", _slow(calls, "own", delay=0), timeout=0.01)
+
+    assert follower == ("own", False)
+    assert flight.stats.timeouts == 1
+    # O líder não é cancelado pelo timeout do seguidor
+    assert await leader == ("slow", False)
+
+
+async def test_identical_anonymous_reads_are_coalesced(
+    client, create_category, create_product
+):
+    category = await create_category()
+    await create_product(category["id"])
+    params = {"category_id": category["id"], "page_size": 7}
+
+    responses = await asyncio.gather(
+        *(client.get("/api/v1/products", params=params) for _ in range(4))
+    )
+    assert {response.status_code for response in responses} == {200}
+    sources = sorted(response.headers["x-cache"] for response in responses)
+    assert sources.count("MISS") == 1
+    assert set(sources) <= {"MISS", "COALESCED", "HIT"}
+    assert len({response.content for response in responses}) == 1
@@ -0,0 +1,93 @@
+import uuid
+
+import pytest
+
+from app.database.session import AsyncSessionLocal
+from app.products.suggest import normalize, suggest_index, word_suffixes
+
+pytestmark = pytest.mark.anyio
+
+
+def test_normalize_and_word_suffixes():
+    assert normalize("Câmera  Ótima-HD") == "camera otima hd"
+    assert word_suffixes("kit smart tv") == ["kit smart tv", "smart tv", "tv"]
+    assert word_suffixes("") == []
+
+
+@pytest.fixture
+async def tag(client, create_category, create_product, customer_headers):
+    """Palavra única da execução nos nomes de 3 produtos; o do meio é o mais vendido."""
+    tag = f"zq{uuid.uuid4().hex[:8]}"
+    category = await create_category()
+    products = [
+        await create_product(category["id"], name=f"Câmera Ótima {tag}"),
+        await create_product(category["id"], name=f"Cabo {tag} Flexível"),
+        await create_product(category["id"], name=f"{tag} Capa Cinza"),
+    ]
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": products[1]["id"], "quantity": 2}]},
+        headers=customer_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    async with AsyncSessionLocal() as db:
+        await suggest_index.rebuild(db)
+    return tag, products
+
+
+def _names(query: str, limit: int = 10) -> list[str]:
+    return [product["name"] for product in suggest_index.suggest(query, limit)]
+
+
+async def test_suggest_matches_word_prefixes_ignoring_accents(tag):
+    tag, products = tag
+    camera, cabo, capa = (product["name"] for product in products)
+
+    # Qualquer palavra do nome, sem acento nem caixa; o mais vendido primeiro
+    assert _names(tag) == [cabo, camera, capa]
+    assert _names(tag.upper()[:-1]) == [cabo, camera, capa]
+    assert _names(f"otima {tag}") == [camera]
+    assert _names(f"ÓTIMA {tag[:-2]}") == [camera]
+    assert _names(f"{tag} ca") == [capa]
+    assert _names(f"flexivel {tag}") == []
+    assert _names(tag, limit=1) == [cabo]
+
+
+async def test_suggest_applies_writes_through_the_delta(
+    client, admin_headers, create_category, create_product, tag
+):
+    tag, products = tag
+    camera, cabo, capa = products
+
+    # Produto novo e renomeado entram sem reconstrução; desativado sai
+    category = await create_category()
+    new = await create_product(category["id"], name=f"Cadeira {tag}")
+    response = await client.put(
+        f"/api/v1/products/{camera['id']}",
+        json={"name": f"Filmadora {tag}"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    response = await client.put(
+        f"/api/v1/products/{capa['id']}",
+        json={"is_active": False},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    assert not suggest_index.needs_rebuild
+    assert _names(tag)[0] == cabo["name"]
+    assert set(_names(tag)) == {cabo["name"], new["name"], f"Filmadora {tag}"}
+    assert _names(f"cadeira {tag[:-1]}") == [new["name"]]
+    assert _names(f"camera {tag}") == []
+
+    # Upsert idempotente: reaplicar o mesmo estado não muda nada
+    suggest_index.upsert(new["id"], new["name"], True)
+    assert _names(f"cadeira {tag}") == [new["name"]]
+
+    response = await client.get(
+        "/api/v1/products/suggest", params={"q": f"filmadora {tag}"}
+    )
+    assert response.status_code == 200, response.text
+    assert camera["id"] in [product["id"] for product in response.json()["data"]]